@@ -0,0 +1,57 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from autocomplete import get_ingredient_completer, get_name_completer
+from synthetic_data import generate_recipes
+
+
+def keystrokes(completer, words):
+
+    # Every prefix of each word, as typed one character at a time.
+    samples = []
+    for word in words:
+        for end in range(1, len(word) + 1):
+            start = time.perf_counter()
+            completer.complete(word[:end])
+            samples.append(time.perf_counter() - start)
+    return np.asarray(samples) * 1000
+
+
+def scan_baseline(completer, prefix, limit=10):
+
+    matches = [(term, count) for term, count in zip(completer.terms, completer.counts) if term.startswith(prefix)]
+    return sorted(matches, key=lambda item: -item[1])[:limit]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time per-keystroke completions and report the completers' memory.")
+    parser.add_argument('path', nargs='?', help="RAW_recipes.csv (default: synthetic data)")
+    parser.add_argument('--rows', type=int, default=230000)
+    parser.add_argument('--words', type=int, default=200)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.path) if args.path else generate_recipes(args.rows)
+    rng = np.random.default_rng(0)
+    for label, build in (('names', get_name_completer), ('ingredients', get_ingredient_completer)):
+        start = time.perf_counter()
+        completer = build(df)
+        built = time.perf_counter() - start
+        memory = completer.memory_bytes()
+        print(f"{label}: {len(completer)} terms, {len(completer.keys)} keys, built in {built:.2f} s")
+        print("  memory: " + ", ".join(f"{name} {size / (1 << 20):.2f} MB" for name, size in memory.items())
+              + f" = {sum(memory.values()) / (1 << 20):.2f} MB")
+
+        words = completer.terms[rng.choice(len(completer), size=min(args.words, len(completer)), p=completer.counts / completer.counts.sum())]
+        samples = keystrokes(completer, words)
+        print(f"  per keystroke: mean {samples.mean():.4f} ms, p99 {np.percentile(samples, 99):.4f} ms, max {samples.max():.4f} ms over {len(samples)}")
+        start = time.perf_counter()
+        scan_baseline(completer, words[0][:3])
+        print(f"  linear scan for one prefix: {(time.perf_counter() - start) * 1000:.2f} ms\n")
@@ -0,0 +1,73 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from facets import COUNT_FIELDS, get_facet_index, parse_filters
+from Recipeasy import find_ingredient_rows
+from recipe_records import NUTRITION_FIELDS, parse_nutrition
+from synthetic_data import generate_recipes
+
+FILTERS = ['minutes<30', 'minutes<30, calories<500', 'n_ingredients<=5, minutes<=15', 'calories=200-400, protein>50', 'minutes<120']
+
+
+def pandas_filter(numeric, filters):
+
+    mask = np.ones(len(numeric), dtype=bool)
+    for field, (low, high) in filters.items():
+        values = numeric[field]
+        if low is not None:
+            mask &= (values >= low).to_numpy()
+        if high is not None:
+            mask &= (values <= high).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def timed(func, repeat):
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare pandas boolean filters with the presorted facet index.")
+    parser.add_argument('path', nargs='?')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.path) if args.path else generate_recipes(args.rows)
+    facets = get_facet_index(df)
+
+    start = time.perf_counter()
+    for field in facets.fields():
+        facets.sorted(field)
+        facets.bucket_codes(field)
+    print(f"facet index build: {(time.perf_counter() - start) * 1000:.1f} ms for {len(df)} recipes\n")
+
+    # The baseline gets its nutrition columns parsed for free; only the filtering is timed.
+    nutrition = [values[:len(NUTRITION_FIELDS)] if values is not None else [np.nan] * len(NUTRITION_FIELDS) for values in map(parse_nutrition, df['nutrition'])]
+    numeric = df[list(COUNT_FIELDS)].join(pd.DataFrame(nutrition, columns=NUTRITION_FIELDS))
+
+    print(f"{'filters':34} {'matches':>8} {'pandas ms':>10} {'facet ms':>9} {'histogram ms':>13}")
+    for text in FILTERS:
+        filters = parse_filters(text)
+        pandas_time, expected = timed(lambda: pandas_filter(numeric, filters), args.repeat)
+        facet_time, rows = timed(lambda: facets.filter(filters), args.repeat)
+        assert np.array_equal(rows, expected)
+        histogram_time, _ = timed(lambda: facets.facet_counts(rows, ['minutes', 'calories', 'n_ingredients']), args.repeat)
+        print(f"{text:34} {len(rows):8d} {pandas_time * 1000:10.2f} {facet_time * 1000:9.3f} {histogram_time * 1000:13.3f}")
+
+    rows = find_ingredient_rows(df, 'garlic')
+    facet_time, filtered = timed(lambda: facets.filter(parse_filters('minutes<30, calories<500'), rows), args.repeat)
+    print(f"\n'garlic' ({len(rows)} rows) + minutes<30, calories<500: {len(filtered)} rows in {facet_time * 1000:.3f} ms")
@@ -0,0 +1,68 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fuzzy_search import edit_distance, get_ingredient_speller, get_name_speller, max_distance_for, words_in
+from synthetic_data import generate_recipes
+
+NAME_TYPOS = ['chiken', 'lasagne', 'cokies', 'casserol', 'grandmas', 'pancaks']
+INGREDIENT_TYPOS = ['garlc', 'mozarella', 'chocolat', 'cinamon', 'brocoli', 'parmesian']
+
+
+def brute_force(names, word):
+
+    # What the request rules out: Levenshtein against every name word on every keystroke.
+    limit = max_distance_for(word)
+    best = None
+    for name in names:
+        for candidate in words_in(name):
+            distance = edit_distance(word, candidate, limit)
+            if distance <= limit and (best is None or distance < best[1]):
+                best = (candidate, distance)
+    return best
+
+
+def timed(func, repeat):
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare SymSpell lookups with brute-force edit distance.")
+    parser.add_argument('path', nargs='?')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--brute-rows', type=int, default=5000, help="rows scanned by the brute-force baseline")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.path) if args.path else generate_recipes(args.rows)
+
+    build, names = timed(lambda: get_name_speller(df), 1)
+    print(f"name speller build:       {build * 1000:9.1f} ms ({len(names.words)} words, {len(names.deletes)} delete keys)")
+    build, ingredients = timed(lambda: get_ingredient_speller(df), 1)
+    print(f"ingredient speller build: {build * 1000:9.1f} ms ({len(ingredients.words)} words, {len(ingredients.deletes)} delete keys)\n")
+
+    sample = df['name'].dropna().head(args.brute_rows).to_numpy(dtype=object)
+    print(f"{'typo':12} {'suggestion':14} {'lookup ms':>10} {f'brute ms ({len(sample)} rows)':>24}")
+    for word in NAME_TYPOS:
+        lookup_time, found = timed(lambda: names.lookup(word, limit=1), args.repeat)
+        brute_time, _ = timed(lambda: brute_force(sample, word), 1)
+        suggestion = found[0][0] if found else '-'
+        print(f"{word:12} {suggestion:14} {lookup_time * 1000:10.3f} {brute_time * 1000:24.1f}")
+
+    print()
+    for word in INGREDIENT_TYPOS:
+        lookup_time, found = timed(lambda: ingredients.lookup(word, limit=1), args.repeat)
+        suggestion = found[0][0] if found else '-'
+        print(f"{word:12} {suggestion:14} {lookup_time * 1000:10.3f}")
@@ -0,0 +1,70 @@
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ingredient_index import IngredientIndex, get_ingredient_index
+from name_index import NameIndex, get_name_index
+from query_cache import search_cache
+from recipe_store import RecipeStore
+from synthetic_data import generate_recipes, write_recipes_csv
+
+QUERIES = [('name', 'chicken'), ('ingredients', 'garlic, onion'), ('ingredients', 'saffron')]
+
+
+def timed(func):
+
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def query_ms(store):
+
+    total = 0.0
+    for kind, query in QUERIES:
+        search_cache.clear()
+        find = store.find_name_rows if kind == 'name' else store.find_ingredient_rows
+        total += timed(lambda: find(query))[0]
+    return total * 1000 / len(QUERIES)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time appends, deletes, merges and compaction against a full reload.")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--batch', type=int, default=100, help="recipes per append")
+    parser.add_argument('--batches', type=int, default=5)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='recipeasy-store-')
+    try:
+        path = str(Path(directory) / 'RAW_recipes.csv')
+        write_recipes_csv(path, args.rows)
+        store = RecipeStore(path)
+        get_name_index(store.base)
+        get_ingredient_index(store.base)
+        print(f"base: {len(store.base)} recipes, query {query_ms(store):.2f} ms\n")
+
+        for batch in range(args.batches):
+            recipes = generate_recipes(args.batch, seed=[1, batch], start_id=10_000_000 + batch * args.batch)
+            append_seconds = timed(lambda: store.append(recipes))[0]
+            first_ms = query_ms(store)
+            print(f"append {args.batch:5} -> delta {len(store.delta):6}: append {append_seconds * 1000:7.1f} ms, "
+                  f"first queries {first_ms:6.2f} ms, then {query_ms(store):6.2f} ms")
+
+        delete_seconds = timed(lambda: store.delete(store.base['id'].iloc[:args.batch].tolist()))[0]
+        print(f"delete {args.batch}: {delete_seconds * 1000:.1f} ms")
+
+        merge_seconds, merged = timed(store.merge)
+        print(f"\nmerge into base (indexes remapped): {merge_seconds:.2f} s")
+        rebuild_seconds = timed(lambda: (NameIndex(merged['name']), IngredientIndex(merged['ingredients'])))[0]
+        print(f"rebuilding the same indexes:        {rebuild_seconds:.2f} s")
+        print(f"compact to CSV and cache:           {timed(store.compact)[0]:.2f} s")
+        print(f"full reload of the CSV:             {timed(lambda: RecipeStore(path, cache_root=directory + '/fresh'))[0]:.2f} s")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,60 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import recipe_cache
+from synthetic_data import write_recipes_csv
+
+
+def best_of(func, repeat):
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(path, repeat):
+
+    cache_root = tempfile.mkdtemp(prefix='recipeasy-cache-')
+    directory = recipe_cache.cache_dir_for(path, cache_root)
+
+    cold = best_of(lambda: pd.read_csv(path), repeat)
+
+    start = time.perf_counter()
+    recipe_cache.load_with_cache(path, cache_root)
+    build = time.perf_counter() - start
+
+    warm = best_of(lambda: recipe_cache.load_with_cache(path, cache_root), repeat)
+    meta = recipe_cache.read_meta(directory)
+
+    print(f"source:          {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    print(f"cache format:    {meta['format']}")
+    print(f"cold CSV load:   {cold * 1000:9.1f} ms")
+    print(f"first load+build:{build * 1000:9.1f} ms")
+    print(f"warm cache load: {warm * 1000:9.1f} ms  ({cold / warm:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare cold CSV load with warm recipe cache load.")
+    parser.add_argument('path', nargs='?', default='./data/RAW_recipes.csv')
+    parser.add_argument('--rows', type=int, default=100000, help="synthetic rows when path does not exist")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    path = args.path
+    if not os.path.exists(path):
+        path = os.path.join(tempfile.mkdtemp(prefix='recipeasy-bench-'), 'RAW_recipes.csv')
+        write_recipes_csv(path, args.rows)
+
+    run(path, args.repeat)
@@ -0,0 +1,48 @@
+import argparse
+import sys
+import tempfile
+import os
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from lean_frame import SEARCH_COLUMNS, get_interned_ingredients, memory_report, optimize_frame
+from synthetic_data import write_recipes_csv
+
+
+def print_report(title, before, after):
+
+    print(f"\n{title}")
+    print(f"{'column':16} {'before MB':>10} {'after MB':>10}")
+    for column in before:
+        if column == 'Index':
+            continue
+        after_size = after.get(column)
+        after_text = f"{after_size / 1e6:10.2f}" if after_size is not None else f"{'dropped':>10}"
+        print(f"{column:16} {before[column] / 1e6:10.2f} {after_text}")
+    print(f"{'total':16} {sum(before.values()) / 1e6:10.2f} {sum(after.values()) / 1e6:10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report memory_usage(deep=True) before and after the lean load mode.")
+    parser.add_argument('path', nargs='?', default='./data/RAW_recipes.csv')
+    parser.add_argument('--rows', type=int, default=100000, help="synthetic rows when path does not exist")
+    args = parser.parse_args()
+
+    path = args.path
+    if not os.path.exists(path):
+        path = os.path.join(tempfile.mkdtemp(prefix='recipeasy-bench-'), 'RAW_recipes.csv')
+        write_recipes_csv(path, args.rows)
+
+    df = pd.read_csv(path)
+    before = memory_report(df)
+
+    print_report("full frame", before, memory_report(optimize_frame(df)))
+    print_report("search-only frame", before, memory_report(optimize_frame(df, columns=SEARCH_COLUMNS)))
+
+    interned = get_interned_ingredients(df)
+    print(f"\ningredients as list strings: {before['ingredients'] / 1e6:.2f} MB")
+    print(f"interned ingredient codes:   {interned.nbytes() / 1e6:.2f} MB ({len(interned.vocabulary)} distinct ingredients)")
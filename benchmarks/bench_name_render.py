@@ -0,0 +1,74 @@
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from Recipeasy import display_name_matches, display_recipe, search_recipes_by_name
+from synthetic_data import generate_recipes
+
+
+class FirstWrite(io.StringIO):
+
+    def __init__(self, start):
+
+        super().__init__()
+        self.start = start
+        self.first_output = None
+
+    def write(self, text):
+
+        if self.first_output is None and text.strip():
+            self.first_output = time.perf_counter() - self.start
+        return super().write(text)
+
+
+def legacy_render(matches):
+
+    for name in matches['name'].unique():
+        versions = matches[matches['name'] == name]
+        if len(versions) > 1:
+            print(f"{name} ({len(versions)} versions found):")
+            for idx, (_, recipe) in enumerate(versions.iterrows(), 1):
+                print(f"\n  VERSION {idx}:")
+                print(f"Name: {recipe['name']}")
+                print(f"Ingredients: {recipe['ingredients']}")
+                print("-" * 60)
+        else:
+            display_recipe(versions.iloc[0])
+
+
+def measure(render, matches):
+
+    start = time.perf_counter()
+    sink = FirstWrite(start)
+    with contextlib.redirect_stdout(sink), patch('builtins.input', return_value='q'):
+        render(matches)
+    return sink.first_output, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time to first output for broad name searches.")
+    parser.add_argument('path', nargs='?')
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--query', default='chicken')
+    parser.add_argument('--legacy', action='store_true', help="also time the old per-name loop (slow)")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.path) if args.path else generate_recipes(args.rows)
+    matches = search_recipes_by_name(df, args.query)
+    print(f"'{args.query}': {len(matches)} matches, {matches['name'].nunique()} distinct names")
+
+    first, total = measure(display_name_matches, matches)
+    print(f"paged groupby:  first output {first * 1000:9.1f} ms, first page {total * 1000:9.1f} ms")
+
+    if args.legacy:
+        first, total = measure(legacy_render, matches)
+        print(f"per-name loop:  first output {first * 1000:9.1f} ms, all output {total * 1000:9.1f} ms")
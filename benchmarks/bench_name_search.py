@@ -0,0 +1,52 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from name_index import get_name_index
+from Recipeasy import search_recipes_by_name
+from synthetic_data import generate_recipes
+
+QUERIES = ['chicken', 'slow cooker', 'grandma', 'lasagna soup', 'pie', 'xyz']
+
+
+def scan_search(df, query):
+
+    return df[df['name'].str.lower().str.contains(query.lower(), na=False)]
+
+
+def timed(func, repeat):
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare lower()+contains() scans with the trigram name index.")
+    parser.add_argument('path', nargs='?')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.path) if args.path else generate_recipes(args.rows)
+
+    start = time.perf_counter()
+    index = get_name_index(df)
+    print(f"index build: {(time.perf_counter() - start) * 1000:.1f} ms for {len(df)} recipes\n")
+
+    print(f"{'query':20} {'matches':>8} {'scan ms':>9} {'rows ms':>9} {'frame ms':>9}")
+    for query in QUERIES:
+        scan_time, expected = timed(lambda: scan_search(df, query), args.repeat)
+        rows_time, _ = timed(lambda: index.search(query), args.repeat)
+        frame_time, result = timed(lambda: search_recipes_by_name(df, query), args.repeat)
+        assert result.index.equals(expected.index)
+        print(f"{query:20} {len(result):8d} {scan_time * 1000:9.2f} {rows_time * 1000:9.3f} {frame_time * 1000:9.3f}")
@@ -0,0 +1,37 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from pantry import get_pantry_index, rank_by_pantry
+from synthetic_data import BASE_INGREDIENTS, generate_recipes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency of pantry ranking over the full recipe set.")
+    parser.add_argument('path', nargs='?')
+    parser.add_argument('--rows', type=int, default=230000)
+    parser.add_argument('--pantries', type=int, default=20)
+    parser.add_argument('--top-k', type=int, default=10)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.path) if args.path else generate_recipes(args.rows)
+    start = time.perf_counter()
+    get_pantry_index(df)
+    print(f"index build: {(time.perf_counter() - start) * 1000:.0f} ms for {len(df)} recipes")
+
+    rng = np.random.default_rng(1)
+    timings = []
+    for _ in range(args.pantries):
+        pantry = list(rng.choice(BASE_INGREDIENTS, size=rng.integers(3, 15), replace=False))
+        start = time.perf_counter()
+        rank_by_pantry(df, pantry, top_k=args.top_k)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings = np.array(timings)
+    print(f"pantry ranking: median {np.median(timings):.1f} ms, p95 {np.percentile(timings, 95):.1f} ms, max {timings.max():.1f} ms")
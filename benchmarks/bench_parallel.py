@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from parallel_search import ParallelSearcher
+from synthetic_data import BASE_INGREDIENTS, NAME_WORDS, generate_recipes
+
+
+def query_batch(size, seed=0):
+
+    rng = np.random.default_rng(seed)
+    names = [str(rng.choice(NAME_WORDS)) for _ in range(size)]
+    ingredients = [', '.join(rng.choice(BASE_INGREDIENTS, size=rng.integers(1, 4), replace=False)) for _ in range(size)]
+    return names, ingredients
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch search throughput with 1/2/4/8 worker processes.")
+    parser.add_argument('path', nargs='?')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--workers', default='1,2,4,8')
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.path) if args.path else generate_recipes(args.rows)
+    names, ingredients = query_batch(args.queries)
+    print(f"{len(df)} recipes, {len(names)} name + {len(ingredients)} ingredient queries, {os.cpu_count()} CPUs available\n")
+
+    baseline = None
+    print(f"{'workers':>7} {'seconds':>9} {'queries/s':>10} {'speedup':>8}")
+    for workers in [int(value) for value in args.workers.split(',')]:
+        with ParallelSearcher(df, workers=workers) as searcher:
+            searcher.search_names(names[:workers])
+            start = time.perf_counter()
+            searcher.search_names(names)
+            searcher.search_ingredients(ingredients)
+            elapsed = time.perf_counter() - start
+
+        throughput = (len(names) + len(ingredients)) / elapsed
+        baseline = baseline or throughput
+        print(f"{workers:7d} {elapsed:9.2f} {throughput:10.1f} {throughput / baseline:7.2f}x")
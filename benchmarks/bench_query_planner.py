@@ -0,0 +1,65 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from query_planner import get_query_planner, is_structured_query
+from synthetic_data import generate_recipes
+
+QUERIES = [
+    'salt, butter, fresh basil',
+    'salt, NOT butter',
+    'chicken OR turkey OR ham',
+    '(garlic OR onion), NOT (walnuts OR pecans), tag:easy',
+    'name:"slow cooker" chicken NOT salt',
+    'saffron, salt, sugar',
+]
+
+
+def user_order(df, terms):
+
+    # The original approach: filter a shrinking DataFrame term by term, in the order typed.
+    result = df
+    for term in terms:
+        result = result[result['ingredients'].str.lower().str.contains(term, na=False, regex=False)]
+    return result
+
+
+def timed(func, repeat):
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time boolean queries through the selectivity-ordered planner.")
+    parser.add_argument('path', nargs='?')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.path) if args.path else generate_recipes(args.rows)
+    planner = get_query_planner(df)
+    planner.run('salt OR name:x OR tag:easy')
+
+    print(f"{'query':56} {'rows':>7} {'planner ms':>11} {'user order ms':>14}")
+    for query in QUERIES:
+        planner_time, rows = timed(lambda: planner.run(query), args.repeat)
+        baseline = '-'
+        if not is_structured_query(query):
+            baseline_time, expected = timed(lambda: user_order(df, [part.strip() for part in query.split(',')]), args.repeat)
+            assert len(expected) == len(rows)
+            baseline = f"{baseline_time * 1000:.2f}"
+        print(f"{query:56} {len(rows):7d} {planner_time * 1000:11.3f} {baseline:>14}")
+
+    print()
+    print(planner.explain(QUERIES[3]))
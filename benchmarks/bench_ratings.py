@@ -0,0 +1,62 @@
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ratings import join_ratings, load_rating_table, rank_rows, rating_order
+from Recipeasy import find_ingredient_rows
+from synthetic_data import generate_recipes, write_interactions_csv
+
+QUERIES = ['saffron', 'fresh basil', 'garlic, onion', 'salt']
+
+
+def timed(func, repeat=1):
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the interactions aggregation, its cache and rating-ordered results.")
+    parser.add_argument('--recipes', type=int, default=230000)
+    parser.add_argument('--interactions', type=int, default=1100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='recipeasy-ratings-')
+    try:
+        path = str(Path(directory) / 'RAW_interactions.csv')
+        write_interactions_csv(path, args.interactions, args.recipes)
+
+        seconds, table = timed(lambda: load_rating_table(path))
+        print(f"aggregate {args.interactions} interactions (streamed): {seconds:8.2f} s -> {len(table)} recipes")
+        seconds, table = timed(lambda: load_rating_table(path), args.repeat)
+        print(f"load cached aggregates:                     {seconds * 1000:8.2f} ms")
+
+        df = generate_recipes(args.recipes)
+        seconds, _ = timed(lambda: join_ratings(df, table))
+        print(f"join onto {len(df)} recipes:                  {seconds * 1000:8.2f} ms")
+        seconds, _ = timed(lambda: rating_order(df))
+        print(f"global rating order:                        {seconds * 1000:8.2f} ms\n")
+
+        scores = df['rating_score'].to_numpy()
+        print(f"{'query':18} {'matches':>8} {'rank_rows ms':>13} {'argsort ms':>11}")
+        for query in QUERIES:
+            rows = find_ingredient_rows(df, query)
+            ranked_seconds, ranked = timed(lambda: rank_rows(df, rows), args.repeat)
+            baseline_seconds, baseline = timed(lambda: rows[np.argsort(-scores[rows], kind='stable')], args.repeat)
+            assert np.array_equal(ranked, baseline)
+            print(f"{query:18} {len(rows):8} {ranked_seconds * 1000:13.3f} {baseline_seconds * 1000:11.3f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,61 @@
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from similarity import ARRAYS, SimilarityIndex, precompute_neighbours
+from synthetic_data import generate_recipes
+
+
+def latencies(func, rows):
+
+    samples = []
+    for row in rows:
+        start = time.perf_counter()
+        func(row)
+        samples.append(time.perf_counter() - start)
+    samples = np.asarray(samples) * 1000
+    return np.mean(samples), np.percentile(samples, 99)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the similar-recipe index: build, exact top-k, batch precompute and lookups.")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--batch-rows', type=int, default=None, help="precompute over the first N recipes only (default: all)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('-k', type=int, default=10)
+    args = parser.parse_args()
+
+    df = generate_recipes(args.rows)
+    start = time.perf_counter()
+    index = SimilarityIndex.build(df)
+    print(f"build for {len(df)} recipes: {time.perf_counter() - start:.2f} s")
+    print(f"index size: {sum(getattr(index, name).nbytes for name in ARRAYS) / (1 << 20):.1f} MB, {int(index.inverted.sum())} inverted terms\n")
+
+    rows = np.random.default_rng(0).integers(0, len(df), size=args.queries)
+    mean, p99 = latencies(lambda row: index.top_k(row, args.k), rows)
+    print(f"exact top-{args.k}:       mean {mean:7.3f} ms  p99 {p99:7.3f} ms")
+
+    directory = tempfile.mkdtemp(prefix='recipeasy-similarity-')
+    try:
+        batch = index if args.batch_rows is None else SimilarityIndex.build(df.iloc[:args.batch_rows].reset_index(drop=True))
+        batch.save(directory)
+        for workers in args.workers:
+            start = time.perf_counter()
+            precompute_neighbours(batch, directory, args.k, workers)
+            elapsed = time.perf_counter() - start
+            print(f"batch, {workers} worker(s): {batch.n_rows / elapsed:9.0f} recipes/s ({elapsed:.1f} s for {batch.n_rows})")
+
+        lookup_rows = rows % batch.n_rows
+        mean, p99 = latencies(lambda row: batch.similar(row, args.k), lookup_rows)
+        print(f"precomputed lookup:   mean {mean:7.3f} ms  p99 {p99:7.3f} ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
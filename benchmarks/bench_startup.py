@@ -0,0 +1,98 @@
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_data import write_recipes_csv
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+ENTRY_POINTS = {
+    'blocking (Recipeasy.py)': SRC / 'Recipeasy.py',
+    'background (quickstart.py)': SRC / 'quickstart.py',
+}
+MENU_MARKER = b'Enter your choice'
+RESULT_MARKER = b'RECIPE RECOMMENDATION'
+
+
+class OutputWatcher:
+
+    def __init__(self, stream, start):
+
+        self.start = start
+        self.buffer = b''
+        self.seen = {}
+        self.changed = threading.Condition()
+        threading.Thread(target=self._read, args=(stream,), daemon=True).start()
+
+    def _read(self, stream):
+
+        for chunk in iter(lambda: stream.read1(65536), b''):
+            with self.changed:
+                self.buffer += chunk
+                self.changed.notify_all()
+
+    def wait_for(self, marker, timeout=600):
+
+        with self.changed:
+            self.changed.wait_for(lambda: marker in self.buffer, timeout)
+            if marker not in self.buffer:
+                raise TimeoutError(f"never saw {marker!r}")
+            return time.perf_counter() - self.start
+
+
+def run_once(script, workdir):
+
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-u', str(script)], cwd=workdir, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    watcher = OutputWatcher(process.stdout, start)
+    try:
+        to_menu = watcher.wait_for(MENU_MARKER)
+        # "Surprise me" is the cheapest action that needs the data.
+        process.stdin.write(b'1\n')
+        process.stdin.flush()
+        to_result = watcher.wait_for(RESULT_MARKER)
+        process.stdin.write(b'4\n')
+        process.stdin.flush()
+        process.wait(timeout=60)
+    finally:
+        process.kill()
+    return to_menu, to_result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure time-to-menu and time-to-first-result for both startup modes.")
+    parser.add_argument('path', nargs='?', help="recipes CSV (synthetic data otherwise)")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='recipeasy-startup-')
+    data_path = os.path.join(workdir, 'data', 'RAW_recipes.csv')
+    if args.path:
+        os.makedirs(os.path.dirname(data_path))
+        shutil.copy(args.path, data_path)
+    else:
+        write_recipes_csv(data_path, args.rows)
+    cache_dir = os.path.join(workdir, 'data', '.recipeasy_cache')
+
+    print(f"{'mode':30} {'cache':6} {'to menu s':>10} {'to first result s':>18}")
+    try:
+        for label, script in ENTRY_POINTS.items():
+            for cache in ('cold', 'warm'):
+                runs = []
+                for _ in range(args.runs):
+                    if cache == 'cold':
+                        shutil.rmtree(cache_dir, ignore_errors=True)
+                    runs.append(run_once(script, workdir))
+                to_menu = sorted(run[0] for run in runs)[len(runs) // 2]
+                to_result = sorted(run[1] for run in runs)[len(runs) // 2]
+                print(f"{label:30} {cache:6} {to_menu:10.3f} {to_result:18.3f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def peak_rss_mb():
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(mode, path, query, chunksize):
+
+    from Recipeasy import search_recipes_by_ingredient
+    from streaming_search import stream_search_by_ingredient
+
+    start = time.perf_counter()
+    first = None
+    total = 0
+    if mode == 'full':
+        matches = search_recipes_by_ingredient(pd.read_csv(path), query)
+        first = time.perf_counter() - start
+        total = len(matches)
+    else:
+        for matches in stream_search_by_ingredient(path, query, chunksize=chunksize):
+            if first is None:
+                first = time.perf_counter() - start
+            total += len(matches)
+
+    return {
+        'mode': mode,
+        'matches': total,
+        'first_result_ms': (first or 0) * 1000,
+        'total_ms': (time.perf_counter() - start) * 1000,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Peak RSS and time to first result: full load vs chunked streaming.")
+    parser.add_argument('path', nargs='?', default='./data/RAW_recipes.csv')
+    parser.add_argument('--rows', type=int, default=100000, help="synthetic rows when path does not exist")
+    parser.add_argument('--query', default='chicken, garlic')
+    parser.add_argument('--chunksize', type=int, default=10000)
+    parser.add_argument('--mode', choices=['full', 'stream'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.path, args.query, args.chunksize)))
+        sys.exit(0)
+
+    path = args.path
+    if not os.path.exists(path):
+        from synthetic_data import write_recipes_csv
+        path = os.path.join(tempfile.mkdtemp(prefix='recipeasy-bench-'), 'RAW_recipes.csv')
+        write_recipes_csv(path, args.rows)
+
+    # Each mode runs in a fresh interpreter so peak RSS is not shared between them.
+    print(f"{'mode':8} {'matches':>8} {'first ms':>10} {'total ms':>10} {'peak RSS MB':>12}")
+    for mode in ('full', 'stream'):
+        output = subprocess.run(
+            [sys.executable, __file__, path, '--query', args.query, '--chunksize', str(args.chunksize), '--mode', mode],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:8} {result['matches']:8d} {result['first_result_ms']:10.1f} {result['total_ms']:10.1f} {result['peak_rss_mb']:12.1f}")
@@ -0,0 +1,245 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_DIR / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from synthetic_data import GENERATOR_VERSION, write_recipes_csv
+
+SIZES = {'10k': 10000, '100k': 100000, '1m': 1000000, '2m': 2000000}
+DEFAULT_SIZES = ['10k', '100k']
+DEFAULT_HISTORY = BENCH_DIR / 'results' / 'history.jsonl'
+DEFAULT_DATA_DIR = Path(tempfile.gettempdir()) / 'recipeasy-bench'
+NAME_QUERIES = ['chicken', 'slow cooker', 'grandma', 'cheesy lasagna', 'zzz no match']
+INGREDIENT_QUERIES = ['salt', 'garlic, onion', 'chocolate chips, walnuts', 'fresh basil', 'saffron']
+REGRESSION_THRESHOLD = 1.25
+
+
+def parse_size(text):
+
+    text = text.lower()
+    if text in SIZES:
+        return SIZES[text]
+    return int(text)
+
+
+def dataset_path(data_dir, rows, seed):
+
+    path = Path(data_dir) / f'recipes_{rows}_s{seed}_g{GENERATOR_VERSION}.csv'
+    if not path.exists():
+        start = time.perf_counter()
+        write_recipes_csv(str(path), rows, seed)
+        print(f"generated {rows} recipes in {time.perf_counter() - start:.1f} s -> {path}", file=sys.stderr)
+    return path
+
+
+def timed(func):
+
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def best_of(func, repeat):
+
+    return min(timed(func)[0] for _ in range(repeat))
+
+
+def peak_rss_mb():
+
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def render_first_page(matches):
+
+    from Recipeasy import display_name_matches
+
+    with contextlib.redirect_stdout(io.StringIO()), patch('builtins.input', return_value='q'):
+        display_name_matches(matches)
+
+
+def measure(path, repeat, profile=False):
+
+    import pandas as pd
+
+    import recipe_cache
+    from Recipeasy import find_ingredient_rows, find_name_rows, format_recipe
+    from ingredient_index import get_ingredient_index
+    from name_index import get_name_index
+    from profiling import profiler
+    from query_cache import search_cache
+
+    if profile:
+        profiler.enable()
+
+    metrics = {}
+    results = {}
+    cache_root = tempfile.mkdtemp(prefix='recipeasy-bench-cache-')
+    try:
+        metrics['csv_load_s'], df = timed(lambda: pd.read_csv(path))
+        metrics['csv_rss_mb'] = peak_rss_mb()
+        del df
+        metrics['cache_build_s'] = timed(lambda: recipe_cache.load_with_cache(str(path), cache_root))[0]
+        metrics['cache_load_s'], df = timed(lambda: recipe_cache.load_with_cache(str(path), cache_root))
+    finally:
+        shutil.rmtree(cache_root, ignore_errors=True)
+
+    metrics['name_index_build_s'] = timed(lambda: get_name_index(df))[0]
+    metrics['ingredient_index_build_s'] = timed(lambda: get_ingredient_index(df))[0]
+
+    for kind, queries, find in (('name', NAME_QUERIES, find_name_rows), ('ingredients', INGREDIENT_QUERIES, find_ingredient_rows)):
+        cold = []
+        warm = []
+        for query in queries:
+            search_cache.clear()
+            elapsed, rows = timed(lambda: find(df, query))
+            cold.append(elapsed)
+            warm.append(best_of(lambda: find(df, query), repeat))
+            results[f'{kind}:{query}'] = int(len(rows))
+        metrics[f'{kind}_query_cold_ms'] = 1000 * sum(cold) / len(cold)
+        metrics[f'{kind}_query_cold_max_ms'] = 1000 * max(cold)
+        metrics[f'{kind}_query_cached_ms'] = 1000 * sum(warm) / len(warm)
+
+    matches = df.iloc[find_name_rows(df, NAME_QUERIES[0])]
+    metrics['display_first_page_ms'] = 1000 * best_of(lambda: render_first_page(matches), repeat)
+    recipe = df.iloc[0]
+    metrics['format_recipe_ms'] = 1000 * best_of(lambda: format_recipe(recipe), repeat)
+
+    metrics['peak_rss_mb'] = peak_rss_mb()
+    measured = {'rows': len(df), 'metrics': {key: round(value, 4) for key, value in metrics.items()}, 'results': results}
+    if profile:
+        measured['profile'] = profiler.snapshot(recent=False)
+    return measured
+
+
+def run_worker(path, repeat, profile=False):
+
+    # Each size runs in a fresh interpreter so peak RSS and warm caches do not leak between sizes.
+    command = [sys.executable, __file__, '--worker', str(path), '--repeat', str(repeat)]
+    if profile:
+        command.append('--profile')
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=REPO_DIR)
+    if completed.returncode != 0:
+        raise RuntimeError(f"benchmark worker failed for {path}:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_revision():
+
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=REPO_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def read_history(path):
+
+    if not os.path.exists(path):
+        return []
+    with open(path) as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def append_history(path, record):
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a') as handle:
+        handle.write(json.dumps(record, sort_keys=True) + '\n')
+
+
+def previous_run(history, record):
+
+    for entry in reversed(history):
+        if (entry['rows'], entry['seed'], entry['generator']) == (record['rows'], record['seed'], record['generator']):
+            return entry
+    return None
+
+
+def compare(previous, record, threshold=REGRESSION_THRESHOLD):
+
+    lines = []
+    for key, value in record['metrics'].items():
+        before = previous['metrics'].get(key)
+        if not before:
+            continue
+        ratio = value / before
+        flag = '  REGRESSION' if ratio > threshold else ''
+        lines.append(f"  {key:28} {before:12.3f} -> {value:12.3f}  ({ratio:5.2f}x){flag}")
+    for query, count in record['results'].items():
+        before = previous['results'].get(query)
+        if before is not None and before != count:
+            lines.append(f"  results changed for {query!r}: {before} -> {count}")
+    return lines
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Benchmark load, search and display at increasing dataset sizes.")
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help="any of 10k 100k 1m 2m, or a row count")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help="where generated CSVs are kept between runs")
+    parser.add_argument('--history', default=str(DEFAULT_HISTORY), help="JSON Lines file each run is appended to")
+    parser.add_argument('--profile', action='store_true', help="also record per-stage timings from the profiler")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(measure(args.worker, args.repeat, args.profile)))
+        return 0
+
+    history = read_history(args.history)
+    revision = git_revision()
+    for size in args.sizes:
+        rows = parse_size(size)
+        path = dataset_path(args.data_dir, rows, args.seed)
+        measured = run_worker(path, args.repeat, args.profile)
+        record = {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'revision': revision,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'rows': rows,
+            'seed': args.seed,
+            'generator': GENERATOR_VERSION,
+            'metrics': measured['metrics'],
+            'results': measured['results'],
+        }
+        if 'profile' in measured:
+            record['profile'] = measured['profile']
+
+        print(f"\n{rows} recipes")
+        for key, value in record['metrics'].items():
+            print(f"  {key:28} {value:12.3f}")
+
+        previous = previous_run(history, record)
+        if previous is not None:
+            print(f"compared with {previous['revision']} ({previous['timestamp']}):")
+            print('\n'.join(compare(previous, record)))
+
+        append_history(args.history, record)
+        history.append(record)
+
+    print(f"\nappended {len(args.sizes)} run(s) to {args.history}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from service import RecipeService
+from synthetic_data import BASE_INGREDIENTS, NAME_WORDS, generate_recipes
+
+
+def request_targets(count, seed=0):
+
+    rng = np.random.default_rng(seed)
+    targets = []
+    for _ in range(count):
+        kind = rng.choice(['name', 'ingredients', 'surprise'], p=[0.45, 0.45, 0.1])
+        if kind == 'name':
+            targets.append(f"/search/name?q={rng.choice(NAME_WORDS).replace(' ', '%20')}&limit=10")
+        elif kind == 'ingredients':
+            terms = ','.join(rng.choice(BASE_INGREDIENTS, size=rng.integers(1, 4), replace=False))
+            targets.append(f"/search/ingredients?q={terms.replace(' ', '%20')}&limit=10")
+        else:
+            targets.append(f"/surprise?max_minutes={rng.integers(10, 120)}")
+    return targets
+
+
+def start_local_service(df, workers):
+
+    ready = threading.Event()
+    state = {}
+
+    def run():
+        async def main():
+            service = RecipeService(df, workers)
+            service.warm_up()
+            server = await service.start('127.0.0.1', 0)
+            state['port'] = server.sockets[0].getsockname()[1]
+            ready.set()
+            await server.serve_forever()
+        try:
+            asyncio.run(main())
+        except asyncio.CancelledError:
+            pass
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return state['port']
+
+
+async def client(host, port, targets, latencies):
+
+    reader, writer = await asyncio.open_connection(host, port)
+    for target in targets:
+        start = time.perf_counter()
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+        await writer.drain()
+        head = await reader.readuntil(b'\r\n\r\n')
+        length = next(int(line.split(b':')[1]) for line in head.split(b'\r\n') if line.lower().startswith(b'content-length'))
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def fetch_stats(host, port):
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /stats HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    body = (await reader.read()).split(b'\r\n\r\n', 1)[1]
+    writer.close()
+    return json.loads(body)
+
+
+async def run_load(host, port, concurrency, requests):
+
+    targets = request_targets(requests)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, targets[i::concurrency], latencies) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return np.array(latencies) * 1000, elapsed, await fetch_stats(host, port)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test a local Recipeasy service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help="target an already running service instead of starting one")
+    parser.add_argument('--data', help="CSV for the in-process service (synthetic data otherwise)")
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    port = args.port
+    if port is None:
+        df = pd.read_csv(args.data) if args.data else generate_recipes(args.rows)
+        port = start_local_service(df, args.workers)
+        print(f"started in-process service on port {port} with {len(df)} recipes")
+
+    latencies, elapsed, stats = asyncio.run(run_load(args.host, port, args.concurrency, args.requests))
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{len(latencies)} requests, concurrency {args.concurrency}: {len(latencies) / elapsed:.0f} req/s")
+    print(f"client latency ms: p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {latencies.max():.2f}")
+    print("server-side latency by endpoint:")
+    for endpoint, summary in stats['latency'].items():
+        print(f"  {endpoint:20} {summary}")
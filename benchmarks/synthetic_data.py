@@ -0,0 +1,160 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+BASE_INGREDIENTS = [
+    'salt', 'butter', 'sugar', 'onion', 'water', 'eggs', 'olive oil', 'flour', 'milk',
+    'garlic cloves', 'pepper', 'brown sugar', 'all-purpose flour', 'baking powder', 'egg',
+    'salt and pepper', 'parmesan cheese', 'lemon juice', 'baking soda', 'vegetable oil',
+    'vanilla', 'black pepper', 'cinnamon', 'tomatoes', 'sour cream', 'garlic', 'honey',
+    'cream cheese', 'onions', 'chicken broth', 'garlic powder', 'carrots', 'potatoes',
+    'celery', 'chicken', 'boneless skinless chicken breasts', 'ground beef', 'bacon',
+    'cheddar cheese', 'mozzarella cheese', 'soy sauce', 'ginger', 'cumin', 'paprika',
+    'chili powder', 'oregano', 'basil', 'thyme', 'parsley', 'rice', 'pasta', 'spaghetti',
+    'lasagna noodles', 'tomato sauce', 'heavy cream', 'chocolate chips', 'walnuts',
+    'pecans', 'almonds', 'peanut butter', 'banana', 'apples', 'strawberries', 'blueberries',
+    'lime juice', 'cilantro', 'jalapeno', 'avocado', 'black beans', 'corn', 'zucchini',
+    'spinach', 'mushrooms', 'green bell pepper', 'red bell pepper', 'shrimp', 'salmon',
+    'pork chops', 'turkey', 'ham', 'sausage', 'yogurt', 'oats', 'maple syrup', 'coconut milk',
+]
+NAME_WORDS = [
+    'easy', 'best', 'quick', 'grandma\'s', 'spicy', 'creamy', 'baked', 'grilled', 'slow cooker',
+    'chicken', 'beef', 'vegetable', 'chocolate', 'lemon', 'garlic', 'cheesy', 'healthy',
+    'crock pot', 'lasagna', 'soup', 'salad', 'casserole', 'cookies', 'cake', 'bread',
+    'muffins', 'pie', 'stew', 'chili', 'pasta', 'tacos', 'curry', 'stir fry', 'pancakes',
+]
+TAGS = [
+    'time-to-make', 'course', 'main-ingredient', 'preparation', 'occasion', 'dietary',
+    '60-minutes-or-less', '30-minutes-or-less', 'easy', 'desserts', 'main-dish', 'vegetarian',
+    'low-in-something', 'meat', 'poultry', 'healthy', 'low-carb', 'beginner-cook',
+]
+STEP_WORDS = ['mix', 'stir', 'bake', 'chop', 'simmer', 'whisk', 'serve', 'combine', 'heat', 'pour']
+
+
+def ingredient_vocabulary(size, rng):
+
+    vocabulary = list(BASE_INGREDIENTS)
+    modifiers = ['fresh', 'dried', 'chopped', 'frozen', 'low-fat', 'organic', 'ground', 'sliced']
+    while len(vocabulary) < size:
+        vocabulary.append(f"{rng.choice(modifiers)} {rng.choice(BASE_INGREDIENTS)} {len(vocabulary)}")
+    return vocabulary
+
+
+def zipf_weights(size, exponent=1.1):
+
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _list_literal(items):
+
+    return '[' + ', '.join(repr(item) for item in items) + ']'
+
+
+GENERATOR_VERSION = 2
+CHUNK_ROWS = 100000
+
+
+def _pick_without_replacement(rng, n_rows, population, low, high):
+
+    # Ranking a random matrix gives each row an independent permutation of the population.
+    counts = rng.integers(low, high, size=n_rows)
+    order = rng.random((n_rows, len(population))).argsort(axis=1)
+    population = np.asarray(population, dtype=object)
+    return [population[order[row, :counts[row]]] for row in range(n_rows)]
+
+
+def generate_recipes(n_rows, seed=0, vocabulary_size=4000, start_id=100000):
+
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(ingredient_vocabulary(vocabulary_size, np.random.default_rng(0)), dtype=object)
+    weights = zipf_weights(len(vocabulary))
+
+    n_ingredients = rng.integers(2, 18, size=n_rows)
+    n_steps = rng.integers(1, 20, size=n_rows)
+    picks = vocabulary[rng.choice(len(vocabulary), size=int(n_ingredients.sum()), p=weights)]
+    bounds = np.concatenate(([0], np.cumsum(n_ingredients)))
+
+    ingredients = []
+    for row in range(n_rows):
+        items = list(dict.fromkeys(picks[bounds[row]:bounds[row + 1]]))
+        ingredients.append(_list_literal(items))
+        n_ingredients[row] = len(items)
+
+    names = [' '.join(words) for words in _pick_without_replacement(rng, n_rows, NAME_WORDS, 2, 5)]
+    tag_lists = [_list_literal(list(tags)) for tags in _pick_without_replacement(rng, n_rows, TAGS, 3, 8)]
+
+    step_words = np.array(STEP_WORDS, dtype=object)[rng.integers(0, len(STEP_WORDS), size=(int(n_steps.sum()), 4))]
+    step_texts = [' '.join(words) for words in step_words.tolist()]
+    step_bounds = np.concatenate(([0], np.cumsum(n_steps))).tolist()
+    steps = [_list_literal(step_texts[step_bounds[row]:step_bounds[row + 1]]) for row in range(n_rows)]
+
+    nutrition = [_list_literal(values) for values in np.round(rng.gamma(2.0, 60.0, size=(n_rows, 7)), 1).tolist()]
+
+    return pd.DataFrame({
+        'name': names,
+        'id': np.arange(n_rows) + start_id,
+        'minutes': rng.integers(1, 240, size=n_rows),
+        'contributor_id': rng.integers(1000, 2000000, size=n_rows),
+        'submitted': pd.Timestamp('2000-01-01') + pd.to_timedelta(rng.integers(0, 6500, size=n_rows), unit='D'),
+        'tags': tag_lists,
+        'nutrition': nutrition,
+        'n_steps': n_steps,
+        'steps': steps,
+        'description': [f"a {name} recipe" for name in names],
+        'ingredients': ingredients,
+        'n_ingredients': n_ingredients,
+    })
+
+
+def write_recipes_csv(path, n_rows, seed=0, chunk_rows=CHUNK_ROWS):
+
+    # Large datasets are written chunk by chunk so generating 2M rows stays within memory;
+    # each chunk has its own derived seed, so the output only depends on (n_rows, seed).
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', newline='') as handle:
+        for chunk, start in enumerate(range(0, n_rows, chunk_rows)):
+            rows = min(chunk_rows, n_rows - start)
+            frame = generate_recipes(rows, seed=[seed, chunk], start_id=100000 + start)
+            frame.to_csv(handle, index=False, header=chunk == 0, date_format='%Y-%m-%d')
+    os.replace(tmp_path, path)
+    return path
+
+
+def generate_interactions(n_rows, n_recipes, seed=0, start_id=100000):
+
+    # Popularity is Zipf-like and most ratings are 4-5 stars, as on Food.com; 0 means a review without stars.
+    rng = np.random.default_rng(seed)
+    recipe_ids = rng.choice(n_recipes, size=n_rows, p=zipf_weights(n_recipes, exponent=0.8)) + start_id
+    return pd.DataFrame({
+        'user_id': rng.integers(1000, 2000000, size=n_rows),
+        'recipe_id': recipe_ids,
+        'date': pd.Timestamp('2000-01-01') + pd.to_timedelta(rng.integers(0, 6500, size=n_rows), unit='D'),
+        'rating': rng.choice(6, size=n_rows, p=[0.05, 0.01, 0.01, 0.04, 0.17, 0.72]),
+        'review': 'tasty',
+    })
+
+
+def write_interactions_csv(path, n_rows, n_recipes, seed=0, chunk_rows=CHUNK_ROWS):
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', newline='') as handle:
+        for chunk, start in enumerate(range(0, n_rows, chunk_rows)):
+            frame = generate_interactions(min(chunk_rows, n_rows - start), n_recipes, seed=[seed, chunk])
+            frame.to_csv(handle, index=False, header=chunk == 0, date_format='%Y-%m-%d')
+    os.replace(tmp_path, path)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a RAW_recipes-shaped synthetic CSV.")
+    parser.add_argument('path')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    write_recipes_csv(args.path, args.rows, args.seed)
+    print(f"Wrote {args.rows} synthetic recipes to {args.path}")
@@ -1,5 +1,48 @@
 import pandas as pd
+import numpy as np
 import os
+import sys
+
+import recipe_cache
+import lean_frame
+from autocomplete import complete_ingredients, complete_name
+from facets import filter_rows, get_facet_index, parse_filters
+from fuzzy_search import suggest_ingredient_query, suggest_name_query
+from ingredient_index import get_ingredient_index
+from name_index import get_name_index
+from menu import CHOICE_PROMPT, MENU_ACTIONS, print_banner, print_goodbye, print_invalid_choice, print_menu
+from pantry import rank_by_pantry
+from profiling import profiler
+from query_planner import is_structured_query, run_query
+from query_cache import normalize_ingredient_query, normalize_name_query, search_cache
+from ratings import default_weights, load_ratings_for, rank_rows
+from sampling import get_sampler
+from similarity import similar_rows
+from recipe_records import NUTRITION_FIELDS, is_present, parse_list, parse_nutrition
+
+PAGE_SIZE = 10
+
+SUMMARY_FACETS = ('minutes', 'n_ingredients', 'calories')
+
+SIMILAR_COUNT = 10
+
+last_recipe_id = None
+
+DATA_PATHS = [
+    './data/RAW_recipes.csv',
+    './data/recipes.csv',
+    'RAW_recipes.csv',
+    'recipes.csv'
+]
+DATASET_NOT_FOUND = "Dataset not found. Pass --data or run Recipeasy.py once to download it."
+
+def find_data_path():
+
+    # For the command-line tools, which take --data instead of offering a download.
+    for path in DATA_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
 
 def download_dataset():
 
@@ -33,21 +76,36 @@ def download_dataset():
         {"username":"your_kaggle_username","key":"your_api_key"}
         """
 
-def load_recipe_data():
+def load_recipe_data(use_cache=True, lean=False, columns=None, drop=()):
 
-    data_paths = [
-        './data/RAW_recipes.csv',
-        './data/recipes.csv',
-        'RAW_recipes.csv',
-        'recipes.csv'
-    ]
-    
     df = None
-    for path in data_paths:
+    for path in DATA_PATHS:
         if os.path.exists(path):
             try:
-                df = pd.read_csv(path)
+                with profiler.stage('load') as stage:
+                    if use_cache:
+                        df = recipe_cache.load_with_cache(path, columns=columns)
+                    elif columns is not None:
+                        df = pd.read_csv(path, usecols=lambda column: column in columns)
+                    else:
+                        df = pd.read_csv(path)
+                    stage.add('rows', len(df))
                 print(f"Loaded {len(df)} recipes successfully!\n")
+                # Ratings add columns, which would drop indexes already built for the frame, so they
+                # are joined first; lean mode then downcasts them along with the rest.
+                load_ratings(df, path)
+                
+                if lean:
+                    with profiler.stage('load.lean'):
+                        df = lean_frame.optimize_frame(df, drop=drop)
+                        # Pantry ranking scores recipes over these integer codes.
+                        if 'ingredients' in df.columns:
+                            lean_frame.get_interned_ingredients(df)
+                elif drop:
+                    df = df.drop(columns=[column for column in drop if column in df.columns])
+                if use_cache:
+                    # Lets derived indexes (e.g. similar recipes) be saved next to the recipe cache.
+                    df.attrs['source_path'] = path
                 return df
             except Exception as e:
                 print(f"Error loading {path}: {e}")
@@ -59,7 +117,7 @@ def load_recipe_data():
         
         if user_input == 'yes':
             if download_dataset():
-                return load_recipe_data()
+                return load_recipe_data(use_cache, lean, columns, drop)
         else:
             print("\nPlease download the dataset manually:")
             print("1. Go to Kaggle: https://www.kaggle.com/shuyangli94/food-com-recipes-and-user-interactions")
@@ -68,169 +126,470 @@ def load_recipe_data():
     
     return None
 
+def load_ratings(df, path):
+
+    try:
+        with profiler.stage('load.ratings'):
+            table = load_ratings_for(df, path)
+    except Exception as e:
+        print(f"Could not load ratings: {e}\n")
+        return None
+    
+    if table is not None:
+        print(f"Ranking results by {int(table.reviews.sum())} reviews of {len(table)} recipes.\n")
+    return table
+
+def find_name_rows(df, query):
+
+    with profiler.stage('search.name') as stage:
+        def compute():
+            stage.add('rows_scanned', len(df))
+            return get_name_index(df).search(query)
+        
+        rows = search_cache.rows_for(df, 'name', normalize_name_query(query), compute)
+        stage.add('rows_matched', len(rows))
+    return rows
+
 def search_recipes_by_name(df, query):
 
-    query = query.lower()
-    matches = df[df['name'].str.lower().str.contains(query, na=False)]
-    return matches
+    return df.iloc[rank_rows(df, find_name_rows(df, query))]
 
-def search_recipes_by_ingredient(df, query):
+def find_ingredient_rows(df, query):
 
     if 'ingredients' not in df.columns:
-        return pd.DataFrame()
+        return np.zeros(0, dtype=np.int64)
 
-    ingredients = [ing.strip().lower() for ing in query.split(',') if ing.strip()]
+    ingredients = normalize_ingredient_query(query)
     
     if not ingredients:
+        return np.zeros(0, dtype=np.int64)
+    
+    with profiler.stage('search.ingredients') as stage:
+        def compute():
+            stage.add('rows_scanned', len(df))
+            return get_ingredient_index(df).search(ingredients)
+        
+        rows = search_cache.rows_for(df, 'ingredients', ingredients, compute)
+        stage.add('rows_matched', len(rows))
+    return rows
+
+def did_you_mean(df, query, suggest, find_rows):
+
+    with profiler.stage('search.fuzzy'):
+        suggestion = suggest(df, query)
+        rows = find_rows(df, suggestion) if suggestion is not None else []
+    
+    if len(rows) == 0:
+        return query, rows
+    
+    print(f"\nNo exact matches for '{query}'. Did you mean '{suggestion}'?")
+    return suggestion, rows
+
+def search_recipes_by_ingredient(df, query):
+
+    if 'ingredients' not in df.columns:
         return pd.DataFrame()
+
+    if not normalize_ingredient_query(query):
+        return pd.DataFrame()
+    
+    return df.iloc[rank_rows(df, find_ingredient_rows(df, query))]
+
+def format_items(value, numbered=False):
+
+    items = parse_list(value)
     
-    matches = df
+    if items is None:
+        return [str(value)]
     
-    for ingredient in ingredients:
-        matches = matches[matches['ingredients'].astype(str).str.lower().str.contains(ingredient, na=False, regex=False)]
+    if numbered:
+        return [f"{number}. {item}" for number, item in enumerate(items, 1)]
     
-    return matches
+    return [f"- {item}" for item in items]
+
+def format_inline(value, numbered=False):
+
+    items = parse_list(value)
+    
+    if items is None:
+        return str(value)
+    
+    if numbered:
+        return " ".join(f"{number}. {item}" for number, item in enumerate(items, 1))
+    
+    return ", ".join(str(item) for item in items)
+
+def format_nutrition(value):
+
+    values = parse_nutrition(value)
+    
+    if values is None or len(values) == 0:
+        return None
+    
+    labels = [field.replace('_', ' ').capitalize() for field in NUTRITION_FIELDS]
+    facts = [f"Calories: {values[0]:g}"]
+    facts.extend(f"{label}: {amount:g}% DV" for label, amount in zip(labels[1:], values[1:]))
+    return ", ".join(facts)
+
+def format_recipe(recipe):
+
+    lines = ["", "="*60, "RECIPE RECOMMENDATION", "="*60, "", f"Name: {recipe['name']}"]
+    
+    if 'minutes' in recipe:
+        lines.append(f"Cooking Time: {recipe['minutes']} minutes")
+    
+    if 'n_steps' in recipe:
+        lines.append(f"Number of Steps: {recipe['n_steps']}")
+    
+    if 'n_ingredients' in recipe:
+        lines.append(f"Number of Ingredients: {recipe['n_ingredients']}")
+    
+    if 'rating' in recipe and is_present(recipe['rating']):
+        lines.append(f"Rating: {recipe['rating']:.1f} / 5 ({recipe['n_reviews']} reviews)")
+    
+    if 'nutrition' in recipe and is_present(recipe['nutrition']):
+        nutrition = format_nutrition(recipe['nutrition'])
+        if nutrition:
+            lines.append(f"Nutrition: {nutrition}")
+    
+    if 'ingredients' in recipe and is_present(recipe['ingredients']):
+        lines.extend(["", "Ingredients:"] + format_items(recipe['ingredients']))
+    
+    if 'steps' in recipe and is_present(recipe['steps']):
+        lines.extend(["", "Instructions:"] + format_items(recipe['steps'], numbered=True))
+    
+    if 'description' in recipe and is_present(recipe['description']):
+        lines.extend(["", f"Description:\n{recipe['description']}"])
+    
+    lines.extend(["", "="*60, ""])
+    return "\n".join(lines)
 
 def display_recipe(recipe):
 
-    print("\n" + "="*60)
-    print("RECIPE RECOMMENDATION")
-    print("="*60)
+    global last_recipe_id
+    if 'id' in recipe and is_present(recipe['id']):
+        last_recipe_id = int(recipe['id'])
+    
+    with profiler.stage('render'):
+        print(format_recipe(recipe))
+
+def format_recipe_version(recipe, number):
+
+    lines = ["", f"  VERSION {number}:", f"Name: {recipe['name']}"]
+    
+    if 'minutes' in recipe:
+        lines.append(f"Cooking Time: {recipe['minutes']} minutes")
+    
+    if 'n_steps' in recipe:
+        lines.append(f"Number of Steps: {recipe['n_steps']}")
+    
+    if 'n_ingredients' in recipe:
+        lines.append(f"Number of Ingredients: {recipe['n_ingredients']}")
+    
+    if 'rating' in recipe and is_present(recipe['rating']):
+        lines.append(f"Rating: {recipe['rating']:.1f} / 5 ({recipe['n_reviews']} reviews)")
+    
+    if 'ingredients' in recipe and is_present(recipe['ingredients']):
+        lines.append(f"Ingredients: {format_inline(recipe['ingredients'])}")
+    
+    if 'steps' in recipe and is_present(recipe['steps']):
+        lines.append(f"Instructions: {format_inline(recipe['steps'], numbered=True)}")
+    
+    if 'description' in recipe and is_present(recipe['description']):
+        lines.append(f"Description: {recipe['description']}")
+    
+    lines.append("-" * 60)
+    return "\n".join(lines)
+
+def group_by_name(matches):
+
+    codes, names = pd.factorize(matches['name'])
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes[codes >= 0], minlength=len(names))
+    bounds = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum(counts, out=bounds[1:])
+    # Unnamed rows sort first with code -1; skip past them.
+    order = order[len(codes) - bounds[-1]:]
+    return names, order, bounds
+
+def format_name_groups(matches, names, order, bounds, first, last):
+
+    page = matches.iloc[order[bounds[first]:bounds[last]]]
+    records = page.to_dict('records')
+    blocks = []
+    
+    for group in range(first, last):
+        versions = records[bounds[group] - bounds[first]:bounds[group + 1] - bounds[first]]
+        
+        if len(versions) > 1:
+            blocks.append("\n".join(["", "="*60, f"{names[group]} ({len(versions)} versions found):", "="*60]))
+            blocks.extend(format_recipe_version(recipe, number) for number, recipe in enumerate(versions, 1))
+        else:
+            blocks.append(format_recipe(versions[0]))
+    
+    return "\n".join(blocks)
+
+def display_name_matches(matches, page_size=PAGE_SIZE):
+
+    names, order, bounds = group_by_name(matches)
+    
+    for first in range(0, len(names), page_size):
+        last = min(first + page_size, len(names))
+        with profiler.stage('render') as stage:
+            print(format_name_groups(matches, names, order, bounds, first, last))
+            stage.add('rows_rendered', int(bounds[last] - bounds[first]))
+        
+        if last < len(names):
+            print(f"\nShowing recipe names {first + 1}-{last} of {len(names)}.")
+            more = input("Press Enter to see more, or 'q' to return to the menu: ").strip().lower()
+            if more == 'q':
+                break
+
+def display_pantry_matches(ranked):
+
+    with profiler.stage('render'):
+        print(format_pantry_matches(ranked))
+
+def format_pantry_matches(ranked):
+
+    lines = ["", "="*60, "BEST MATCHES FOR YOUR PANTRY:", "="*60]
+    
+    for idx, recipe in enumerate(ranked.to_dict('records'), 1):
+        lines.append(f"{idx}. {recipe['name']} - you have {recipe['pantry_coverage']:.0%} "
+                     f"({recipe['pantry_missing']} missing)")
+        if recipe['missing_ingredients']:
+            lines.append(f"   Missing: {', '.join(str(item) for item in recipe['missing_ingredients'])}")
+    
+    lines.append("="*60)
+    return "\n".join(lines)
+
+def format_facet_counts(df, rows, fields=SUMMARY_FACETS):
+
+    facets = get_facet_index(df)
+    lines = []
+    for field in fields:
+        if field not in facets.fields():
+            continue
+        buckets = [f"{label} ({count})" for label, count in facets.histogram(field, rows) if count]
+        lines.append(f"{field.replace('_', ' ').title()}: {' | '.join(buckets)}")
+    return "\n".join(lines)
+
+def find_recipe_row(df, text):
+
+    if text.isdigit():
+        rows = np.flatnonzero(df['id'].to_numpy() == int(text))
+    else:
+        rows = rank_rows(df, find_name_rows(df, text))
+    return int(rows[0]) if len(rows) else None
+
+def format_similar_recipes(df, row, rows, scores):
+
+    names = df['name'].to_numpy(dtype=object)
+    lines = ["", "="*60, f"RECIPES LIKE: {names[row]}", "="*60]
+    lines.extend(f"{idx}. {names[match]} ({score:.0%} similar)" for idx, (match, score) in enumerate(zip(rows, scores), 1))
+    lines.append("="*60)
+    return "\n".join(lines)
+
+def format_completions(text, completions):
+
+    if not completions:
+        return f"\nNo suggestions for '{text}'."
+    return f"\nSuggestions for '{text}': " + ", ".join(f"{completion} ({count})" for completion, count in completions)
+
+def ask(prompt, complete):
+
+    # Typing ?prefix lists completions and asks again.
+    while True:
+        text = input(prompt).strip()
+        if not text.startswith('?'):
+            return text
+        print(format_completions(text[1:], complete(text[1:])))
+
+def run_choice(df, choice):
+
+    if choice == '1':
+        random_recipe = get_sampler(df).sample_recipes(1, weights=default_weights(df)).iloc[0]
+        display_recipe(random_recipe)
+    
+    elif choice == '2':
+        query = ask("\nEnter recipe name to search: ", lambda text: complete_name(df, text))
     
-    print(f"\nName: {recipe['name']}")
+        if not query:
+            print("Please enter a search term.")
+            return True
     
-    if 'minutes' in recipe.index:
-        print(f"Cooking Time: {recipe['minutes']} minutes")
+        matches = search_recipes_by_name(df, query)
     
-    if 'n_steps' in recipe.index:
-        print(f"Number of Steps: {recipe['n_steps']}")
+        if len(matches) == 0:
+            query, rows = did_you_mean(df, query, suggest_name_query, find_name_rows)
+            matches = df.iloc[rank_rows(df, rows)]
     
-    if 'n_ingredients' in recipe.index:
-        print(f"Number of Ingredients: {recipe['n_ingredients']}")
+        if len(matches) == 0:
+            print(f"\nNo recipes found with name matching '{query}'. Try another search!")
+        else:
+            print(f"\nFound {len(matches)} recipes with name matching '{query}'!")
     
-    if 'ingredients' in recipe.index and pd.notna(recipe['ingredients']):
-        print(f"\nIngredients:\n{recipe['ingredients']}")
+            display_name_matches(matches)
     
-    if 'steps' in recipe.index and pd.notna(recipe['steps']):
-        print(f"\nInstructions:\n{recipe['steps']}")
+    elif choice == '3':
+        print("\nEnter ingredient(s) to search:")
+        print("(For multiple ingredients, separate with commas. Example: chicken, garlic, tomato)")
+        print("(Or combine with AND, OR, NOT, brackets, name: and tag:. Example: chicken OR turkey, NOT nuts)")
+        query = ask("Ingredient(s): ", lambda text: complete_ingredients(df, text))
     
-    if 'description' in recipe.index and pd.notna(recipe['description']):
-        print(f"\nDescription:\n{recipe['description']}")
+        if not query:
+            print("Please enter a search term.")
+            return True
     
-    print("\n" + "="*60 + "\n")
+        structured = is_structured_query(query)
+        if structured:
+            try:
+                rows = run_query(df, query)
+            except ValueError as e:
+                print(f"\nCould not understand that query: {e}")
+                return True
+        else:
+            rows = find_ingredient_rows(df, query)
+    
+        if len(rows) == 0 and not structured:
+            query, rows = did_you_mean(df, query, suggest_ingredient_query, find_ingredient_rows)
+    
+        if len(rows) == 0:
+            print(f"\nNo recipes found with ingredient(s) '{query}'. Try another search!")
+        else:
+            ingredients_list = [ing.strip() for ing in query.split(',')]
+            if structured:
+                print(f"\nFound {len(rows)} recipes matching: {query}")
+            elif len(ingredients_list) > 1:
+                print(f"\nFound {len(rows)} recipes containing ALL of: {', '.join(ingredients_list)}")
+            else:
+                print(f"\nFound {len(rows)} recipes with ingredient '{query}'!")
+    
+            rows = rank_rows(df, rows)
+            with profiler.stage('render') as stage:
+                names = df['name'].to_numpy(dtype=object)[rows]
+                lines = ["", "="*60, "ALL MATCHING RECIPES:", "="*60]
+                lines.extend(f"{idx}. {recipe_name}" for idx, recipe_name in enumerate(names, 1))
+                lines.append("="*60)
+                print("\n".join(lines))
+                stage.add('rows_rendered', len(rows))
+    
+            print("\nDisplaying a random recipe from the results:")
+            random_recipe = get_sampler(df).sample_recipes(1, rows=rows).iloc[0]
+            display_recipe(random_recipe)
 
-def main():
+    elif choice == '4':
+        print_goodbye()
+        return False
+    
+    elif choice == '5':
+        print("\nEnter the ingredients you have:")
+        print("(Separate with commas. Example: chicken, rice, onion, garlic)")
+        query = ask("Pantry: ", lambda text: complete_ingredients(df, text))
+    
+        if not query:
+            print("Please enter at least one ingredient.")
+            return True
+    
+        ranked = rank_by_pantry(df, query)
+    
+        if len(ranked) == 0:
+            print(f"\nNo recipes use any of '{query}'. Try another pantry!")
+        else:
+            display_pantry_matches(ranked)
+    
+            print("\nYour best match:")
+            display_recipe(ranked.iloc[0])
+    
+    elif choice == '6':
+        print("\nEnter filters, separated by commas.")
+        print("(Example: minutes<30, calories<500, n_ingredients<=8, protein=20-50)")
+        text = input("Filters: ").strip()
+    
+        if not text:
+            print("Please enter at least one filter.")
+            return True
+    
+        try:
+            filters = parse_filters(text)
+        except ValueError as e:
+            print(f"\n{e}")
+            return True
+    
+        query = ask("Only recipes with ingredient(s) (press Enter for any): ", lambda text: complete_ingredients(df, text))
+        rows = find_ingredient_rows(df, query) if query else None
+        rows = filter_rows(df, filters, rows)
+    
+        if len(rows) == 0:
+            print("\nNo recipes match those filters. Try widening them!")
+        else:
+            print(f"\nFound {len(rows)} recipes matching your filters!")
+            print(format_facet_counts(df, rows))
+    
+            print("\nDisplaying a random recipe from the results:")
+            random_recipe = get_sampler(df).sample_recipes(1, rows=rows).iloc[0]
+            display_recipe(random_recipe)
+    
+    elif choice == '7':
+        if 'id' not in df.columns or not {'ingredients', 'tags'} & set(df.columns):
+            print("\nThis dataset has no recipe ids or ingredients to compare.")
+            return True
+    
+        text = ask("\nRecipe id or name (press Enter for the last recipe shown): ", lambda text: complete_name(df, text))
+        if not text:
+            if last_recipe_id is None:
+                print("Show a recipe first, or enter a recipe name or id.")
+                return True
+            text = str(last_recipe_id)
+    
+        row = find_recipe_row(df, text)
+        if row is None:
+            print(f"\nNo recipe found for '{text}'. Try another search!")
+            return True
+    
+        rows, scores = similar_rows(df, row, SIMILAR_COUNT)
+        if len(rows) == 0:
+            print(f"\nNo recipes share ingredients or tags with '{df['name'].iloc[row]}'.")
+        else:
+            print(format_similar_recipes(df, row, rows, scores))
+    
+            print("\nThe closest match:")
+            display_recipe(df.iloc[rows[0]])
+    
+    else:
+        print_invalid_choice()
+    
+    return True
+
+def main(profile=False):
 
-    print("="*60)
-    print("RANDOM RECIPE RECOMMENDER")
-    print("="*60)
-    print("\nWelcome! This program recommends random recipes from Kaggle's")
-    print("Recipe Dataset (over 2M recipes).\n")
+    print_banner()
     
-    df = load_recipe_data()
+    if profile:
+        profiler.enable(trace_memory=True, echo=True)
+    
+    with profiler.query('load'):
+        df = load_recipe_data()
     
     if df is None:
+        profiler.disable()
         return
     
     while True:
-        print("\nWhat would you like to do?")
-        print("1. Suprise Me!")
-        print("2. Search for recipes by name")
-        print("3. Search for recipes by ingredient")
-        print("4. Quit")
+        print_menu()
         
-        choice = input("\nEnter your choice (1-4): ").strip()
+        choice = input(CHOICE_PROMPT).strip()
         
-        if choice == '1':
-            random_recipe = df.sample(n=1).iloc[0]
-            display_recipe(random_recipe)
-            
-        elif choice == '2':
-            query = input("\nEnter recipe name to search: ").strip()
-            
-            if not query:
-                print("Please enter a search term.")
-                continue
-            
-            matches = search_recipes_by_name(df, query)
-            
-            if len(matches) == 0:
-                print(f"\nNo recipes found with name matching '{query}'. Try another search!")
-            else:
-                print(f"\nFound {len(matches)} recipes with name matching '{query}'!")
-                
-                for name in matches['name'].unique():
-                    versions = matches[matches['name'] == name]
-                    
-                    if len(versions) > 1:
-                        print("\n" + "="*60)
-                        print(f"{name} ({len(versions)} versions found):")
-                        print("="*60)
-                        
-                        for idx, (_, recipe) in enumerate(versions.iterrows(), 1):
-                            print(f"\n  VERSION {idx}:")
-                            print(f"Name: {recipe['name']}")
-                            
-                            if 'minutes' in recipe.index:
-                                print(f"Cooking Time: {recipe['minutes']} minutes")
-                            
-                            if 'n_steps' in recipe.index:
-                                print(f"Number of Steps: {recipe['n_steps']}")
-                            
-                            if 'n_ingredients' in recipe.index:
-                                print(f"Number of Ingredients: {recipe['n_ingredients']}")
-                            
-                            if 'ingredients' in recipe.index and pd.notna(recipe['ingredients']):
-                                print(f"Ingredients: {recipe['ingredients']}")
-                            
-                            if 'steps' in recipe.index and pd.notna(recipe['steps']):
-                                print(f"Instructions: {recipe['steps']}")
-                            
-                            if 'description' in recipe.index and pd.notna(recipe['description']):
-                                print(f"Description: {recipe['description']}")
-                            
-                            print("-" * 60)
-                    else:
-                        random_recipe = versions.iloc[0]
-                        display_recipe(random_recipe)
-            
-        elif choice == '3':
-            print("\nEnter ingredient(s) to search:")
-            print("(For multiple ingredients, separate with commas. Example: chicken, garlic, tomato)")
-            query = input("Ingredient(s): ").strip()
-            
-            if not query:
-                print("Please enter a search term.")
-                continue
-            
-            matches = search_recipes_by_ingredient(df, query)
-            
-            if len(matches) == 0:
-                print(f"\nNo recipes found with ingredient(s) '{query}'. Try another search!")
-            else:
-                ingredients_list = [ing.strip() for ing in query.split(',')]
-                if len(ingredients_list) > 1:
-                    print(f"\nFound {len(matches)} recipes containing ALL of: {', '.join(ingredients_list)}")
-                else:
-                    print(f"\nFound {len(matches)} recipes with ingredient '{query}'!")
-                
-                print("\n" + "="*60)
-                print("ALL MATCHING RECIPES:")
-                print("="*60)
-                for idx, recipe_name in enumerate(matches['name'], 1):
-                    print(f"{idx}. {recipe_name}")
-                print("="*60)
-                
-                print("\nDisplaying a random recipe from the results:")
-                random_recipe = matches.sample(n=1).iloc[0]
-                display_recipe(random_recipe)
-
-        elif choice == '4':
-            print("\nThank you for using Recipeasy!")
-            break
+        with profiler.query(MENU_ACTIONS.get(choice, 'invalid choice')):
+            keep_going = run_choice(df, choice)
         
-        else:
-            print("\nInvalid choice. Please enter 1, 2, 3, or 4.")
+        if not keep_going:
+            break
+    
+    if profile:
+        print("\nSession profile:")
+        print(profiler.report())
+        profiler.disable()
 
 if __name__ == "__main__":
-    main()
+    main(profile='--profile' in sys.argv[1:])
@@ -0,0 +1,133 @@
+import sys
+
+import numpy as np
+
+import index_registry
+from fuzzy_search import name_word_counts
+from ingredient_index import get_ingredient_index
+
+DEFAULT_LIMIT = 10
+# Keys are stored at a fixed width; longer prefixes are narrowed on this much, then checked in full.
+KEY_LENGTH = 24
+# One- and two-letter prefixes match the widest ranges and are typed on every search, so they are kept.
+SHORT_PREFIX = 2
+LAST_CHAR = '\U0010ffff'
+
+
+class Completer:
+
+    def __init__(self, counts, word_starts=False):
+
+        terms = sorted(counts)
+        self.terms = np.asarray(terms, dtype=object)
+        self.counts = np.fromiter((counts[term] for term in terms), dtype=np.int64, count=len(terms))
+        self.word_starts = word_starts
+
+        # Sorted fixed-width keys: every completion of a prefix is one contiguous range,
+        # found with two binary searches. With word_starts, each word inside a term is a
+        # key too, so "chips" finds "chocolate chips".
+        keys = []
+        targets = []
+        for position, term in enumerate(terms):
+            keys.append(term[:KEY_LENGTH])
+            targets.append(position)
+            if word_starts:
+                for start in (i + 1 for i, char in enumerate(term) if char == ' '):
+                    if start < len(term):
+                        keys.append(term[start:start + KEY_LENGTH])
+                        targets.append(position)
+
+        width = max([len(key) for key in keys] + [1])
+        keys = np.asarray(keys, dtype=f'<U{width}')
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.targets = np.asarray(targets, dtype=np.int32)[order]
+        self._short = {}
+
+    def __len__(self):
+
+        return len(self.terms)
+
+    def range(self, prefix):
+
+        key = prefix[:KEY_LENGTH - 1]
+        start = int(np.searchsorted(self.keys, key, side='left'))
+        stop = int(np.searchsorted(self.keys, key + LAST_CHAR, side='left'))
+        return start, stop
+
+    def _matches(self, term, prefix):
+
+        return term.startswith(prefix) or (self.word_starts and f' {prefix}' in term)
+
+    def complete(self, prefix, limit=DEFAULT_LIMIT):
+
+        prefix = prefix.lower()
+        if not prefix:
+            return []
+        if len(prefix) <= SHORT_PREFIX and (prefix, limit) in self._short:
+            return self._short[(prefix, limit)]
+
+        start, stop = self.range(prefix)
+        targets = self.targets[start:stop]
+        if self.word_starts:
+            targets = np.unique(targets)
+        if len(prefix) >= KEY_LENGTH - 1:
+            targets = np.asarray([target for target in targets.tolist() if self._matches(self.terms[target], prefix)], dtype=np.int32)
+
+        counts = self.counts[targets]
+        if len(targets) > limit:
+            top = np.argpartition(-counts, limit - 1)[:limit]
+            targets, counts = targets[top], counts[top]
+        # Most frequent first; terms are numbered alphabetically, which settles ties.
+        order = np.lexsort((targets, -counts))
+        completions = [(self.terms[target], int(count)) for target, count in zip(targets[order].tolist(), counts[order].tolist())]
+
+        if len(prefix) <= SHORT_PREFIX:
+            self._short[(prefix, limit)] = completions
+        return completions
+
+    def memory_bytes(self):
+
+        strings = sum(sys.getsizeof(term) for term in self.terms)
+        return {
+            'keys': self.keys.nbytes,
+            'targets': self.targets.nbytes,
+            'counts': self.counts.nbytes,
+            'terms': self.terms.nbytes + strings,
+        }
+
+
+def get_name_completer(df, column='name'):
+
+    return index_registry.get_or_build(df, ('name_completer', column), lambda frame: Completer(name_word_counts(frame, column)))
+
+
+def build_ingredient_completer(df, column='ingredients'):
+
+    index = get_ingredient_index(df, column)
+    frequencies = np.diff(index.offsets).tolist()
+    return Completer(dict(zip(index.vocabulary, frequencies)), word_starts=True)
+
+
+def get_ingredient_completer(df, column='ingredients'):
+
+    return index_registry.get_or_build(df, ('ingredient_completer', column), lambda frame: build_ingredient_completer(frame, column))
+
+
+def complete_name(df, text, limit=DEFAULT_LIMIT):
+
+    # Completes the last word typed; earlier words are kept as they are.
+    if 'name' not in df.columns:
+        return []
+    head, space, word = text.lower().rpartition(' ')
+    return [(f"{head}{space}{completion}", count) for completion, count in get_name_completer(df).complete(word, limit)]
+
+
+def complete_ingredients(df, text, limit=DEFAULT_LIMIT):
+
+    # Completes the last comma-separated ingredient.
+    if 'ingredients' not in df.columns:
+        return []
+    head, comma, term = text.lower().rpartition(',')
+    head = f"{head.strip()}, " if comma else ''
+    return [(f"{head}{completion}", count) for completion, count in get_ingredient_completer(df).complete(term.strip(), limit)]
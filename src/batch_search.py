@@ -0,0 +1,164 @@
+import argparse
+import json
+import sys
+
+import numpy as np
+
+import recipe_cache
+from ingredient_index import get_ingredient_index
+from name_index import get_name_index
+from query_cache import QueryCache, normalize_ingredient_query, normalize_name_query
+from ratings import load_ratings_for, rank_rows
+from Recipeasy import DATASET_NOT_FOUND, find_data_path
+
+BATCH_SIZE = 1000
+TERM_CACHE_SIZE = 4096
+KINDS = ('name', 'ingredients')
+PREFIXES = {'name:': 'name', 'ingredient:': 'ingredients', 'ingredients:': 'ingredients'}
+
+
+def read_queries(lines, default_kind='ingredients'):
+
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        if line.startswith('{'):
+            query = json.loads(line)
+            query.setdefault('type', default_kind)
+        else:
+            query = {'type': default_kind, 'query': line}
+            for prefix, kind in PREFIXES.items():
+                if line.lower().startswith(prefix):
+                    query = {'type': kind, 'query': line[len(prefix):].strip()}
+                    break
+
+        if query['type'] not in KINDS:
+            raise ValueError(f"line {number}: unknown query type {query['type']!r}")
+        query.setdefault('id', number)
+        yield query
+
+
+class BatchSearcher:
+
+    def __init__(self, df, term_cache_size=TERM_CACHE_SIZE):
+
+        self.df = df
+        self.term_cache = QueryCache(term_cache_size)
+        self._ingredient_index = None
+        self._name_index = None
+
+    def ingredient_rows(self, term):
+
+        rows = self.term_cache.get(('ingredient', term))
+        if rows is None:
+            if self._ingredient_index is None:
+                self._ingredient_index = get_ingredient_index(self.df)
+            rows = self.term_cache.put(('ingredient', term), self._ingredient_index.term_rows(term))
+        return rows
+
+    def name_rows(self, query):
+
+        rows = self.term_cache.get(('name', query))
+        if rows is None:
+            if self._name_index is None:
+                self._name_index = get_name_index(self.df)
+            rows = self.term_cache.put(('name', query), self._name_index.search(query))
+        return rows
+
+    def run(self, queries):
+
+        ingredient_queries = {}
+        if 'ingredients' in self.df.columns:
+            for query in queries:
+                if query['type'] == 'ingredients':
+                    ingredient_queries.setdefault(normalize_ingredient_query(query['query']), None)
+
+        # Each distinct term is looked up once, however many queries share it.
+        for terms in ingredient_queries:
+            postings = sorted((self.ingredient_rows(term) for term in terms), key=len)
+            rows = postings[0] if postings else np.zeros(0, dtype=np.int32)
+            for posting in postings[1:]:
+                if len(rows) == 0:
+                    break
+                rows = np.intersect1d(rows, posting, assume_unique=True)
+            ingredient_queries[terms] = rows
+
+        results = []
+        for query in queries:
+            if query['type'] == 'name':
+                rows = self.name_rows(normalize_name_query(query['query']))
+            else:
+                rows = ingredient_queries.get(normalize_ingredient_query(query['query']), np.zeros(0, dtype=np.int32))
+            # Same order as the interactive searches: best rated first when ratings are loaded.
+            results.append(rank_rows(self.df, rows))
+        return results
+
+    def iter_results(self, queries, batch_size=BATCH_SIZE):
+
+        batch = []
+        for query in queries:
+            batch.append(query)
+            if len(batch) >= batch_size:
+                yield from zip(batch, self.run(batch))
+                batch = []
+        if batch:
+            yield from zip(batch, self.run(batch))
+
+
+def batch_search(df, queries):
+
+    queries = [query if isinstance(query, dict) else {'type': query[0], 'query': query[1]} for query in queries]
+    return BatchSearcher(df).run(queries)
+
+
+def format_result(df, query, rows, limit=None):
+
+    shown = rows if limit is None else rows[:limit]
+    result = {'id': query.get('id'), 'type': query['type'], 'query': query['query'], 'count': int(len(rows))}
+    if 'id' in df.columns:
+        result['recipe_ids'] = df['id'].to_numpy()[shown].tolist()
+    else:
+        result['rows'] = np.asarray(shown).tolist()
+    return result
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Run many name/ingredient searches and write JSON Lines results.")
+    parser.add_argument('queries', help="query file ('-' for stdin): one query per line, 'name:'/'ingredients:' prefixes or JSON objects")
+    parser.add_argument('--data', help="recipes CSV (defaults to the same locations as the interactive program)")
+    parser.add_argument('--type', dest='default_kind', choices=KINDS, default='ingredients', help="type of unprefixed lines")
+    parser.add_argument('--limit', type=int, help="maximum recipe ids written per query")
+    parser.add_argument('--output', default='-', help="output file ('-' for stdout)")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    data_path = args.data or find_data_path()
+    if data_path is None:
+        print(DATASET_NOT_FOUND, file=sys.stderr)
+        return 1
+
+    df = recipe_cache.load_with_cache(data_path, columns=('id', 'name', 'ingredients'))
+    load_ratings_for(df, data_path)
+    searcher = BatchSearcher(df)
+
+    source = sys.stdin if args.queries == '-' else open(args.queries)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        for query, rows in searcher.iter_results(read_queries(source, args.default_kind), args.batch_size):
+            output.write(json.dumps(format_result(df, query, rows, args.limit)) + '\n')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    stats = searcher.term_cache.stats()
+    print(f"term cache: {stats['hits']} hits, {stats['misses']} misses", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+import re
+
+import numpy as np
+
+import index_registry
+from recipe_records import NUTRITION_FIELDS, get_records
+
+COUNT_FIELDS = ('minutes', 'n_steps', 'n_ingredients')
+FACET_FIELDS = COUNT_FIELDS + NUTRITION_FIELDS
+DEFAULT_EDGES = {
+    'minutes': (0, 15, 30, 60, 120, 240),
+    'n_steps': (0, 5, 10, 15, 20),
+    'n_ingredients': (0, 5, 10, 15),
+    'calories': (0, 200, 400, 600, 800, 1000),
+}
+# The other nutrition values are percent of daily value.
+PERCENT_EDGES = (0, 10, 25, 50, 100)
+ALIASES = {
+    'time': 'minutes',
+    'steps': 'n_steps',
+    'ingredients': 'n_ingredients',
+    'fat': 'total_fat',
+    'carbs': 'carbohydrates',
+}
+# Above this share of the frame, one vectorised comparison beats sorting the slice of row ids.
+MASK_FRACTION = 1 / 16
+FILTER_PATTERN = re.compile(r"^\s*([a-z_]+)\s*(<=|>=|<|>|=)\s*([0-9.]+)(?:\s*-\s*([0-9.]+))?\s*$")
+
+
+def resolve_field(name):
+
+    field = ALIASES.get(name.strip().lower(), name.strip().lower())
+    if field not in FACET_FIELDS:
+        raise ValueError(f"Unknown filter '{name}'. Try one of: {', '.join(FACET_FIELDS)}")
+    return field
+
+
+def parse_filters(text):
+
+    filters = {}
+    for part in text.split(','):
+        if not part.strip():
+            continue
+        match = FILTER_PATTERN.match(part.lower())
+        if match is None:
+            raise ValueError(f"Could not read filter '{part.strip()}'. Use e.g. minutes<30 or calories=200-400")
+        name, operator, value, upper = match.groups()
+        field = resolve_field(name)
+        value = float(value)
+        low, high = filters.get(field, (None, None))
+        if operator == '<':
+            high = np.nextafter(value, -np.inf)
+        elif operator == '<=':
+            high = value
+        elif operator == '>':
+            low = np.nextafter(value, np.inf)
+        elif operator == '>=':
+            low = value
+        elif upper is not None:
+            low, high = value, float(upper)
+        else:
+            low = high = value
+        filters[field] = (low, high)
+    return filters
+
+
+def bucket_labels(edges):
+
+    labels = [f"{edges[i]:g}-{edges[i + 1]:g}" for i in range(len(edges) - 1)]
+    labels.append(f"{edges[-1]:g}+")
+    return labels
+
+
+class FacetIndex:
+
+    def __init__(self, df):
+
+        self.df = df
+        self.n_rows = len(df)
+        self._values = {}
+        self._sorted = {}
+        self._codes = {}
+
+    def fields(self):
+
+        present = [field for field in COUNT_FIELDS if field in self.df.columns]
+        if 'nutrition' in self.df.columns:
+            present.extend(NUTRITION_FIELDS)
+        return present
+
+    def values(self, field):
+
+        if field not in self._values:
+            if field in COUNT_FIELDS:
+                if field not in self.df.columns:
+                    raise KeyError(field)
+                self._values[field] = self.df[field].to_numpy(dtype=np.float64, na_value=np.nan)
+            elif field in NUTRITION_FIELDS:
+                if 'nutrition' not in self.df.columns:
+                    raise KeyError(field)
+                # Parse the nutrition lists once and keep every field as its own column.
+                matrix = get_records(self.df).nutrition_matrix()
+                for position, name in enumerate(NUTRITION_FIELDS):
+                    self._values[name] = np.ascontiguousarray(matrix[:, position])
+            else:
+                raise KeyError(field)
+        return self._values[field]
+
+    def sorted(self, field):
+
+        if field not in self._sorted:
+            values = self.values(field)
+            # NaN sorts last, so missing values never fall inside a range.
+            order = np.argsort(values, kind='stable')
+            self._sorted[field] = (order, values[order])
+        return self._sorted[field]
+
+    def _bounds(self, field, low, high):
+
+        order, ordered = self.sorted(field)
+        start = 0 if low is None else int(np.searchsorted(ordered, low, side='left'))
+        stop = int(np.searchsorted(ordered, np.inf, side='right')) if high is None else int(np.searchsorted(ordered, high, side='right'))
+        return order, start, max(start, stop)
+
+    def count_in_range(self, field, low=None, high=None):
+
+        order, start, stop = self._bounds(field, low, high)
+        return stop - start
+
+    def rows_in_range(self, field, low=None, high=None):
+
+        order, start, stop = self._bounds(field, low, high)
+        if stop - start > self.n_rows * MASK_FRACTION:
+            values = self.values(field)
+            mask = ~np.isnan(values)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+            return np.flatnonzero(mask)
+        return np.sort(order[start:stop]).astype(np.int64)
+
+    def _within(self, field, rows, low, high):
+
+        values = self.values(field)[rows]
+        mask = ~np.isnan(values)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return rows[mask]
+
+    def filter(self, filters, rows=None):
+
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+        # Cheapest first: the binary search tells how wide every range is before touching rows.
+        sizes = sorted((self.count_in_range(field, low, high), field, low, high) for field, (low, high) in filters.items())
+
+        for size, field, low, high in sizes:
+            if rows is not None and len(rows) <= size:
+                rows = self._within(field, rows, low, high)
+            elif rows is None:
+                rows = self.rows_in_range(field, low, high)
+            else:
+                rows = np.intersect1d(rows, self.rows_in_range(field, low, high), assume_unique=True)
+            if len(rows) == 0:
+                break
+
+        if rows is None:
+            return np.arange(self.n_rows, dtype=np.int64)
+        return rows
+
+    def edges(self, field):
+
+        return DEFAULT_EDGES.get(field, PERCENT_EDGES)
+
+    def bucket_codes(self, field):
+
+        if field not in self._codes:
+            edges = np.asarray(self.edges(field), dtype=np.float64)
+            values = self.values(field)
+            codes = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 1)
+            codes[np.isnan(values)] = len(edges)
+            self._codes[field] = codes.astype(np.int8)
+        return self._codes[field]
+
+    def histogram(self, field, rows=None):
+
+        codes = self.bucket_codes(field)
+        if rows is not None:
+            codes = codes[rows]
+        edges = self.edges(field)
+        counts = np.bincount(codes, minlength=len(edges) + 1)[:len(edges)]
+        return list(zip(bucket_labels(edges), counts.tolist()))
+
+    def facet_counts(self, rows=None, fields=None):
+
+        return {field: self.histogram(field, rows) for field in (fields or self.fields())}
+
+
+def get_facet_index(df):
+
+    return index_registry.get_or_build(df, 'facets', FacetIndex)
+
+
+def filter_rows(df, filters, rows=None):
+
+    if isinstance(filters, str):
+        filters = parse_filters(filters)
+    return get_facet_index(df).filter(filters, rows)
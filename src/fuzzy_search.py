@@ -0,0 +1,186 @@
+import re
+from collections import Counter
+
+import numpy as np
+
+import index_registry
+from ingredient_index import get_ingredient_index, parse_terms
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+MIN_WORD_LENGTH = 3
+WORD_PATTERN = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+
+def words_in(text):
+
+    return WORD_PATTERN.findall(text.lower())
+
+
+def max_distance_for(word):
+
+    # Short words tolerate fewer edits, otherwise "pie" would match half the vocabulary.
+    if len(word) < MIN_WORD_LENGTH:
+        return 0
+    return 1 if len(word) <= 4 else MAX_DISTANCE
+
+
+def deletes(word, distance):
+
+    found = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {candidate[:i] + candidate[i + 1:] for candidate in frontier if len(candidate) > 1 for i in range(len(candidate))}
+        found |= frontier
+    return found
+
+
+def edit_distance(a, b, limit):
+
+    # Optimal string alignment distance, abandoned as soon as a whole row exceeds the limit.
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class SpellIndex:
+
+    def __init__(self, counts, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words = np.asarray(list(counts), dtype=object)
+        self.counts = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        self.word_ids = {word: position for position, word in enumerate(self.words)}
+
+        # SymSpell: index every word under the strings reachable by deleting up to
+        # max_distance characters from its prefix, so a lookup only has to generate
+        # the deletes of the query instead of comparing against the whole vocabulary.
+        self.deletes = {}
+        for position, word in enumerate(self.words):
+            for key in deletes(word[:prefix_length], max_distance):
+                self.deletes.setdefault(key, []).append(position)
+
+    def __contains__(self, word):
+
+        return word in self.word_ids
+
+    def lookup(self, word, max_distance=None, limit=5):
+
+        word = word.lower()
+        if max_distance is None:
+            max_distance = max_distance_for(word)
+        max_distance = min(max_distance, self.max_distance)
+
+        candidates = set()
+        for key in deletes(word[:self.prefix_length], max_distance):
+            candidates.update(self.deletes.get(key, ()))
+
+        matches = []
+        for position in candidates:
+            candidate = self.words[position]
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, -self.counts[position], candidate))
+
+        matches.sort()
+        return [(candidate, distance, int(-count)) for distance, count, candidate in matches[:limit]]
+
+    def correct(self, word):
+
+        if word in self.word_ids or max_distance_for(word) == 0:
+            return word
+        found = self.lookup(word, limit=1)
+        return found[0][0] if found else None
+
+
+def name_word_counts(df, column='name'):
+
+    # How many names each word appears in.
+    counts = Counter()
+    for name in df[column].to_numpy(dtype=object):
+        if isinstance(name, str):
+            counts.update(set(words_in(name)))
+    return counts
+
+
+def build_name_speller(df, column='name'):
+
+    return SpellIndex(name_word_counts(df, column))
+
+
+def build_ingredient_speller(df, column='ingredients'):
+
+    index = get_ingredient_index(df, column)
+    frequencies = np.diff(index.offsets)
+    counts = Counter()
+    for token, frequency in zip(index.vocabulary, frequencies.tolist()):
+        for word in set(words_in(token)):
+            counts[word] += frequency
+    return SpellIndex(counts)
+
+
+def get_name_speller(df, column='name'):
+
+    return index_registry.get_or_build(df, ('name_speller', column), lambda frame: build_name_speller(frame, column))
+
+
+def get_ingredient_speller(df, column='ingredients'):
+
+    return index_registry.get_or_build(df, ('ingredient_speller', column), lambda frame: build_ingredient_speller(frame, column))
+
+
+def correct_phrase(speller, phrase):
+
+    # Only the misspelled words are replaced; hyphens, '&' and spacing stay, since the searches match on them.
+    text = phrase.lower()
+    if not words_in(text):
+        return None
+    unknown = []
+
+    def replace(match):
+        fixed = speller.correct(match.group(0))
+        if fixed is None:
+            unknown.append(match.group(0))
+            return match.group(0)
+        return fixed
+
+    corrected = WORD_PATTERN.sub(replace, text)
+    if unknown or corrected == text:
+        return None
+    return corrected
+
+
+def suggest_name_query(df, query):
+
+    if 'name' not in df.columns:
+        return None
+    return correct_phrase(get_name_speller(df), query)
+
+
+def suggest_ingredient_query(df, query):
+
+    if 'ingredients' not in df.columns:
+        return None
+
+    speller = get_ingredient_speller(df)
+    terms = parse_terms(query)
+    corrected = []
+    for term in terms:
+        fixed = correct_phrase(speller, term)
+        corrected.append(fixed if fixed is not None else term)
+    if not terms or corrected == terms:
+        return None
+    return ', '.join(corrected)
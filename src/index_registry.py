@@ -0,0 +1,69 @@
+import itertools
+import threading
+import weakref
+
+from profiling import profiler
+
+_entries = {}
+_tokens = itertools.count(1)
+_lock = threading.Lock()
+
+
+def _forget(df_id, ref):
+
+    entry = _entries.get(df_id)
+    if entry is not None and entry['ref'] is ref:
+        del _entries[df_id]
+
+
+def _entry_for(df):
+
+    df_id = id(df)
+    entry = _entries.get(df_id)
+    if entry is None or entry['ref']() is not df:
+        ref = weakref.ref(df, lambda ref, df_id=df_id: _forget(df_id, ref))
+        entry = {'ref': ref, 'shape': df.shape, 'values': {}, 'token': next(_tokens), 'building': {}}
+        _entries[df_id] = entry
+    elif entry['shape'] != df.shape:
+        entry['shape'] = df.shape
+        entry['values'].clear()
+        entry['token'] = next(_tokens)
+    return entry
+
+
+def get_or_build(df, key, builder):
+
+    entry = _entry_for(df)
+    values = entry['values']
+    if key in values:
+        return values[key]
+
+    # One build per key: a thread asking for an index another thread is building waits for it.
+    with _lock:
+        building = entry['building'].setdefault(key, threading.Lock())
+    with building:
+        if key not in values:
+            label = key if isinstance(key, str) else ':'.join(str(part) for part in key)
+            with profiler.stage(f'index.{label}') as stage:
+                values[key] = builder(df)
+                stage.add('rows', len(df))
+    return values[key]
+
+
+def is_built(df, key):
+
+    entry = _entries.get(id(df))
+    return entry is not None and entry['ref']() is df and entry['shape'] == df.shape and key in entry['values']
+
+
+def dataset_token(df):
+
+    return _entry_for(df)['token']
+
+
+def invalidate(df):
+
+    entry = _entries.get(id(df))
+    if entry is not None and entry['ref']() is df:
+        entry['values'].clear()
+        entry['token'] = next(_tokens)
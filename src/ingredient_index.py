@@ -0,0 +1,187 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+import index_registry
+
+# Characters that delimit tokens in the stringified ingredient lists. A query term
+# that contains none of them can only ever match inside a single token.
+SPLIT_CHARS = "[]'\",\\\x00"
+SPLIT_PATTERN = re.compile(r"[\[\]'\",\\\x00]")
+
+
+def parse_terms(query):
+
+    return [term.strip().lower() for term in query.split(',') if term.strip()]
+
+
+def _scan_rows(series, rows, term):
+
+    candidates = series.iloc[rows]
+    mask = candidates.astype(str).str.lower().str.contains(term, na=False, regex=False)
+    return rows[mask.to_numpy(dtype=bool)]
+
+
+class IngredientIndex:
+
+    def __init__(self, series):
+
+        self.series = series.reset_index(drop=True)
+        self.n_rows = len(series)
+
+        lowered = self.series.astype(str).str.lower()
+        row_ids = []
+        tokens = []
+        for row, text in enumerate(lowered):
+            if not isinstance(text, str):
+                continue
+            for token in SPLIT_PATTERN.split(text):
+                if token.strip():
+                    row_ids.append(row)
+                    tokens.append(token)
+
+        codes, vocabulary = pd.factorize(pd.Series(tokens, dtype=object), sort=True)
+        row_ids = np.asarray(row_ids, dtype=np.int32)
+        codes = np.asarray(codes, dtype=np.int32)
+
+        # Keep one (token, row) pair per occurrence, ordered by token then row.
+        order = np.lexsort((row_ids, codes))
+        codes = codes[order]
+        row_ids = row_ids[order]
+        keep = np.ones(len(codes), dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (row_ids[1:] != row_ids[:-1])
+        codes = codes[keep]
+
+        vocabulary = np.asarray(vocabulary, dtype=object)
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(vocabulary)), out=offsets[1:])
+        self._set_postings(vocabulary, row_ids[keep], offsets)
+
+    @classmethod
+    def from_postings(cls, series, vocabulary, postings, offsets):
+
+        index = cls.__new__(cls)
+        index.series = series.reset_index(drop=True)
+        index.n_rows = len(series)
+        index._set_postings(vocabulary, postings, offsets)
+        return index
+
+    def _set_postings(self, vocabulary, postings, offsets):
+
+        self.vocabulary = vocabulary
+        self.postings = postings
+        self.offsets = offsets
+        self.token_ids = {token: position for position, token in enumerate(self.vocabulary)}
+
+        self._row_sizes = None
+        self._joined = '\x00'.join(self.vocabulary)
+        lengths = np.fromiter((len(token) + 1 for token in self.vocabulary), dtype=np.int64, count=len(self.vocabulary))
+        self._starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(lengths) else np.zeros(0, dtype=np.int64)
+
+    def posting(self, token_id):
+
+        return self.postings[self.offsets[token_id]:self.offsets[token_id + 1]]
+
+    def document_frequency(self, token_id):
+
+        return int(self.offsets[token_id + 1] - self.offsets[token_id])
+
+    def row_sizes(self):
+
+        if self._row_sizes is None:
+            self._row_sizes = np.bincount(self.postings, minlength=self.n_rows)
+        return self._row_sizes
+
+    def rows_for_tokens(self, token_ids):
+
+        if len(token_ids) == 0:
+            return np.zeros(0, dtype=np.int32)
+        return np.concatenate([self.posting(token_id) for token_id in token_ids])
+
+    def matching_tokens(self, term, match='substring'):
+
+        if match == 'exact':
+            token_id = self.token_ids.get(term)
+            return np.array([] if token_id is None else [token_id], dtype=np.int64)
+
+        matches = []
+        position = self._joined.find(term)
+        while position != -1:
+            token_id = int(np.searchsorted(self._starts, position, side='right')) - 1
+            matches.append(token_id)
+            if token_id + 1 >= len(self._starts):
+                break
+            position = self._joined.find(term, int(self._starts[token_id + 1]))
+        return np.asarray(matches, dtype=np.int64)
+
+    def is_indexable(self, term):
+
+        return not any(char in term for char in SPLIT_CHARS)
+
+    def term_rows(self, term, match='substring'):
+
+        if match != 'exact' and not self.is_indexable(term):
+            return _scan_rows(self.series, np.arange(self.n_rows), term)
+
+        token_ids = self.matching_tokens(term, match)
+        if len(token_ids) == 0:
+            return np.zeros(0, dtype=np.int32)
+        if len(token_ids) == 1:
+            return self.posting(token_ids[0])
+        mask = np.zeros(self.n_rows, dtype=bool)
+        for token_id in token_ids:
+            mask[self.posting(token_id)] = True
+        return np.flatnonzero(mask).astype(np.int32)
+
+    def search(self, terms, match='substring'):
+
+        if match == 'exact':
+            indexed, scanned = list(terms), []
+        else:
+            indexed = [term for term in terms if self.is_indexable(term)]
+            scanned = [term for term in terms if not self.is_indexable(term)]
+
+        postings = sorted((self.term_rows(term, match) for term in indexed), key=len)
+        rows = postings[0] if postings else np.arange(self.n_rows, dtype=np.int32)
+        for posting in postings[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, posting, assume_unique=True)
+
+        for term in scanned:
+            if len(rows) == 0:
+                break
+            rows = _scan_rows(self.series, rows, term)
+
+        return rows
+
+
+def merge_indexes(base, delta, live, series):
+
+    # Rows of the merged index are the live rows of base followed by the live rows of
+    # delta; only postings are remapped, nothing is re-tokenised.
+    vocabulary = np.asarray(sorted(set(base.vocabulary) | set(delta.vocabulary)), dtype=object)
+    codes = np.concatenate([
+        np.repeat(np.searchsorted(vocabulary, base.vocabulary), np.diff(base.offsets)),
+        np.repeat(np.searchsorted(vocabulary, delta.vocabulary), np.diff(delta.offsets)),
+    ]).astype(np.int64)
+    rows = np.concatenate([base.postings.astype(np.int64), delta.postings.astype(np.int64) + base.n_rows])
+
+    keep = live[rows]
+    new_rows = np.cumsum(live) - 1
+    codes = codes[keep]
+    rows = new_rows[rows[keep]]
+    # Base rows precede delta rows, so a stable sort by token keeps every posting ordered.
+    order = np.argsort(codes, kind='stable')
+
+    counts = np.bincount(codes, minlength=len(vocabulary))
+    used = counts > 0
+    offsets = np.zeros(int(used.sum()) + 1, dtype=np.int64)
+    np.cumsum(counts[used], out=offsets[1:])
+    return IngredientIndex.from_postings(series, vocabulary[used], rows[order].astype(np.int32), offsets)
+
+
+def get_ingredient_index(df, column='ingredients'):
+
+    return index_registry.get_or_build(df, ('list_index', column), lambda frame: IngredientIndex(frame[column]))
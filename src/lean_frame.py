@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+import index_registry
+from ingredient_index import SPLIT_PATTERN
+from recipe_cache import has_pyarrow
+from recipe_records import parse_list
+
+SEARCH_COLUMNS = ('name', 'id', 'minutes', 'n_steps', 'n_ingredients', 'ingredients')
+CATEGORY_THRESHOLD = 0.5
+
+
+def downcast_numeric(series):
+
+    if series.dtype.kind in 'iu':
+        return pd.to_numeric(series, downcast='unsigned' if series.min() >= 0 else 'integer')
+    if series.dtype.kind == 'f':
+        return pd.to_numeric(series, downcast='float')
+    return series
+
+
+def compact_strings(series, category_threshold=CATEGORY_THRESHOLD, string_storage='auto'):
+
+    if len(series) == 0:
+        return series
+
+    if series.nunique(dropna=True) / len(series) <= category_threshold:
+        return series.astype('category')
+
+    if string_storage == 'auto':
+        string_storage = 'pyarrow' if has_pyarrow() else None
+    if string_storage is not None:
+        return series.astype(pd.StringDtype(string_storage))
+    return series
+
+
+def optimize_frame(df, columns=None, drop=(), category_threshold=CATEGORY_THRESHOLD, string_storage='auto'):
+
+    if columns is not None:
+        df = df[[column for column in df.columns if column in columns]]
+    df = df.drop(columns=[column for column in drop if column in df.columns])
+
+    optimized = {}
+    for column in df.columns:
+        series = df[column]
+        if series.dtype.kind in 'iuf':
+            optimized[column] = downcast_numeric(series)
+        elif series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+            optimized[column] = compact_strings(series, category_threshold, string_storage)
+        else:
+            optimized[column] = series
+
+    return pd.DataFrame(optimized, index=df.index)
+
+
+class InternedIngredients:
+
+    def __init__(self, vocabulary, codes, offsets):
+
+        self.vocabulary = vocabulary
+        self.codes = codes
+        self.offsets = offsets
+        self.code_of = {ingredient: code for code, ingredient in enumerate(vocabulary)}
+
+    @classmethod
+    def from_series(cls, series):
+
+        lengths = []
+        names = []
+        for value in series.to_numpy(dtype=object):
+            items = parse_list(value)
+            if items is None:
+                # Fall back to the same delimiter split the ingredient index uses.
+                items = [piece for piece in SPLIT_PATTERN.split(value) if piece.strip()] if isinstance(value, str) else []
+            lengths.append(len(items))
+            names.extend(str(item) for item in items)
+
+        codes, vocabulary = pd.factorize(pd.Series(names, dtype=object))
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(np.asarray(vocabulary, dtype=object), codes.astype(np.int32), offsets)
+
+    def __len__(self):
+
+        return len(self.offsets) - 1
+
+    def row_codes(self, row):
+
+        return self.codes[self.offsets[row]:self.offsets[row + 1]]
+
+    def row(self, row):
+
+        return self.vocabulary[self.row_codes(row)].tolist()
+
+    def rows_with(self, ingredient):
+
+        code = self.code_of.get(ingredient)
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        hits = np.flatnonzero(self.codes == code)
+        return np.unique(np.searchsorted(self.offsets, hits, side='right') - 1)
+
+    def nbytes(self):
+
+        vocabulary_bytes = pd.Series(self.vocabulary, dtype=object).memory_usage(deep=True, index=False)
+        return int(self.codes.nbytes + self.offsets.nbytes + vocabulary_bytes)
+
+
+def get_interned_ingredients(df, column='ingredients'):
+
+    return index_registry.get_or_build(df, ('interned', column), lambda frame: InternedIngredients.from_series(frame[column]))
+
+
+def memory_report(df):
+
+    usage = df.memory_usage(deep=True)
+    return {str(column): int(size) for column, size in usage.items()}
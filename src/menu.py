@@ -0,0 +1,46 @@
+# Menu text shared by Recipeasy.py and the quick-start launcher. Keep this module
+# free of heavy imports: the launcher prints it before pandas has been loaded.
+
+MENU_ACTIONS = {
+    '1': 'surprise me',
+    '2': 'name search',
+    '3': 'ingredient search',
+    '4': 'quit',
+    '5': 'pantry search',
+    '6': 'filter',
+    '7': 'more like this',
+}
+CHOICE_PROMPT = "\nEnter your choice (1-7): "
+QUIT_CHOICE = '4'
+
+
+def print_banner():
+
+    print("="*60)
+    print("RANDOM RECIPE RECOMMENDER")
+    print("="*60)
+    print("\nWelcome! This program recommends random recipes from Kaggle's")
+    print("Recipe Dataset (over 2M recipes).\n")
+
+
+def print_menu():
+
+    print("\nWhat would you like to do?")
+    print("1. Suprise Me!")
+    print("2. Search for recipes by name")
+    print("3. Search for recipes by ingredient")
+    print("4. Quit")
+    print("5. What can I make with my pantry?")
+    print("6. Filter by time, size and nutrition")
+    print("7. More like the last recipe shown")
+    print("(At a search prompt, type ? and the start of a word for suggestions, e.g. ?choc)")
+
+
+def print_goodbye():
+
+    print("\nThank you for using Recipeasy!")
+
+
+def print_invalid_choice():
+
+    print("\nInvalid choice. Please enter 1, 2, 3, 4, 5, 6, or 7.")
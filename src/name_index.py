@@ -0,0 +1,124 @@
+import numpy as np
+
+import index_registry
+
+NGRAM = 3
+
+
+def _ngram_keys(codepoints):
+
+    # Pack three 21-bit code points into one sortable integer key.
+    return (codepoints[:-2] << 42) | (codepoints[1:-1] << 21) | codepoints[2:]
+
+
+def _codepoints(text):
+
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+
+
+class NameIndex:
+
+    def __init__(self, series):
+
+        values = series.to_numpy(dtype=object)
+        self.n_rows = len(values)
+        is_text = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=self.n_rows)
+        self.lowered = np.empty(self.n_rows, dtype=object)
+        self.lowered[:] = [value.lower() if text else None for value, text in zip(values, is_text)]
+        self.text_rows = np.flatnonzero(is_text).astype(np.int32)
+
+        names = self.lowered[self.text_rows]
+        lengths = np.fromiter((len(name) for name in names), dtype=np.int64, count=len(names))
+        codepoints = _codepoints(''.join(names))
+        owners = np.repeat(self.text_rows, lengths)
+
+        if len(codepoints) >= NGRAM:
+            keys = _ngram_keys(codepoints)
+            rows = owners[:-2]
+            # Drop n-grams that straddle two neighbouring names.
+            inside = owners[:-2] == owners[2:]
+            keys = keys[inside]
+            rows = rows[inside]
+        else:
+            keys = np.zeros(0, dtype=np.uint64)
+            rows = np.zeros(0, dtype=np.int32)
+
+        order = np.lexsort((rows, keys))
+        keys = keys[order]
+        rows = rows[order]
+        keep = np.ones(len(keys), dtype=bool)
+        keep[1:] = (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])
+        keys = keys[keep]
+
+        self.postings = rows[keep].astype(np.int32)
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1]))) if len(keys) else np.zeros(0, dtype=np.int64)
+        self.keys = keys[starts]
+        self.offsets = np.append(starts, len(keys)).astype(np.int64)
+
+    @classmethod
+    def from_postings(cls, lowered, keys, postings, offsets):
+
+        index = cls.__new__(cls)
+        index.n_rows = len(lowered)
+        index.lowered = lowered
+        index.text_rows = np.flatnonzero(np.fromiter((name is not None for name in lowered), dtype=bool, count=len(lowered))).astype(np.int32)
+        index.keys = keys
+        index.postings = postings
+        index.offsets = offsets
+        return index
+
+    def posting(self, key):
+
+        position = int(np.searchsorted(self.keys, key))
+        if position == len(self.keys) or self.keys[position] != key:
+            return np.zeros(0, dtype=np.int32)
+        return self.postings[self.offsets[position]:self.offsets[position + 1]]
+
+    def candidates(self, query):
+
+        if len(query) < NGRAM:
+            return self.text_rows
+
+        postings = sorted((self.posting(key) for key in np.unique(_ngram_keys(_codepoints(query)))), key=len)
+        rows = postings[0]
+        for posting in postings[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, posting, assume_unique=True)
+        return rows
+
+    def search(self, query):
+
+        query = query.lower()
+        rows = self.candidates(query)
+        lowered = self.lowered
+        return np.asarray([row for row in rows.tolist() if query in lowered[row]], dtype=np.int32)
+
+
+def merge_indexes(base, delta, live):
+
+    # Same remapping as ingredient_index.merge_indexes, over trigram keys.
+    keys = np.union1d(base.keys, delta.keys)
+    codes = np.concatenate([
+        np.repeat(np.searchsorted(keys, base.keys), np.diff(base.offsets)),
+        np.repeat(np.searchsorted(keys, delta.keys), np.diff(delta.offsets)),
+    ]).astype(np.int64)
+    rows = np.concatenate([base.postings.astype(np.int64), delta.postings.astype(np.int64) + base.n_rows])
+
+    keep = live[rows]
+    new_rows = np.cumsum(live) - 1
+    codes = codes[keep]
+    rows = new_rows[rows[keep]]
+    order = np.argsort(codes, kind='stable')
+
+    counts = np.bincount(codes, minlength=len(keys))
+    used = counts > 0
+    offsets = np.zeros(int(used.sum()) + 1, dtype=np.int64)
+    np.cumsum(counts[used], out=offsets[1:])
+    lowered = np.concatenate([base.lowered, delta.lowered])[live]
+    return NameIndex.from_postings(lowered, keys[used], rows[order].astype(np.int32), offsets)
+
+
+def get_name_index(df, column='name'):
+
+    return index_registry.get_or_build(df, ('name_index', column), lambda frame: NameIndex(frame[column]))
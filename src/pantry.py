@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+import index_registry
+from ingredient_index import parse_terms
+from lean_frame import get_interned_ingredients
+from profiling import profiler
+
+DEFAULT_TOP_K = 10
+STAPLES = ('salt', 'water', 'pepper', 'black pepper')
+
+
+def pantry_terms(pantry):
+
+    if isinstance(pantry, str):
+        return parse_terms(pantry)
+    return [term.strip().lower() for term in pantry if term.strip()]
+
+
+class PantryIndex:
+
+    def __init__(self, interned):
+
+        # One entry per distinct (ingredient, recipe) pair, counted in the same list items the
+        # recipe shows, so coverage and the missing list agree.
+        self.interned = interned
+        self.n_rows = len(interned)
+        lowered, self.items = pd.factorize(pd.Series(interned.vocabulary, dtype=object).str.lower())
+        self.items = np.asarray(self.items, dtype=object)
+        self.item_codes = lowered.astype(np.int32)
+        codes = self.item_codes[interned.codes] if len(interned.codes) else np.zeros(0, dtype=np.int32)
+        rows = np.repeat(np.arange(self.n_rows, dtype=np.int32), np.diff(interned.offsets))
+
+        order = np.lexsort((rows, codes))
+        codes, rows = codes[order], rows[order]
+        keep = np.ones(len(codes), dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        codes, self.postings = codes[keep], rows[keep]
+        self.offsets = np.zeros(len(self.items) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(self.items)), out=self.offsets[1:])
+        self._row_sizes = np.bincount(self.postings, minlength=self.n_rows)
+
+    def row_sizes(self):
+
+        return self._row_sizes
+
+    def rows_for_items(self, item_ids):
+
+        if len(item_ids) == 0:
+            return np.zeros(0, dtype=np.int32)
+        return np.concatenate([self.postings[self.offsets[item]:self.offsets[item + 1]] for item in item_ids])
+
+    def matching_items(self, term, match='substring'):
+
+        if match == 'exact':
+            return np.flatnonzero(self.items == term)
+        return np.flatnonzero(pd.Series(self.items, dtype=object).str.contains(term, regex=False).to_numpy(dtype=bool))
+
+    def row_items(self, row):
+
+        # The recipe's items in list order, each with its lowered item id.
+        codes = self.interned.row_codes(row)
+        return list(zip(self.interned.vocabulary[codes].tolist(), self.item_codes[codes].tolist()))
+
+
+def get_pantry_index(df, column='ingredients'):
+
+    return index_registry.get_or_build(df, ('pantry_index', column), lambda frame: PantryIndex(get_interned_ingredients(frame, column)))
+
+
+def matching_item_ids(index, terms, match='substring'):
+
+    found = [index.matching_items(term, match) for term in terms]
+    if not found:
+        return np.zeros(0, dtype=np.int64)
+    return np.unique(np.concatenate(found))
+
+
+def score_pantry(index, pantry_ids, staple_ids=()):
+
+    # The postings are the CSR form of the ingredient x recipe matrix, so
+    # multiplying it by the pantry indicator vector is one bincount over postings.
+    matched = np.bincount(index.rows_for_items(pantry_ids), minlength=index.n_rows)
+    staples = np.bincount(index.rows_for_items(np.setdiff1d(staple_ids, pantry_ids)), minlength=index.n_rows)
+    have = matched + staples
+    total = index.row_sizes()
+    coverage = have / np.maximum(total, 1)
+    return matched, have, total, coverage
+
+
+def top_k_rows(matched, have, total, coverage, top_k):
+
+    candidates = np.flatnonzero(matched > 0)
+    if len(candidates) == 0 or top_k <= 0:
+        return candidates[:0]
+
+    # Best coverage first, then fewest missing items, then most matched items.
+    key = coverage[candidates] - (total[candidates] - have[candidates]) * 1e-4 + have[candidates] * 1e-8
+    if len(candidates) > top_k:
+        chosen = np.argpartition(-key, top_k - 1)[:top_k]
+    else:
+        chosen = np.arange(len(candidates))
+    chosen = chosen[np.lexsort((candidates[chosen], -key[chosen]))]
+    return candidates[chosen]
+
+
+def missing_ingredients(index, row, have_ids):
+
+    missing = []
+    seen = set()
+    for item, item_id in index.row_items(row):
+        if item_id not in seen and item_id not in have_ids:
+            missing.append(item)
+        seen.add(item_id)
+    return missing
+
+
+def rank_by_pantry(df, pantry, top_k=DEFAULT_TOP_K, match='substring', staples=STAPLES):
+
+    terms = pantry_terms(pantry)
+    if 'ingredients' not in df.columns or not terms:
+        return df.iloc[0:0]
+
+    index = get_pantry_index(df)
+    with profiler.stage('search.pantry') as stage:
+        pantry_ids = matching_item_ids(index, terms, match)
+        staple_ids = matching_item_ids(index, staples, 'exact')
+        matched, have, total, coverage = score_pantry(index, pantry_ids, staple_ids)
+        rows = top_k_rows(matched, have, total, coverage, top_k)
+        if profiler.enabled:
+            stage.add('rows_scanned', index.n_rows)
+            stage.add('rows_matched', int(np.count_nonzero(matched)))
+
+    ranked = df.iloc[rows].copy()
+    ranked['pantry_coverage'] = coverage[rows]
+    ranked['pantry_have'] = have[rows]
+    ranked['pantry_missing'] = total[rows] - have[rows]
+    have_ids = set(pantry_ids.tolist()) | set(staple_ids.tolist())
+    ranked['missing_ingredients'] = [missing_ingredients(index, row, have_ids) for row in rows]
+    return ranked
@@ -0,0 +1,167 @@
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ingredient_index import parse_terms
+from recipe_cache import read_string_column, write_string_column
+
+SHARD_META = 'shards.json'
+
+_worker_columns = {}
+
+
+def export_search_columns(df, directory):
+
+    os.makedirs(directory, exist_ok=True)
+    exported = []
+
+    if 'name' in df.columns:
+        names = df['name'].to_numpy(dtype=object)
+        write_string_column(directory, 'name', np.array([value.lower() if isinstance(value, str) else np.nan for value in names], dtype=object))
+        exported.append('name')
+
+    if 'ingredients' in df.columns:
+        write_string_column(directory, 'ingredients', df['ingredients'].astype(str).str.lower().to_numpy(dtype=object))
+        exported.append('ingredients')
+
+    with open(os.path.join(directory, SHARD_META), 'w') as handle:
+        json.dump({'rows': len(df), 'columns': exported}, handle)
+
+
+def open_search_columns(directory):
+
+    with open(os.path.join(directory, SHARD_META)) as handle:
+        meta = json.load(handle)
+
+    columns = {}
+    for column in meta['columns']:
+        offsets, data, mask = read_string_column(directory, column, mmap_mode='r')
+        columns[column] = (np.asarray(offsets), data)
+    return meta['rows'], columns
+
+
+def shard_bounds(n_rows, n_shards):
+
+    return np.linspace(0, n_rows, n_shards + 1).astype(np.int64)
+
+
+def find_rows(offsets, data, needle, start, stop):
+
+    base = int(offsets[start])
+    end = int(offsets[stop])
+    if end == base:
+        return np.zeros(0, dtype=np.int64)
+
+    # Read the shard straight out of the memory map; nothing is pickled between processes.
+    text = data[base:end].tobytes()
+    local = offsets[start:stop + 1] - base
+    rows = []
+    position = text.find(needle)
+    while position != -1:
+        row = int(np.searchsorted(local, position, side='right')) - 1
+        row_end = int(local[row + 1])
+        if position + len(needle) <= row_end:
+            rows.append(start + row)
+            position = text.find(needle, row_end)
+        else:
+            position = text.find(needle, position + 1)
+    return np.asarray(rows, dtype=np.int64)
+
+
+def search_shard(columns, kind, terms, start, stop):
+
+    column = 'name' if kind == 'name' else 'ingredients'
+    if column not in columns:
+        return np.zeros(0, dtype=np.int64)
+
+    offsets, data = columns[column]
+    rows = None
+    for term in terms:
+        found = find_rows(offsets, data, term.encode('utf-8'), start, stop)
+        rows = found if rows is None else np.intersect1d(rows, found, assume_unique=True)
+        if len(rows) == 0:
+            break
+    return rows if rows is not None else np.zeros(0, dtype=np.int64)
+
+
+def _init_worker(directory):
+
+    _worker_columns['columns'] = open_search_columns(directory)[1]
+
+
+def _run_task(task):
+
+    return search_shard(_worker_columns['columns'], *task)
+
+
+def query_terms(kind, query):
+
+    if kind == 'name':
+        return [query.lower()] if query else []
+    return parse_terms(query)
+
+
+class ParallelSearcher:
+
+    def __init__(self, df, workers=None, directory=None, shards_per_worker=2):
+
+        self.workers = workers or os.cpu_count() or 1
+        self._owns_directory = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix='recipeasy-shards-')
+        export_search_columns(df, self.directory)
+        self.n_rows, self.columns = open_search_columns(self.directory)
+        self.bounds = shard_bounds(self.n_rows, max(1, self.workers * shards_per_worker))
+        self._pool = None
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.directory,))
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc):
+
+        self.close()
+
+    def close(self):
+
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def search_many(self, kind, queries):
+
+        term_lists = [query_terms(kind, query) for query in queries]
+        shards = list(zip(self.bounds[:-1].tolist(), self.bounds[1:].tolist()))
+        tasks = [(kind, terms, start, stop) for terms in term_lists if terms for start, stop in shards]
+
+        if self._pool is None:
+            shard_results = [search_shard(self.columns, *task) for task in tasks]
+        else:
+            chunksize = max(1, len(tasks) // (self.workers * 4))
+            shard_results = list(self._pool.map(_run_task, tasks, chunksize=chunksize))
+
+        results = []
+        position = 0
+        for terms in term_lists:
+            if not terms:
+                results.append(np.zeros(0, dtype=np.int64))
+                continue
+            # Shards are ordered, so concatenating them keeps the original row order.
+            results.append(np.concatenate(shard_results[position:position + len(shards)]))
+            position += len(shards)
+        return results
+
+    def search_names(self, queries):
+
+        return self.search_many('name', queries)
+
+    def search_ingredients(self, queries):
+
+        return self.search_many('ingredients', queries)
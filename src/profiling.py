@@ -0,0 +1,221 @@
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+
+RECENT_QUERIES = 100
+
+
+class StageStats:
+
+    def __init__(self):
+
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.counts = defaultdict(int)
+
+    def add(self, seconds, counts):
+
+        self.calls += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        for key, value in counts.items():
+            self.counts[key] += value
+
+    def as_dict(self):
+
+        summary = {
+            'calls': self.calls,
+            'total_ms': round(self.seconds * 1000, 3),
+            'max_ms': round(self.max_seconds * 1000, 3),
+        }
+        summary.update(self.counts)
+        return summary
+
+
+class _NullStage:
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc):
+
+        return False
+
+    def add(self, key, value=1):
+
+        pass
+
+
+NULL_STAGE = _NullStage()
+
+
+class Stage:
+
+    def __init__(self, profiler, name):
+
+        self.profiler = profiler
+        self.name = name
+        self.counts = {}
+
+    def __enter__(self):
+
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+
+        self.profiler.record(self.name, time.perf_counter() - self.start, self.counts)
+        return False
+
+    def add(self, key, value=1):
+
+        self.counts[key] = self.counts.get(key, 0) + value
+
+
+class QueryProfile:
+
+    def __init__(self, profiler, label):
+
+        self.profiler = profiler
+        self.label = label
+        self.stages = defaultdict(StageStats)
+        self.seconds = 0.0
+        self.memory = None
+
+    def __enter__(self):
+
+        self.profiler._local.active = self
+        if self.profiler.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._memory_start = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+
+        self.seconds = time.perf_counter() - self.start
+        if self.profiler.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory = {
+                'allocated_kb': round((current - self._memory_start) / 1024, 1),
+                'peak_kb': round((peak - self._memory_start) / 1024, 1),
+            }
+        self.profiler._local.active = None
+        with self.profiler.lock:
+            self.profiler.queries.append(self)
+        if self.profiler.echo:
+            print(self.report())
+        return False
+
+    def as_dict(self):
+
+        summary = {
+            'label': self.label,
+            'total_ms': round(self.seconds * 1000, 3),
+            'stages': {name: stats.as_dict() for name, stats in self.stages.items()},
+        }
+        if self.memory is not None:
+            summary['memory'] = self.memory
+        return summary
+
+    def report(self):
+
+        lines = [f"[profile] {self.label}: {self.seconds * 1000:.2f} ms"]
+        for name, stats in self.stages.items():
+            counts = ''.join(f", {key}={value}" for key, value in stats.counts.items())
+            lines.append(f"[profile]   {name:24} {stats.seconds * 1000:10.2f} ms  x{stats.calls}{counts}")
+        if self.memory is not None:
+            lines.append(f"[profile]   allocated {self.memory['allocated_kb']} KB, peak {self.memory['peak_kb']} KB")
+        return "\n".join(lines)
+
+
+class Profiler:
+
+    def __init__(self):
+
+        self.enabled = False
+        self.trace_memory = False
+        self.echo = False
+        self._started_tracing = False
+        self.lock = threading.Lock()
+        # Each thread attributes its stages to the query it is running (the service runs several at once).
+        self._local = threading.local()
+        self.reset()
+
+    def enable(self, trace_memory=False, echo=False):
+
+        self.enabled = True
+        self.echo = echo
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def disable(self):
+
+        self.enabled = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.trace_memory = False
+        self.echo = False
+
+    def reset(self):
+
+        self.stages = defaultdict(StageStats)
+        self.counters = defaultdict(int)
+        self.queries = deque(maxlen=RECENT_QUERIES)
+
+    def stage(self, name):
+
+        # Disabled profiling hands out one shared no-op context, so call sites cost an attribute check.
+        if not self.enabled:
+            return NULL_STAGE
+        return Stage(self, name)
+
+    def count(self, name, value=1):
+
+        if self.enabled:
+            with self.lock:
+                self.counters[name] += value
+
+    def query(self, label):
+
+        if not self.enabled:
+            return NULL_STAGE
+        return QueryProfile(self, label)
+
+    def record(self, name, seconds, counts):
+
+        with self.lock:
+            self.stages[name].add(seconds, counts)
+        active = getattr(self._local, 'active', None)
+        if active is not None:
+            active.stages[name].add(seconds, counts)
+
+    def snapshot(self, recent=True):
+
+        with self.lock:
+            summary = {
+                'stages': {name: stats.as_dict() for name, stats in self.stages.items()},
+                'counters': dict(self.counters),
+            }
+            if recent:
+                summary['recent_queries'] = [query.as_dict() for query in self.queries]
+        return summary
+
+    def report(self):
+
+        lines = [f"{'stage':28} {'calls':>7} {'total ms':>11} {'max ms':>10}  counts"]
+        for name, stats in sorted(self.stages.items(), key=lambda item: -item[1].seconds):
+            counts = ', '.join(f"{key}={value}" for key, value in stats.counts.items())
+            lines.append(f"{name:28} {stats.calls:7} {stats.seconds * 1000:11.2f} {stats.max_seconds * 1000:10.2f}  {counts}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:28} {value:7}")
+        return "\n".join(lines)
+
+
+profiler = Profiler()
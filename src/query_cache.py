@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import index_registry
+from profiling import profiler
+from ingredient_index import parse_terms
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+def normalize_name_query(query):
+
+    # Not stripped: a name search is a plain substring match, so ' cake ' (whole word, mid-name)
+    # and 'cake' return different rows and need separate entries. Ingredient terms are stripped
+    # by parse_terms before matching, so their key can be. The menu strips its input anyway.
+    return query.lower()
+
+
+def normalize_ingredient_query(query):
+
+    return tuple(sorted(set(parse_terms(query))))
+
+
+class QueryCache:
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+
+        return len(self._entries)
+
+    def get(self, key):
+
+        with self._lock:
+            rows = self._entries.get(key)
+            if rows is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rows
+
+    def put(self, key, rows):
+
+        if self.max_entries <= 0:
+            return rows
+        rows = np.array(rows, copy=True)
+        rows.setflags(write=False)
+        with self._lock:
+            self._entries[key] = rows
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return rows
+
+    def rows_for(self, df, kind, normalized, compute):
+
+        key = (index_registry.dataset_token(df), kind, normalized)
+        rows = self.get(key)
+        if rows is None:
+            profiler.count(f'query_cache.{kind}.miss')
+            rows = self.put(key, compute())
+        else:
+            profiler.count(f'query_cache.{kind}.hit')
+        return rows
+
+    def clear(self):
+
+        self._entries.clear()
+
+    def reset_stats(self):
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+search_cache = QueryCache()
+
+
+def cache_stats():
+
+    return search_cache.stats()
@@ -0,0 +1,363 @@
+import re
+
+import numpy as np
+
+import index_registry
+from ingredient_index import get_ingredient_index
+from name_index import NGRAM, _codepoints, _ngram_keys, get_name_index
+from query_cache import search_cache
+
+KEYWORDS = ('AND', 'OR', 'NOT')
+FIELDS = {
+    'ingredient': 'ingredients',
+    'ingredients': 'ingredients',
+    'name': 'name',
+    'tag': 'tags',
+    'tags': 'tags',
+}
+TOKEN_PATTERN = re.compile(r'\s*(?:(\()|(\))|(,)|"([^"]*)"|([^\s(),"]+))')
+FIELD_PATTERN = re.compile(r'^([a-z]+):(.*)$')
+
+
+def tokenize(query):
+
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = TOKEN_PATTERN.match(query, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Unbalanced quote in '{query}'")
+        opening, closing, comma, quoted, word = match.groups()
+        if opening or closing or comma:
+            tokens.append(('op', opening or closing or comma))
+        elif quoted is not None:
+            tokens.append(('quoted', quoted))
+        elif word in KEYWORDS:
+            tokens.append(('op', word))
+        else:
+            tokens.append(('word', word))
+        position = match.end()
+    return tokens
+
+
+def is_structured_query(query):
+
+    # Only AND/OR/NOT or a known field: prefix switch to the planner; brackets, commas and
+    # quotes on their own keep the literal comma search, so "cheese (grated)" finds what it always did.
+    try:
+        tokens = tokenize(query)
+    except ValueError:
+        return any(word in KEYWORDS for word in re.findall(r'[A-Z]+', query))
+    for kind, value in tokens:
+        if kind == 'op' and value in KEYWORDS:
+            return True
+        field = FIELD_PATTERN.match(value.lower()) if kind == 'word' else None
+        if field is not None and field.group(1) in FIELDS:
+            return True
+    return False
+
+
+class Term:
+
+    def __init__(self, field, text):
+
+        self.field = field
+        self.text = text.strip().lower()
+        self.estimate = None
+        self.matched = None
+        self._token_ids = None
+
+    def describe(self):
+
+        return f"{self.field}:{self.text!r}"
+
+    def plan(self, planner):
+
+        if self.field == 'name':
+            self.estimate = planner.name_estimate(self.text)
+        else:
+            index = planner.list_index(self.field)
+            if index.is_indexable(self.text):
+                self._token_ids = index.matching_tokens(self.text)
+                self.estimate = int(np.diff(index.offsets)[self._token_ids].sum()) if len(self._token_ids) else 0
+            else:
+                self.estimate = planner.n_rows
+        self.estimate = min(self.estimate, planner.n_rows)
+        return self.estimate
+
+    def evaluate(self, planner):
+
+        if self.estimate == 0:
+            rows = np.zeros(0, dtype=np.int64)
+        elif self.field == 'name':
+            rows = get_name_index(planner.df).search(self.text)
+        else:
+            index = planner.list_index(self.field)
+            if self._token_ids is None:
+                rows = index.term_rows(self.text)
+            elif len(self._token_ids) == 1:
+                rows = index.posting(self._token_ids[0])
+            else:
+                mask = np.zeros(planner.n_rows, dtype=bool)
+                for token_id in self._token_ids:
+                    mask[index.posting(token_id)] = True
+                rows = np.flatnonzero(mask)
+        self.matched = len(rows)
+        return np.asarray(rows, dtype=np.int64)
+
+
+class Not:
+
+    def __init__(self, child):
+
+        self.child = child
+        self.estimate = None
+        self.matched = None
+
+    def describe(self):
+
+        return f"NOT {self.child.describe()}"
+
+    def plan(self, planner):
+
+        self.estimate = planner.n_rows - self.child.plan(planner)
+        return self.estimate
+
+    def evaluate(self, planner):
+
+        rows = np.setdiff1d(planner.all_rows(), self.child.evaluate(planner), assume_unique=True)
+        self.matched = len(rows)
+        return rows
+
+
+class And:
+
+    def __init__(self, children):
+
+        self.children = children
+        self.estimate = None
+        self.matched = None
+
+    def describe(self):
+
+        return '(' + ' AND '.join(child.describe() for child in self.children) + ')'
+
+    def plan(self, planner):
+
+        for child in self.children:
+            child.plan(planner)
+        # Most selective first, exclusions last: they can only remove rows from a small set.
+        self.children.sort(key=lambda child: (isinstance(child, Not), child.estimate))
+        positives = [child.estimate for child in self.children if not isinstance(child, Not)]
+        self.estimate = min(positives) if positives else min(child.estimate for child in self.children)
+        return self.estimate
+
+    def evaluate(self, planner):
+
+        rows = None
+        for child in self.children:
+            if rows is not None and len(rows) == 0:
+                break
+            if isinstance(child, Not):
+                if rows is None:
+                    rows = child.evaluate(planner)
+                else:
+                    rows = np.setdiff1d(rows, child.child.evaluate(planner), assume_unique=True)
+                    child.matched = len(rows)
+            elif rows is None:
+                rows = child.evaluate(planner)
+            else:
+                rows = np.intersect1d(rows, child.evaluate(planner), assume_unique=True)
+        self.matched = len(rows)
+        return rows
+
+
+class Or:
+
+    def __init__(self, children):
+
+        self.children = children
+        self.estimate = None
+        self.matched = None
+
+    def describe(self):
+
+        return '(' + ' OR '.join(child.describe() for child in self.children) + ')'
+
+    def plan(self, planner):
+
+        for child in self.children:
+            child.plan(planner)
+        # Broadest first, so the union can stop as soon as it covers every row.
+        self.children.sort(key=lambda child: -child.estimate)
+        self.estimate = min(planner.n_rows, sum(child.estimate for child in self.children))
+        return self.estimate
+
+    def evaluate(self, planner):
+
+        mask = np.zeros(planner.n_rows, dtype=bool)
+        for child in self.children:
+            mask[child.evaluate(planner)] = True
+            if mask.all():
+                break
+        rows = np.flatnonzero(mask)
+        self.matched = len(rows)
+        return rows
+
+
+class Parser:
+
+    def __init__(self, query, default_field='ingredients'):
+
+        self.tokens = tokenize(query)
+        self.position = 0
+        self.default_field = default_field
+
+    def peek(self):
+
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self):
+
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+
+        if not self.tokens:
+            raise ValueError("Empty query")
+        node = self.parse_or()
+        if self.position < len(self.tokens):
+            raise ValueError(f"Unexpected '{self.peek()[1]}'")
+        return node
+
+    def parse_or(self):
+
+        children = [self.parse_and()]
+        while self.peek() == ('op', 'OR'):
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and(self):
+
+        children = [self.parse_not()]
+        # Commas and AND join explicitly; a new field, NOT or bracket right after a term joins implicitly.
+        while self.peek() in (('op', 'AND'), ('op', ','), ('op', 'NOT'), ('op', '(')) or self.peek()[0] in ('word', 'quoted'):
+            if self.peek() in (('op', 'AND'), ('op', ',')):
+                self.take()
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_not(self):
+
+        if self.peek() == ('op', 'NOT'):
+            self.take()
+            return Not(self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self):
+
+        kind, value = self.peek()
+        if (kind, value) == ('op', '('):
+            self.take()
+            node = self.parse_or()
+            if self.take() != ('op', ')'):
+                raise ValueError("Missing ')'")
+            return node
+        if kind not in ('word', 'quoted'):
+            raise ValueError(f"Expected a search term but found '{value}'" if value else "Query ends too early")
+
+        field = self.default_field
+        prefix = FIELD_PATTERN.match(value.lower()) if kind == 'word' else None
+        if prefix is not None:
+            if prefix.group(1) not in FIELDS:
+                raise ValueError(f"Unknown field '{prefix.group(1)}'. Use name:, tag: or ingredient:")
+            field = FIELDS[prefix.group(1)]
+            self.take()
+            if prefix.group(2):
+                kind, value = 'word', prefix.group(2)
+                self.tokens.insert(self.position, (kind, value))
+            kind, value = self.peek()
+            if kind not in ('word', 'quoted'):
+                raise ValueError(f"Missing search term after '{prefix.group(1)}:'")
+
+        if kind == 'quoted':
+            self.take()
+            return Term(field, value)
+
+        # Bare words run together into one phrase, so "olive oil" stays a single ingredient.
+        words = []
+        while self.peek()[0] == 'word' and (not words or FIELD_PATTERN.match(self.peek()[1].lower()) is None):
+            words.append(self.take()[1])
+        return Term(field, ' '.join(words))
+
+
+class QueryPlanner:
+
+    def __init__(self, df):
+
+        self.df = df
+        self.n_rows = len(df)
+        self._all_rows = None
+
+    def all_rows(self):
+
+        if self._all_rows is None:
+            self._all_rows = np.arange(self.n_rows, dtype=np.int64)
+        return self._all_rows
+
+    def list_index(self, column):
+
+        if column not in self.df.columns:
+            raise ValueError(f"This dataset has no '{column}' column")
+        return get_ingredient_index(self.df, column)
+
+    def name_estimate(self, text):
+
+        if 'name' not in self.df.columns:
+            raise ValueError("This dataset has no 'name' column")
+        index = get_name_index(self.df)
+        if len(text) < NGRAM:
+            return len(index.text_rows)
+        # The rarest trigram bounds how many names can contain the phrase.
+        return min(len(index.posting(key)) for key in np.unique(_ngram_keys(_codepoints(text))))
+
+    def compile(self, query, default_field='ingredients'):
+
+        node = Parser(query, default_field).parse()
+        node.plan(self)
+        return node
+
+    def run(self, query, default_field='ingredients'):
+
+        return self.compile(query, default_field).evaluate(self)
+
+    def explain(self, query, default_field='ingredients'):
+
+        node = self.compile(query, default_field)
+        node.evaluate(self)
+        lines = []
+
+        def walk(node, depth):
+            matched = '-' if node.matched is None else node.matched
+            label = node.describe() if isinstance(node, (Term, Not)) else type(node).__name__.upper()
+            lines.append(f"{'  ' * depth}{label}  estimate={node.estimate} rows={matched}")
+            for child in getattr(node, 'children', ()):
+                walk(child, depth + 1)
+
+        walk(node, 0)
+        return "\n".join(lines)
+
+
+def get_query_planner(df):
+
+    return index_registry.get_or_build(df, 'query_planner', QueryPlanner)
+
+
+def run_query(df, query, default_field='ingredients'):
+
+    planner = get_query_planner(df)
+    return search_cache.rows_for(df, ('query', default_field), query.strip(), lambda: planner.run(query, default_field))
@@ -0,0 +1,190 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Only light modules at import time: the menu is printed before pandas is loaded.
+from menu import CHOICE_PROMPT, MENU_ACTIONS, QUIT_CHOICE, print_banner, print_goodbye, print_invalid_choice, print_menu
+from profiling import profiler
+
+PROGRESS_INTERVAL = 0.2
+
+
+class BackgroundLoader:
+
+    def __init__(self, warm_indexes=True):
+
+        self.warm_indexes = warm_indexes
+        self.status = 'starting'
+        self.progress = None
+        self.df = None
+        self.error = None
+        self.warnings = []
+        self.missing = False
+        self.module = None
+        self.timings = {}
+        self.loaded = threading.Event()
+        self.ready = threading.Event()
+        self._started = None
+        self._thread = threading.Thread(target=self._run, name='recipeasy-loader', daemon=True)
+
+    def start(self):
+
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def _set(self, status, progress=None):
+
+        self.timings[status] = time.perf_counter() - self._started
+        self.status = status
+        self.progress = progress
+
+    def _report(self, fraction):
+
+        self.progress = fraction
+
+    def _run(self):
+
+        try:
+            self._load()
+        except Exception as e:
+            self.error = e
+        else:
+            if self.warm_indexes and self.df is not None:
+                try:
+                    self._warm()
+                except Exception as e:
+                    # The recipes are loaded; a search builds whatever index is missing when it needs it.
+                    self.warnings.append(f"Could not prepare search indexes in advance: {e}")
+        finally:
+            self._set('ready')
+            self.loaded.set()
+            self.ready.set()
+
+    def _load(self):
+
+        self._set('importing libraries')
+        import Recipeasy
+        import recipe_cache
+        self.module = Recipeasy
+
+        path = next((path for path in Recipeasy.DATA_PATHS if os.path.exists(path)), None)
+        if path is None:
+            # Downloading needs the terminal, so it is left to the main thread.
+            self.missing = True
+            return
+
+        self._set('loading recipes', 0.0)
+        reader = lambda source: recipe_cache.read_csv_with_progress(source, self._report)
+        df = recipe_cache.load_with_cache(path, reader=reader)
+        df.attrs['source_path'] = path
+        self._set('loading ratings')
+        try:
+            from ratings import load_ratings_for
+            load_ratings_for(df, path)
+        except Exception as e:
+            # Ratings only change the order of results, so the recipes are still usable without them.
+            self.warnings.append(f"Could not load ratings: {e}")
+        self.df = df
+        self.loaded.set()
+
+    def _warm(self):
+
+        # Keep building indexes behind the menu so the first search does not pay for them;
+        # a search that needs one before it is done simply waits for that build.
+        from ingredient_index import get_ingredient_index
+        from name_index import get_name_index
+        if 'name' in self.df.columns:
+            self._set('indexing names')
+            get_name_index(self.df)
+        if 'ingredients' in self.df.columns:
+            self._set('indexing ingredients')
+            get_ingredient_index(self.df)
+
+    def describe(self):
+
+        if self.loaded.is_set():
+            return None
+        if self.progress is not None:
+            return f"{self.status} {self.progress:.0%}"
+        return self.status
+
+    def wait(self, show_progress=True):
+
+        last = None
+        while not self.loaded.wait(PROGRESS_INTERVAL if show_progress else None):
+            line = f"\rStill getting ready: {self.describe()}...".ljust(50)
+            if line != last:
+                print(line, end='', flush=True)
+                last = line
+        if last is not None:
+            print()
+        return self.module, self.df
+
+
+def load_data(loader):
+
+    Recipeasy, df = loader.wait()
+    if loader.error is not None:
+        print(f"Error loading recipes: {loader.error}")
+        return Recipeasy, None
+    if loader.missing:
+        # Falls back to the interactive path, which can offer to download the dataset.
+        df = Recipeasy.load_recipe_data()
+    else:
+        print(f"Loaded {len(df)} recipes successfully!")
+    for warning in loader.warnings:
+        print(warning)
+    return Recipeasy, df
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Start Recipeasy with the menu available while recipes load in the background.")
+    parser.add_argument('--profile', action='store_true', help="print per-stage timings after every menu action")
+    args = parser.parse_args(argv)
+
+    print_banner()
+    if args.profile:
+        profiler.enable(trace_memory=True, echo=True)
+
+    loader = BackgroundLoader().start()
+    Recipeasy = df = None
+
+    while True:
+        status = loader.describe() if df is None else None
+        if status is not None:
+            print(f"(Recipes are loading in the background: {status})")
+        print_menu()
+
+        choice = input(CHOICE_PROMPT).strip()
+
+        if choice == QUIT_CHOICE:
+            print_goodbye()
+            break
+        if choice not in MENU_ACTIONS:
+            print_invalid_choice()
+            continue
+
+        if df is None:
+            Recipeasy, df = load_data(loader)
+            if df is None:
+                break
+
+        with profiler.query(MENU_ACTIONS[choice]):
+            keep_going = Recipeasy.run_choice(df, choice)
+
+        if not keep_going:
+            break
+
+    if args.profile:
+        print("\nSession profile:")
+        print(profiler.report())
+        profiler.disable()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
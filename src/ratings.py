@@ -0,0 +1,196 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import index_registry
+import recipe_cache
+from profiling import profiler
+
+INTERACTIONS_FILE = 'RAW_interactions.csv'
+RATINGS_FILE = 'ratings.npz'
+CHUNK_ROWS = 200000
+# Smoothing weight: a recipe counts as this many extra ratings at the overall mean.
+PRIOR_WEIGHT = 5
+RATING_COLUMNS = ('n_reviews', 'rating', 'rating_score')
+RATING_WEIGHT = 'rating_score'
+# Above this share of the frame, walking the global order beats sorting the matched rows.
+ORDER_FRACTION = 1 / 8
+
+
+class RatingTable:
+
+    def __init__(self, ids, reviews, rated, sums):
+
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.reviews = np.asarray(reviews, dtype=np.int32)
+        self.rated = np.asarray(rated, dtype=np.int32)
+        self.sums = np.asarray(sums, dtype=np.float64)
+
+    def __len__(self):
+
+        return len(self.ids)
+
+    @property
+    def global_mean(self):
+
+        rated = self.rated.sum()
+        return float(self.sums.sum() / rated) if rated else 0.0
+
+    def means(self):
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.rated > 0, self.sums / self.rated, np.nan)
+
+    def scores(self, prior_weight=PRIOR_WEIGHT):
+
+        # Bayesian average: few ratings stay near the overall mean, many ratings speak for themselves.
+        return (prior_weight * self.global_mean + self.sums) / (prior_weight + self.rated)
+
+    def save(self, path):
+
+        np.savez(path, ids=self.ids, reviews=self.reviews, rated=self.rated, sums=self.sums)
+
+    @classmethod
+    def load(cls, path):
+
+        with np.load(path) as data:
+            return cls(data['ids'], data['reviews'], data['rated'], data['sums'])
+
+
+def _reduce(ids, reviews, rated, sums):
+
+    unique, inverse = np.unique(ids, return_inverse=True)
+    return (
+        unique,
+        np.bincount(inverse, weights=reviews, minlength=len(unique)),
+        np.bincount(inverse, weights=rated, minlength=len(unique)),
+        np.bincount(inverse, weights=sums, minlength=len(unique)),
+    )
+
+
+def aggregate_interactions(path, chunksize=CHUNK_ROWS):
+
+    # One streaming pass: each chunk is reduced to per-recipe totals before the next is read.
+    partials = []
+    with profiler.stage('ratings.aggregate') as stage:
+        for chunk in pd.read_csv(path, usecols=['recipe_id', 'rating'], chunksize=chunksize):
+            chunk = chunk.dropna(subset=['recipe_id'])
+            ids = chunk['recipe_id'].to_numpy(dtype=np.int64)
+            ratings = chunk['rating'].to_numpy(dtype=np.float64, na_value=0.0)
+            # Food.com stores reviews without stars as rating 0; they count as reviews but not ratings.
+            given = ratings > 0
+            partials.append(_reduce(ids, np.ones(len(ids)), given, np.where(given, ratings, 0.0)))
+            stage.add('interactions', len(ids))
+
+    if not partials:
+        return RatingTable([], [], [], [])
+    return RatingTable(*_reduce(*(np.concatenate(parts) for parts in zip(*partials))))
+
+
+def find_interactions_path(recipes_path):
+
+    path = os.path.join(os.path.dirname(os.path.abspath(recipes_path)), INTERACTIONS_FILE)
+    return path if os.path.exists(path) else None
+
+
+def load_rating_table(path, cache_root=None):
+
+    directory = recipe_cache.cache_dir_for(path, cache_root)
+    signature = recipe_cache.source_signature(path)
+    try:
+        if recipe_cache.is_cache_valid(path, directory, signature):
+            with profiler.stage('ratings.cache_read'):
+                return RatingTable.load(os.path.join(directory, RATINGS_FILE))
+    except Exception as e:
+        print(f"Ignoring unreadable ratings cache in {directory}: {e}")
+
+    table = aggregate_interactions(path)
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        table.save(os.path.join(directory, RATINGS_FILE))
+        recipe_cache._write_meta(directory, {
+            'version': recipe_cache.CACHE_VERSION,
+            'pandas': pd.__version__,
+            'format': 'ratings',
+            'rows': len(table),
+            'source': dict(signature, path=path, sha1=recipe_cache.file_hash(path)),
+        })
+    except Exception as e:
+        print(f"Could not write ratings cache to {directory}: {e}")
+    return table
+
+
+def join_ratings(df, table, prior_weight=PRIOR_WEIGHT):
+
+    if 'id' not in df.columns:
+        return df
+
+    recipe_ids = df['id'].to_numpy(dtype=np.float64, na_value=np.nan)
+    present = ~np.isnan(recipe_ids)
+    positions = np.searchsorted(table.ids, recipe_ids[present].astype(np.int64))
+    positions = np.minimum(positions, max(len(table) - 1, 0))
+    found = np.zeros(len(df), dtype=bool)
+    if len(table):
+        found[present] = table.ids[positions] == recipe_ids[present]
+    rows = np.flatnonzero(found)
+    matched = positions[found[present]]
+
+    reviews = np.zeros(len(df), dtype=np.int32)
+    reviews[rows] = table.reviews[matched]
+    means = np.full(len(df), np.nan, dtype=np.float32)
+    means[rows] = table.means()[matched]
+    scores = np.full(len(df), table.global_mean, dtype=np.float32)
+    scores[rows] = table.scores(prior_weight)[matched]
+
+    # Added in place, so the frame's cached indexes are rebuilt for the new shape on next use.
+    df['n_reviews'] = reviews
+    df['rating'] = means
+    df['rating_score'] = scores
+    return df
+
+
+def load_ratings_for(df, recipes_path, cache_root=None):
+
+    path = find_interactions_path(recipes_path)
+    if path is None:
+        return None
+    table = load_rating_table(path, cache_root)
+    join_ratings(df, table)
+    return table
+
+
+def has_ratings(df):
+
+    return RATING_WEIGHT in df.columns
+
+
+def rating_order(df):
+
+    def build(frame):
+        order = np.argsort(-frame[RATING_WEIGHT].to_numpy(dtype=np.float64, na_value=0.0), kind='stable')
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        return order, rank
+
+    return index_registry.get_or_build(df, 'rating_order', build)
+
+
+def rank_rows(df, rows):
+
+    rows = np.asarray(rows, dtype=np.int64)
+    if not has_ratings(df) or len(rows) < 2:
+        return rows
+
+    order, rank = rating_order(df)
+    if len(rows) > len(df) * ORDER_FRACTION:
+        mask = np.zeros(len(df), dtype=bool)
+        mask[rows] = True
+        return order[mask[order]]
+    return rows[np.argsort(rank[rows], kind='stable')]
+
+
+def default_weights(df):
+
+    return RATING_WEIGHT if has_ratings(df) else None
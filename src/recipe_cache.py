@@ -0,0 +1,317 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from profiling import profiler
+
+CACHE_VERSION = 1
+CACHE_DIR_NAME = '.recipeasy_cache'
+META_FILE = 'meta.json'
+FEATHER_FILE = 'recipes.feather'
+PROGRESS_CHUNK_ROWS = 50000
+
+
+def has_pyarrow():
+
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def cache_dir_for(path, cache_root=None):
+
+    if cache_root is None:
+        cache_root = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_root, stem)
+
+
+def source_signature(path):
+
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def file_hash(path, chunk_size=1 << 20):
+
+    digest = hashlib.sha1()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_meta(directory):
+
+    try:
+        with open(os.path.join(directory, META_FILE)) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(directory, meta):
+
+    tmp_path = os.path.join(directory, META_FILE + '.tmp')
+    with open(tmp_path, 'w') as handle:
+        json.dump(meta, handle, indent=2)
+    os.replace(tmp_path, os.path.join(directory, META_FILE))
+
+
+def is_cache_valid(path, directory, signature=None):
+
+    meta = read_meta(directory)
+    if meta is None:
+        return False
+
+    if meta.get('version') != CACHE_VERSION or meta.get('pandas') != pd.__version__:
+        return False
+
+    if signature is None:
+        signature = source_signature(path)
+
+    if meta['source']['size'] != signature['size']:
+        return False
+
+    if meta['source']['mtime_ns'] == signature['mtime_ns']:
+        return True
+
+    # Same size but touched (e.g. a fresh checkout): only rebuild if the bytes changed.
+    if meta['source'].get('sha1') != file_hash(path):
+        return False
+
+    meta['source']['mtime_ns'] = signature['mtime_ns']
+    try:
+        _write_meta(directory, meta)
+    except OSError:
+        pass
+    return True
+
+
+def encode_strings(values):
+
+    mask = pd.isna(values)
+    encoded = [b'' if missing else str(value).encode('utf-8') for value, missing in zip(values, mask)]
+    lengths = np.fromiter((len(item) for item in encoded), dtype=np.int64, count=len(encoded))
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return offsets, data, np.asarray(mask, dtype=bool)
+
+
+def decode_strings(offsets, data, mask):
+
+    raw = data.tobytes()
+    text = raw.decode('utf-8')
+
+    if len(text) == len(raw):
+        char_offsets = offsets
+    else:
+        # Map byte offsets to character offsets by discounting UTF-8 continuation bytes.
+        continuation = np.zeros(len(data) + 1, dtype=np.int64)
+        np.cumsum((data & 0xC0) == 0x80, out=continuation[1:])
+        char_offsets = offsets - continuation[offsets]
+
+    starts = char_offsets[:-1].tolist()
+    ends = char_offsets[1:].tolist()
+    values = np.empty(len(starts), dtype=object)
+    values[:] = [text[start:end] for start, end in zip(starts, ends)]
+    values[mask] = np.nan
+    return values
+
+
+def string_column_paths(directory, column):
+
+    return (
+        os.path.join(directory, f'{column}.offsets.npy'),
+        os.path.join(directory, f'{column}.data.npy'),
+        os.path.join(directory, f'{column}.mask.npy'),
+    )
+
+
+def write_string_column(directory, column, values):
+
+    offsets, data, mask = encode_strings(values)
+    offsets_path, data_path, mask_path = string_column_paths(directory, column)
+    np.save(offsets_path, offsets)
+    np.save(data_path, data)
+    np.save(mask_path, mask)
+
+
+def read_string_column(directory, column, mmap_mode=None):
+
+    offsets_path, data_path, mask_path = string_column_paths(directory, column)
+    offsets = np.load(offsets_path, mmap_mode=mmap_mode)
+    data = np.load(data_path, mmap_mode=mmap_mode)
+    mask = np.load(mask_path, mmap_mode=mmap_mode)
+    return offsets, data, mask
+
+
+def _write_npy_columns(df, directory):
+
+    columns = []
+    for position, column in enumerate(df.columns):
+        series = df[column]
+        key = f'c{position}'
+        entry = {'name': column, 'key': key, 'dtype': str(series.dtype)}
+
+        if series.dtype.kind in 'biuf':
+            entry['kind'] = 'numeric'
+            np.save(os.path.join(directory, f'{key}.npy'), series.to_numpy())
+        elif series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+            entry['kind'] = 'string'
+            write_string_column(directory, key, series.to_numpy(dtype=object))
+        else:
+            entry['kind'] = 'pickle'
+            series.to_pickle(os.path.join(directory, f'{key}.pkl'))
+
+        columns.append(entry)
+
+    return columns
+
+
+def _read_npy_columns(directory, entries, columns=None):
+
+    data = {}
+    for entry in entries:
+        name = entry['name']
+        if columns is not None and name not in columns:
+            continue
+
+        key = entry['key']
+        if entry['kind'] == 'numeric':
+            data[name] = np.load(os.path.join(directory, f'{key}.npy'))
+        elif entry['kind'] == 'string':
+            values = decode_strings(*read_string_column(directory, key))
+            series = pd.Series(values, dtype=object)
+            if entry['dtype'] != 'object':
+                series = series.astype(pd.api.types.pandas_dtype(entry['dtype']))
+            data[name] = series
+        else:
+            data[name] = pd.read_pickle(os.path.join(directory, f'{key}.pkl'))
+
+    order = [entry['name'] for entry in entries if entry['name'] in data]
+    return pd.DataFrame({name: pd.Series(data[name]).reset_index(drop=True) for name in order}, columns=order)
+
+
+def write_cache(df, path, directory, signature=None, digest=None, cache_format=None):
+
+    if signature is None:
+        signature = source_signature(path)
+    if digest is None:
+        digest = file_hash(path)
+    if cache_format is None:
+        cache_format = 'feather' if has_pyarrow() else 'npy'
+
+    df = df.reset_index(drop=True)
+    df.columns = [str(column) for column in df.columns]
+
+    tmp_directory = directory + '.tmp'
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+
+    try:
+        meta = {
+            'version': CACHE_VERSION,
+            'pandas': pd.__version__,
+            'format': cache_format,
+            'rows': len(df),
+            'source': {
+                'path': os.path.abspath(path),
+                'size': signature['size'],
+                'mtime_ns': signature['mtime_ns'],
+                'sha1': digest,
+            },
+        }
+
+        if cache_format == 'feather':
+            df.to_feather(os.path.join(tmp_directory, FEATHER_FILE))
+            meta['columns'] = list(df.columns)
+        else:
+            meta['columns'] = _write_npy_columns(df, tmp_directory)
+
+        _write_meta(tmp_directory, meta)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_directory, directory)
+    finally:
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+
+
+def read_cache(directory, columns=None):
+
+    meta = read_meta(directory)
+    if meta is None:
+        raise FileNotFoundError(f"No recipe cache in {directory}")
+
+    if meta['format'] == 'feather':
+        return pd.read_feather(os.path.join(directory, FEATHER_FILE), columns=columns)
+
+    return _read_npy_columns(directory, meta['columns'], columns)
+
+
+def read_csv_with_progress(path, progress, chunksize=PROGRESS_CHUNK_ROWS):
+
+    size = os.path.getsize(path)
+    chunks = []
+    with open(path, 'rb') as handle:
+        for chunk in pd.read_csv(handle, chunksize=chunksize):
+            chunks.append(chunk)
+            # The parser reads ahead in blocks, so the file position is a close progress estimate.
+            progress(min(handle.tell() / size, 1.0) if size else 1.0)
+    if not chunks:
+        return pd.read_csv(path)
+    # A chunk whose text column is entirely missing parses as float, which leaves the joined column as object.
+    return pd.concat(chunks, ignore_index=True).infer_objects()
+
+
+def _select(df, columns):
+
+    if columns is None:
+        return df
+    return df[[column for column in df.columns if column in columns]]
+
+
+def load_with_cache(path, cache_root=None, reader=None, columns=None):
+
+    if reader is None:
+        reader = pd.read_csv
+
+    try:
+        signature = source_signature(path)
+    except OSError:
+        return _select(reader(path), columns)
+
+    directory = cache_dir_for(path, cache_root)
+
+    try:
+        if is_cache_valid(path, directory, signature):
+            with profiler.stage('load.cache_read') as stage:
+                df = read_cache(directory, columns)
+                stage.add('rows', len(df))
+            return df
+    except Exception as e:
+        print(f"Ignoring unreadable recipe cache in {directory}: {e}")
+
+    with profiler.stage('load.csv_parse') as stage:
+        df = reader(path)
+        stage.add('rows', len(df))
+
+    try:
+        os.makedirs(os.path.dirname(directory), exist_ok=True)
+        with profiler.stage('load.cache_write'):
+            write_cache(df, path, directory, signature)
+    except Exception as e:
+        print(f"Could not write recipe cache to {directory}: {e}")
+
+    return _select(df, columns)
+
+
+def clear_cache(path, cache_root=None):
+
+    shutil.rmtree(cache_dir_for(path, cache_root), ignore_errors=True)
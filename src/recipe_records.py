@@ -0,0 +1,194 @@
+import ast
+
+import numpy as np
+import pandas as pd
+
+import index_registry
+
+LIST_COLUMNS = ('ingredients', 'steps', 'tags')
+NUTRITION_FIELDS = ('calories', 'total_fat', 'sugar', 'sodium', 'protein', 'saturated_fat', 'carbohydrates')
+
+
+def parse_list(value):
+
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return list(value)
+    if not isinstance(value, str):
+        return None
+
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+
+    if isinstance(parsed, (list, tuple)):
+        return list(parsed)
+    return None
+
+
+def parse_nutrition(value):
+
+    if isinstance(value, str):
+        # Nutrition cells are plain numeric lists, so skip literal_eval when we can.
+        try:
+            values = [float(item) for item in value.strip().strip('[]').split(',')]
+        except ValueError:
+            values = parse_list(value)
+    else:
+        values = parse_list(value)
+
+    if values is None:
+        return None
+
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+
+
+PARSERS = {
+    'ingredients': parse_list,
+    'steps': parse_list,
+    'tags': parse_list,
+    'nutrition': parse_nutrition,
+}
+
+
+class ParsedColumn:
+
+    def __init__(self, series, parser):
+
+        self.raw = series.to_numpy(dtype=object)
+        self.parser = parser
+        self._parsed = {}
+
+    def __len__(self):
+
+        return len(self.raw)
+
+    def __getitem__(self, row):
+
+        row = int(row)
+        if row not in self._parsed:
+            self._parsed[row] = self.parser(self.raw[row])
+        return self._parsed[row]
+
+    @property
+    def parsed_count(self):
+
+        return len(self._parsed)
+
+    def bulk(self, rows=None):
+
+        if rows is None:
+            rows = range(len(self.raw))
+        return [self[row] for row in rows]
+
+
+class RecipeRecord:
+
+    def __init__(self, records, row):
+
+        self._records = records
+        self.row = int(row)
+
+    def __getitem__(self, column):
+
+        if column in self._records.parsed_columns:
+            return self._records.column(column)[self.row]
+        return self._records.df[column].iat[self.row]
+
+    def __contains__(self, column):
+
+        return column in self._records.df.columns
+
+    def get(self, column, default=None):
+
+        return self[column] if column in self else default
+
+    @property
+    def name(self):
+
+        return self.get('name')
+
+    @property
+    def ingredients(self):
+
+        return self.get('ingredients')
+
+    @property
+    def steps(self):
+
+        return self.get('steps')
+
+    @property
+    def tags(self):
+
+        return self.get('tags')
+
+    @property
+    def nutrition(self):
+
+        return self.get('nutrition')
+
+    def nutrition_facts(self):
+
+        values = self.nutrition
+        if values is None:
+            return {}
+        return dict(zip(NUTRITION_FIELDS, values.tolist()))
+
+
+class RecipeRecords:
+
+    def __init__(self, df):
+
+        self.df = df
+        self.parsed_columns = {column for column in PARSERS if column in df.columns}
+        self._columns = {}
+
+    def __len__(self):
+
+        return len(self.df)
+
+    def column(self, column):
+
+        if column not in self._columns:
+            self._columns[column] = ParsedColumn(self.df[column], PARSERS[column])
+        return self._columns[column]
+
+    def record(self, row):
+
+        return RecipeRecord(self, row)
+
+    def records(self, rows):
+
+        return [RecipeRecord(self, row) for row in rows]
+
+    def nutrition_matrix(self, rows=None):
+
+        if rows is None:
+            rows = np.arange(len(self.df))
+        matrix = np.full((len(rows), len(NUTRITION_FIELDS)), np.nan)
+        if 'nutrition' not in self.parsed_columns:
+            return matrix
+
+        nutrition = self.column('nutrition')
+        for position, row in enumerate(rows):
+            values = nutrition[row]
+            if values is not None:
+                count = min(len(values), len(NUTRITION_FIELDS))
+                matrix[position, :count] = values[:count]
+        return matrix
+
+
+def get_records(df):
+
+    return index_registry.get_or_build(df, 'records', RecipeRecords)
+
+
+def is_present(value):
+
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return True
+    return value is not None and bool(pd.notna(value))
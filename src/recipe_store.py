@@ -0,0 +1,460 @@
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import index_registry
+import ingredient_index
+import name_index
+import recipe_cache
+from profiling import profiler
+from ratings import join_ratings, load_ratings_for
+from Recipeasy import DATASET_NOT_FOUND, find_data_path, find_ingredient_rows, find_name_rows
+
+DELTA_SUFFIX = '.deltas'
+SEGMENT_PATTERN = re.compile(r'^(\d{8})\.(append\.csv|delete\.json)$')
+# Highest sequence number folded into the CSV; numbering continues from it after the segments are removed.
+COMPACTED_FILE = 'compacted'
+# Merge once the delta holds this many rows; until then every query also searches it.
+MERGE_ROWS = 5000
+# A smaller delta is still merged after this many seconds.
+MERGE_AGE = 300
+COMPACT_INTERVAL = 600
+REFRESH_INTERVAL = 1.0
+
+
+def delta_dir_for(path, cache_root=None):
+
+    # Beside the recipe cache rather than inside it: rebuilding the cache removes its directory.
+    return recipe_cache.cache_dir_for(path, cache_root) + DELTA_SUFFIX
+
+
+def list_segments(directory):
+
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    segments = []
+    for name in names:
+        match = SEGMENT_PATTERN.match(name)
+        if match is not None:
+            segments.append((int(match.group(1)), match.group(2).split('.')[0], os.path.join(directory, name)))
+    return sorted(segments)
+
+
+def read_compacted(directory):
+
+    try:
+        with open(os.path.join(directory, COMPACTED_FILE)) as handle:
+            return int(handle.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def write_compacted(directory, sequence):
+
+    tmp_path = os.path.join(directory, f'.{os.getpid()}.{threading.get_ident()}.compacted.tmp')
+    with open(tmp_path, 'w') as handle:
+        handle.write(str(sequence))
+    os.replace(tmp_path, os.path.join(directory, COMPACTED_FILE))
+
+
+def write_segment(directory, kind, write):
+
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f'.{os.getpid()}.{threading.get_ident()}.tmp')
+    write(tmp_path)
+    try:
+        # Claim the next sequence number with a hard link, which fails if another writer took it.
+        # The listing is read before the compacted mark, which is written before segments are removed,
+        # so a number is never handed out twice.
+        while True:
+            segments = list_segments(directory)
+            sequence = max(segments[-1][0] if segments else 0, read_compacted(directory)) + 1
+            target = os.path.join(directory, f'{sequence:08d}.{kind}')
+            try:
+                os.link(tmp_path, target)
+                return sequence
+            except FileExistsError:
+                continue
+    finally:
+        os.remove(tmp_path)
+
+
+class RecipeStore:
+
+    def __init__(self, path, cache_root=None, merge_rows=MERGE_ROWS, merge_age=MERGE_AGE, compact_interval=COMPACT_INTERVAL):
+
+        self.path = path
+        self.cache_root = cache_root
+        self.directory = delta_dir_for(path, cache_root)
+        self.merge_rows = merge_rows
+        self.merge_age = merge_age
+        self.compact_interval = compact_interval
+        self.lock = threading.RLock()
+        self._merge_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_refresh = 0.0
+        self._last_compact = time.monotonic()
+        self._delta_since = None
+        self._load_base(read_compacted(self.directory))
+        self.refresh(force=True)
+
+    def _load_base(self, compacted):
+
+        # The CSV already includes every segment up to the compacted mark.
+        base = recipe_cache.load_with_cache(self.path, self.cache_root)
+        self.columns = list(base.columns)
+        self.ratings = load_ratings_for(base, self.path, self.cache_root)
+        base.attrs['source_path'] = self.path
+        self.base = base
+        self.delta = self._empty_delta()
+        self.live = np.ones(len(base), dtype=bool)
+        self.applied = compacted
+        self.merged = compacted
+        self._id_order = None
+        self._delta_since = None
+
+    def _empty_delta(self):
+
+        return self.base.iloc[:0].copy()
+
+    def __len__(self):
+
+        return int(self.live.sum())
+
+    @property
+    def n_base(self):
+
+        return len(self.base)
+
+    def status(self):
+
+        with self.lock:
+            return {
+                'recipes': len(self),
+                'base_rows': self.n_base,
+                'delta_rows': len(self.delta),
+                'deleted_rows': int(len(self.live) - self.live.sum()),
+                'applied_segment': self.applied,
+                'merged_segment': self.merged,
+            }
+
+    # Writing: every change is a new segment file, applied in sequence order by each reader.
+
+    def append(self, recipes):
+
+        recipes = recipes if isinstance(recipes, pd.DataFrame) else pd.DataFrame(recipes)
+        missing = [column for column in ('id', 'name') if column not in recipes.columns]
+        if missing:
+            raise ValueError(f"New recipes need {' and '.join(missing)}")
+        frame = recipes.reindex(columns=self.columns)
+        sequence = write_segment(self.directory, 'append.csv', lambda target: frame.to_csv(target, index=False))
+        self.refresh(force=True)
+        return sequence
+
+    def delete(self, ids):
+
+        ids = [int(recipe_id) for recipe_id in ids]
+        sequence = write_segment(self.directory, 'delete.json', lambda target: _write_json(target, ids))
+        self.refresh(force=True)
+        return sequence
+
+    def refresh(self, force=False):
+
+        # Cheap enough per request: a directory listing, throttled, and only new segments are read.
+        now = time.monotonic()
+        if not force and now - self._last_refresh < REFRESH_INTERVAL:
+            return 0
+        self._last_refresh = now
+        applied = 0
+        if read_compacted(self.directory) > self.applied:
+            # Another process compacted segments this one had not applied yet; they are in the CSV now.
+            with self._merge_lock, self.lock:
+                compacted = read_compacted(self.directory)
+                if compacted > self.applied:
+                    self._load_base(compacted)
+        with self.lock:
+            for sequence, kind, path in list_segments(self.directory):
+                if sequence <= self.applied:
+                    continue
+                try:
+                    if kind == 'append':
+                        self._apply_append(pd.read_csv(path))
+                    else:
+                        with open(path) as handle:
+                            self._apply_delete(np.asarray(json.load(handle), dtype=np.int64))
+                except FileNotFoundError:
+                    # Compacted away since the listing; the next refresh reloads the dataset.
+                    break
+                self.applied = sequence
+                applied += 1
+        return applied
+
+    def _apply_append(self, frame):
+
+        frame = frame.reindex(columns=self.columns)
+        if self.ratings is not None:
+            join_ratings(frame, self.ratings)
+        frame = frame.reindex(columns=self.base.columns)
+        # A new frame object, so the delta's indexes are rebuilt at a cost proportional to the delta.
+        self.delta = pd.concat([self.delta, frame], ignore_index=True) if len(self.delta) else frame.reset_index(drop=True)
+        self.live = np.concatenate([self.live, np.ones(len(frame), dtype=bool)])
+        if self._delta_since is None:
+            self._delta_since = time.monotonic()
+
+    def _base_id_order(self):
+
+        if self._id_order is None:
+            ids = self.base['id'].to_numpy(dtype=np.float64, na_value=np.nan)
+            order = np.argsort(ids, kind='stable')
+            self._id_order = (order, ids[order])
+        return self._id_order
+
+    def _apply_delete(self, ids):
+
+        ids = np.sort(ids).astype(np.float64)
+        order, sorted_ids = self._base_id_order()
+        starts = np.searchsorted(sorted_ids, ids, side='left')
+        stops = np.searchsorted(sorted_ids, ids, side='right')
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            self.live[order[start:stop]] = False
+        if len(self.delta):
+            delta_ids = self.delta['id'].to_numpy(dtype=np.float64, na_value=np.nan)
+            self.live[self.n_base + np.flatnonzero(np.isin(delta_ids, ids))] = False
+
+    # Reading: base results minus deletions, followed by the delta's own results.
+
+    def snapshot(self):
+
+        with self.lock:
+            return self.base, self.delta, self.live
+
+    def search(self, find):
+
+        # find(frame) returns rows of that frame; the answer is one (frame, rows) part per frame.
+        base, delta, live = self.snapshot()
+        rows = np.asarray(find(base), dtype=np.int64)
+        parts = [(base, rows[live[rows]])]
+        if len(delta):
+            rows = np.asarray(find(delta), dtype=np.int64)
+            parts.append((delta, rows[live[len(base) + rows]]))
+        return parts
+
+    def global_rows(self, parts):
+
+        offsets = [0, len(parts[0][0])]
+        return np.concatenate([rows + offset for (frame, rows), offset in zip(parts, offsets)])
+
+    def find_name_rows(self, query):
+
+        return self.global_rows(self.search(lambda frame: find_name_rows(frame, query)))
+
+    def find_ingredient_rows(self, query):
+
+        return self.global_rows(self.search(lambda frame: find_ingredient_rows(frame, query)))
+
+    def locate(self, row):
+
+        base, delta, live = self.snapshot()
+        return (base, row) if row < len(base) else (delta, row - len(base))
+
+    def locate_id(self, recipe_id):
+
+        with self.lock:
+            row = self.row_for_id(recipe_id)
+            return (self.base, None) if row is None else self.locate(row)
+
+    def recipes(self, rows):
+
+        base, delta, live = self.snapshot()
+        rows = np.asarray(rows, dtype=np.int64)
+        in_base = rows < len(base)
+        parts = [base.iloc[rows[in_base]]]
+        if not in_base.all():
+            parts.append(delta.iloc[rows[~in_base] - len(base)])
+        return pd.concat(parts) if len(parts) > 1 else parts[0]
+
+    def row_for_id(self, recipe_id):
+
+        base, delta, live = self.snapshot()
+        order, sorted_ids = self._base_id_order()
+        position = int(np.searchsorted(sorted_ids, recipe_id))
+        while position < len(sorted_ids) and sorted_ids[position] == recipe_id:
+            if live[order[position]]:
+                return int(order[position])
+            position += 1
+        if len(delta):
+            found = np.flatnonzero(delta['id'].to_numpy(dtype=np.float64, na_value=np.nan) == recipe_id) + len(base)
+            found = found[live[found]]
+            if len(found):
+                return int(found[-1])
+        return None
+
+    # Merging: fold the delta into a new base frame, reusing the existing indexes.
+
+    def merge(self):
+
+        with self._merge_lock:
+            with self.lock:
+                base, delta, live, applied = self.base, self.delta, self.live.copy(), self.applied
+            if not len(delta) and live.all():
+                return None
+
+            with profiler.stage('store.merge') as stage:
+                live_base, live_delta = live[:len(base)], live[len(base):]
+                merged = pd.concat([base[live_base], delta[live_delta]], ignore_index=True) if len(delta) else base[live_base].reset_index(drop=True)
+                merged.attrs = {}
+                # Seed the merged frame's indexes from the old ones when they were built; remapping
+                # postings costs a sort of the postings, not a re-tokenisation of every recipe.
+                for column, key, merge in (
+                    ('name', ('name_index', 'name'), lambda old, new, frame: name_index.merge_indexes(old, new, live)),
+                    ('ingredients', ('list_index', 'ingredients'), lambda old, new, frame: ingredient_index.merge_indexes(old, new, live, frame['ingredients'])),
+                ):
+                    if column not in merged.columns or not index_registry.is_built(base, key):
+                        continue
+                    old = index_registry.get_or_build(base, key, None)
+                    new = name_index.get_name_index(delta) if column == 'name' else ingredient_index.get_ingredient_index(delta)
+                    index = merge(old, new, merged)
+                    index_registry.get_or_build(merged, key, lambda frame, index=index: index)
+                stage.add('rows', len(merged))
+
+            with self.lock:
+                # Segments applied while merging stay in the delta; their deletions stay masked.
+                seen = len(base) + len(delta)
+                self.live = np.concatenate([self.live[:seen][live], self.live[seen:]])
+                self.delta = self.delta.iloc[len(delta):].reset_index(drop=True) if len(self.delta) > len(delta) else self._empty_delta()
+                self.base = merged
+                self.merged = applied
+                self._id_order = None
+                self._delta_since = time.monotonic() if len(self.delta) else None
+            return merged
+
+    def compact(self):
+
+        # Merge, write the merged recipes back to the CSV and the recipe cache, then drop the
+        # segments they include. Later segments stay on disk and in the delta.
+        with self._merge_lock:
+            self.merge()
+            with self.lock:
+                base, merged = self.base, self.merged
+            # Only segments this process has merged; merged never passes what it applied.
+            segments = [segment for segment in list_segments(self.directory) if segment[0] <= merged]
+            self._last_compact = time.monotonic()
+            if not segments:
+                return 0
+
+            with profiler.stage('store.compact') as stage:
+                deletes = any(kind == 'delete' for _, kind, _ in segments)
+                frame = base[self.columns]
+                if deletes:
+                    tmp_path = self.path + '.tmp'
+                    frame.to_csv(tmp_path, index=False)
+                    os.replace(tmp_path, self.path)
+                else:
+                    # Append-only changes extend the CSV in place with the segments' own rows.
+                    appended = pd.concat([pd.read_csv(path) for _, kind, path in segments if kind == 'append'], ignore_index=True)
+                    with open(self.path, 'a', newline='') as handle:
+                        appended.reindex(columns=self.columns).to_csv(handle, index=False, header=False)
+                directory = recipe_cache.cache_dir_for(self.path, self.cache_root)
+                os.makedirs(os.path.dirname(directory), exist_ok=True)
+                recipe_cache.write_cache(frame, self.path, directory)
+                write_compacted(self.directory, merged)
+                for _, _, path in segments:
+                    os.remove(path)
+                stage.add('segments', len(segments))
+
+            base.attrs['source_path'] = self.path
+            return len(segments)
+
+    # Background upkeep for long-running processes such as the service.
+
+    def maintain(self):
+
+        self.refresh()
+        with self.lock:
+            delta_rows = len(self.delta)
+            deleted = len(self.live) - int(self.live.sum())
+            since = self._delta_since
+        now = time.monotonic()
+        if delta_rows + deleted >= self.merge_rows or (since is not None and now - since >= self.merge_age):
+            self.merge()
+        if now - self._last_compact >= self.compact_interval:
+            self.compact()
+
+    def start(self, interval=REFRESH_INTERVAL):
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.maintain()
+                except Exception as e:
+                    print(f"Recipe store maintenance failed: {e}", file=sys.stderr)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name='recipeasy-store', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def _write_json(path, value):
+
+    with open(path, 'w') as handle:
+        json.dump(value, handle)
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Add or remove recipes without re-importing the dataset.")
+    parser.add_argument('--data', help="recipes CSV (defaults to the same locations as the interactive program)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    append = commands.add_parser('append', help="add the recipes in a CSV with the same columns")
+    append.add_argument('csv')
+    delete = commands.add_parser('delete', help="remove recipes by id")
+    delete.add_argument('ids', nargs='+', type=int)
+    commands.add_parser('compact', help="fold pending changes into the dataset and its cache")
+    commands.add_parser('status', help="show pending changes")
+    args = parser.parse_args(argv)
+
+    data_path = args.data or find_data_path()
+    if data_path is None:
+        print(DATASET_NOT_FOUND, file=sys.stderr)
+        return 1
+
+    if args.command in ('append', 'delete'):
+        # Writing a segment does not need the dataset loaded; running programs pick it up.
+        directory = delta_dir_for(data_path)
+        if args.command == 'append':
+            frame = pd.read_csv(args.csv)
+            sequence = write_segment(directory, 'append.csv', lambda target: frame.to_csv(target, index=False))
+            print(f"Queued {len(frame)} new recipes as segment {sequence}")
+        else:
+            sequence = write_segment(directory, 'delete.json', lambda target: _write_json(target, args.ids))
+            print(f"Queued {len(args.ids)} deletions as segment {sequence}")
+        return 0
+
+    store = RecipeStore(data_path)
+    if args.command == 'compact':
+        print(f"Compacted {store.compact()} segments into {data_path}")
+    for key, value in store.status().items():
+        print(f"{key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
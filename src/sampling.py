@@ -0,0 +1,120 @@
+import numpy as np
+
+import index_registry
+from facets import get_facet_index
+from profiling import profiler
+from ingredient_index import get_ingredient_index, parse_terms
+from query_cache import QueryCache
+
+# Every distinct set of constraints has its own pool, so only the most recent are kept.
+POOL_CACHE_ENTRIES = 32
+
+
+class RecipeSampler:
+
+    def __init__(self, df, seed=None):
+
+        self.df = df
+        self.rng = np.random.default_rng(seed)
+        self._pools = QueryCache(POOL_CACHE_ENTRIES)
+        self._cumulative = QueryCache(POOL_CACHE_ENTRIES)
+
+    def seed(self, seed):
+
+        self.rng = np.random.default_rng(seed)
+
+    def rows_at_most(self, column, limit):
+
+        return get_facet_index(self.df).rows_in_range(column, high=limit)
+
+    def rows_with_ingredients(self, ingredients):
+
+        terms = parse_terms(ingredients) if isinstance(ingredients, str) else [term.lower() for term in ingredients]
+        return get_ingredient_index(self.df).search(terms)
+
+    def pool_key(self, max_minutes=None, max_ingredients=None, max_steps=None, ingredients=None):
+
+        return (max_minutes, max_ingredients, max_steps, ingredients if isinstance(ingredients, (str, type(None))) else tuple(ingredients))
+
+    def pool(self, max_minutes=None, max_ingredients=None, max_steps=None, ingredients=None):
+
+        key = self.pool_key(max_minutes, max_ingredients, max_steps, ingredients)
+        rows = self._pools.get(key)
+        if rows is not None:
+            return rows
+
+        parts = []
+        for column, limit in (('minutes', max_minutes), ('n_ingredients', max_ingredients), ('n_steps', max_steps)):
+            if limit is not None:
+                parts.append(self.rows_at_most(column, limit))
+        if ingredients:
+            parts.append(self.rows_with_ingredients(ingredients))
+
+        if not parts:
+            rows = np.arange(len(self.df))
+        else:
+            parts.sort(key=len)
+            rows = parts[0]
+            for part in parts[1:]:
+                if len(rows) == 0:
+                    break
+                rows = np.intersect1d(rows, part, assume_unique=True)
+
+        return self._pools.put(key, np.asarray(rows, dtype=np.int64))
+
+    def _weights(self, weights):
+
+        if isinstance(weights, str):
+            values = self.df[weights].to_numpy(dtype=np.float64, na_value=0.0)
+        else:
+            values = np.asarray(weights, dtype=np.float64)
+        return np.where(np.isfinite(values) & (values > 0), values, 0.0)
+
+    def sample(self, n=1, weights=None, rows=None, **constraints):
+
+        pool = self.pool(**constraints) if rows is None else np.asarray(rows, dtype=np.int64)
+        n = min(n, len(pool))
+        if n <= 0:
+            return np.zeros(0, dtype=np.int64)
+
+        if weights is None:
+            if n == 1:
+                return pool[[self.rng.integers(len(pool))]]
+            return self.rng.choice(pool, size=n, replace=False)
+
+        pool_weights = self._weights(weights)[pool]
+        available = np.count_nonzero(pool_weights)
+        if available == 0:
+            return self.sample(n, rows=pool)
+
+        if n == 1:
+            # Cached cumulative weights make repeated single draws a binary search.
+            cacheable = rows is None and isinstance(weights, str)
+            cache_key = (self.pool_key(**constraints), weights) if cacheable else None
+            cumulative = self._cumulative.get(cache_key) if cacheable else None
+            if cumulative is None:
+                cumulative = np.cumsum(pool_weights)
+                if cacheable:
+                    cumulative = self._cumulative.put(cache_key, cumulative)
+            position = np.searchsorted(cumulative, self.rng.random() * cumulative[-1], side='right')
+            return pool[[min(position, len(pool) - 1)]]
+
+        picked = self.rng.choice(pool, size=min(n, available), replace=False, p=pool_weights / pool_weights.sum())
+        if len(picked) < n:
+            # Fewer weighted rows than asked for: the rest come uniformly from the zero-weight rows,
+            # after every weighted one, so a batch is only short when the pool itself is.
+            unweighted = pool[pool_weights == 0]
+            picked = np.concatenate([picked, self.rng.choice(unweighted, size=n - len(picked), replace=False)])
+        return picked
+
+    def sample_recipes(self, n=1, weights=None, rows=None, **constraints):
+
+        with profiler.stage('sample') as stage:
+            picked = self.sample(n, weights, rows, **constraints)
+            stage.add('rows_sampled', len(picked))
+        return self.df.iloc[picked]
+
+
+def get_sampler(df):
+
+    return index_registry.get_or_build(df, 'sampler', RecipeSampler)
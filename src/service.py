@@ -0,0 +1,523 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import index_registry
+from autocomplete import DEFAULT_LIMIT, complete_ingredients, complete_name
+from facets import FACET_FIELDS, get_facet_index
+from fuzzy_search import suggest_ingredient_query, suggest_name_query
+from ingredient_index import get_ingredient_index
+from name_index import get_name_index
+from profiling import profiler
+from query_planner import get_query_planner, run_query
+from query_cache import cache_stats
+from ratings import default_weights, rank_rows
+from recipe_records import LIST_COLUMNS, get_records
+from recipe_store import RecipeStore
+from sampling import get_sampler
+from similarity import DEFAULT_K, similar_rows
+from Recipeasy import DATASET_NOT_FOUND, find_data_path, find_ingredient_rows, find_name_rows
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = 4
+MAX_RESULTS = 50
+LATENCY_WINDOW = 10000
+MAX_HEADER_BYTES = 16384
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class ServiceError(Exception):
+
+    def __init__(self, status, message):
+
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyTracker:
+
+    def __init__(self, window=LATENCY_WINDOW):
+
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.counts = defaultdict(int)
+
+    def record(self, endpoint, seconds):
+
+        self.samples[endpoint].append(seconds)
+        self.counts[endpoint] += 1
+
+    def summary(self):
+
+        report = {}
+        for endpoint, samples in self.samples.items():
+            values = np.fromiter(samples, dtype=np.float64) * 1000
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            report[endpoint] = {
+                'requests': self.counts[endpoint],
+                'p50_ms': round(float(p50), 3),
+                'p95_ms': round(float(p95), 3),
+                'p99_ms': round(float(p99), 3),
+                'max_ms': round(float(values.max()), 3),
+            }
+        return report
+
+
+def to_json_value(value):
+
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    if isinstance(value, (str, int, float, bool, list, dict)):
+        return value
+    return str(value)
+
+
+def recipe_payload(df, row, full=True):
+
+    record = get_records(df).record(row)
+    columns = df.columns if full else [column for column in ('id', 'name', 'minutes', 'n_ingredients', 'rating') if column in df.columns]
+    payload = {}
+    for column in columns:
+        if column == 'nutrition':
+            payload['nutrition'] = record.nutrition_facts() or None
+        elif column in LIST_COLUMNS:
+            payload[column] = record[column]
+        else:
+            payload[column] = to_json_value(record[column])
+    return payload
+
+
+def _int_param(params, name, default=None, minimum=None):
+
+    value = params.get(name, default)
+    if value is None:
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"'{name}' must be an integer")
+    if minimum is not None and value < minimum:
+        raise ServiceError(400, f"'{name}' must be at least {minimum}")
+    return value
+
+
+def _float_param(params, name):
+
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"'{name}' must be a number")
+
+
+class RecipeService:
+
+    def __init__(self, df, workers=DEFAULT_WORKERS, max_results=MAX_RESULTS, store=None):
+
+        self._df = df
+        self.store = store
+        self.max_results = max_results
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='recipeasy-search')
+        self.latency = LatencyTracker()
+        self.started = time.time()
+        self._servers = []
+        self.routes = {
+            'search/name': self.search_name,
+            'search/ingredients': self.search_ingredients,
+            'surprise': self.surprise,
+            'filter': self.filter,
+            'query': self.query,
+            'complete': self.complete,
+            'recipes': self.recipe_by_id,
+            'stats': self.stats,
+            'health': self.health,
+        }
+
+    @property
+    def df(self):
+
+        # With a recipe store the base frame is swapped whenever pending changes are merged.
+        return self._df if self.store is None else self.store.base
+
+    def _parts(self, find):
+
+        if self.store is None:
+            return [(self.df, np.asarray(find(self.df)))]
+        return self.store.search(find)
+
+    def warm_up(self):
+
+        if 'name' in self.df.columns:
+            get_name_index(self.df)
+        if 'ingredients' in self.df.columns:
+            get_ingredient_index(self.df)
+        self.id_rows()
+
+    def id_rows(self):
+
+        def build(frame):
+            if 'id' not in frame.columns:
+                return {}
+            return {int(recipe_id): row for row, recipe_id in enumerate(frame['id'].to_numpy()) if recipe_id == recipe_id}
+
+        return index_registry.get_or_build(self.df, 'id_rows', build)
+
+    def _filters(self, params):
+
+        filters = {}
+        for field in FACET_FIELDS:
+            low = _float_param(params, f'{field}_min')
+            high = _float_param(params, f'{field}_max')
+            if low is not None or high is not None:
+                filters[field] = (low, high)
+        return filters
+
+    def _results(self, parts, params):
+
+        filters = self._filters(params)
+        sort = params.get('sort', 'rating')
+        if sort not in ('rating', 'file'):
+            raise ServiceError(400, "sort must be 'rating' or 'file'")
+
+        # One part per frame: the dataset, plus recipes added since the last merge when serving a store.
+        ranked = []
+        for frame, rows in parts:
+            if filters:
+                try:
+                    rows = get_facet_index(frame).filter(filters, rows)
+                except KeyError as e:
+                    raise ServiceError(400, f"cannot filter on {e}")
+            if sort == 'rating':
+                rows = rank_rows(frame, rows)
+            ranked.append((frame, rows))
+
+        limit = min(_int_param(params, 'limit', self.max_results, minimum=0), self.max_results)
+        offset = _int_param(params, 'offset', 0, minimum=0)
+        shown = []
+        skip = offset
+        for frame, rows in ranked:
+            page = rows[skip:skip + limit - len(shown)]
+            skip = max(0, skip - len(rows))
+            shown.extend(recipe_payload(frame, row, full=False) for row in page)
+        results = {
+            'count': sum(int(len(rows)) for _, rows in ranked),
+            'offset': offset,
+            'results': shown,
+        }
+        if params.get('facets'):
+            fields = [field for field in params['facets'].split(',') if field in get_facet_index(self.df).fields()]
+            totals = {}
+            for frame, rows in ranked:
+                for field, buckets in get_facet_index(frame).facet_counts(rows, fields or None).items():
+                    if field in totals:
+                        buckets = [(label, total + count) for (label, total), (_, count) in zip(totals[field], buckets)]
+                    totals[field] = buckets
+            results['facets'] = totals
+        return results
+
+    def query(self, params, path_args):
+
+        query = params.get('q', '').strip()
+        if not query:
+            raise ServiceError(400, "missing 'q'")
+        try:
+            if params.get('explain'):
+                return {'plan': get_query_planner(self.df).explain(query).split('\n')}
+            parts = self._parts(lambda frame: run_query(frame, query))
+        except ValueError as e:
+            raise ServiceError(400, str(e))
+        return self._results(parts, params)
+
+    def complete(self, params, path_args):
+
+        text = params.get('q', '')
+        if not text.strip():
+            raise ServiceError(400, "missing 'q'")
+        field = params.get('field', 'name')
+        if field not in ('name', 'ingredients'):
+            raise ServiceError(400, "field must be 'name' or 'ingredients'")
+        limit = min(_int_param(params, 'limit', DEFAULT_LIMIT, minimum=0), self.max_results)
+        complete = complete_name if field == 'name' else complete_ingredients
+        return {'completions': [{'text': completion, 'count': count} for completion, count in complete(self.df, text, limit)]}
+
+    def filter(self, params, path_args):
+
+        return self._results(self._parts(lambda frame: np.arange(len(frame))), params)
+
+    def _search(self, params, find_rows, suggest):
+
+        query = params.get('q', '').strip()
+        if not query:
+            raise ServiceError(400, "missing 'q'")
+
+        parts = self._parts(lambda frame: find_rows(frame, query))
+        corrected = None
+        if not any(len(rows) for _, rows in parts) and params.get('fuzzy', '1') != '0':
+            suggestion = suggest(self.df, query)
+            if suggestion is not None:
+                parts = self._parts(lambda frame: find_rows(frame, suggestion))
+                corrected = suggestion if any(len(rows) for _, rows in parts) else None
+
+        results = self._results(parts, params)
+        if corrected is not None:
+            results['did_you_mean'] = corrected
+        return results
+
+    def search_name(self, params, path_args):
+
+        return self._search(params, find_name_rows, suggest_name_query)
+
+    def search_ingredients(self, params, path_args):
+
+        return self._search(params, find_ingredient_rows, suggest_ingredient_query)
+
+    def surprise(self, params, path_args):
+
+        # One snapshot for the whole draw, so pool rows and the live mask belong to the same frame.
+        if self.store is None:
+            df, live = self.df, None
+        else:
+            df, delta, live = self.store.snapshot()
+        sampler = get_sampler(df)
+        n = min(_int_param(params, 'n', 1, minimum=0), self.max_results)
+        constraints = {
+            'max_minutes': _float_param(params, 'max_minutes'),
+            'max_ingredients': _float_param(params, 'max_ingredients'),
+            'max_steps': _float_param(params, 'max_steps'),
+            'ingredients': params.get('ingredients') or None,
+        }
+        seed = _int_param(params, 'seed')
+        if seed is not None:
+            sampler = type(sampler)(df, seed=seed)
+        weights = params.get('weight') or default_weights(df)
+        if weights is not None and not (weights in df.columns and pd.api.types.is_numeric_dtype(df[weights])):
+            raise ServiceError(400, f"'weight' must be a numeric column, not '{weights}'")
+        if live is None:
+            rows = sampler.sample(n, weights=weights, **constraints)
+        else:
+            # Recipes added since the last merge join the draw once they are merged.
+            pool = sampler.pool(**constraints)
+            rows = sampler.sample(n, weights=weights, rows=pool[live[pool]])
+        return {'count': int(len(rows)), 'results': [recipe_payload(df, row) for row in rows]}
+
+    def recipe_by_id(self, params, path_args):
+
+        if len(path_args) not in (1, 2) or path_args[1:] not in ([], ['similar']):
+            raise ServiceError(404, "use /recipes/<id> or /recipes/<id>/similar")
+        try:
+            recipe_id = int(path_args[0])
+        except ValueError:
+            raise ServiceError(400, "recipe id must be an integer")
+        if self.store is None:
+            df, row = self.df, self.id_rows().get(recipe_id)
+        else:
+            df, row = self.store.locate_id(recipe_id)
+        if row is None:
+            raise ServiceError(404, f"no recipe with id {recipe_id}")
+        if len(path_args) == 1:
+            return recipe_payload(df, row)
+
+        if df is not self.df:
+            raise ServiceError(404, f"recipe {recipe_id} was just added; similar recipes follow after the next merge")
+        k = min(_int_param(params, 'k', DEFAULT_K, minimum=0), self.max_results)
+        rows, scores = similar_rows(df, row, k)
+        results = []
+        for match, score in zip(rows, scores):
+            payload = recipe_payload(self.df, match, full=False)
+            payload['similarity'] = round(float(score), 4)
+            results.append(payload)
+        return {'id': recipe_id, 'count': len(results), 'results': results}
+
+    def stats(self, params, path_args):
+
+        report = {
+            'recipes': len(self.df),
+            'uptime_s': round(time.time() - self.started, 1),
+            'latency': self.latency.summary(),
+            'query_cache': cache_stats(),
+        }
+        if self.store is not None:
+            report['store'] = self.store.status()
+        if profiler.enabled:
+            report['profile'] = profiler.snapshot()
+        return report
+
+    def health(self, params, path_args):
+
+        return {'status': 'ok'}
+
+    def route(self, path):
+
+        parts = [unquote(part) for part in path.strip('/').split('/') if part]
+        for length in (2, 1):
+            key = '/'.join(parts[:length])
+            if key in self.routes:
+                return key, self.routes[key], parts[length:]
+        raise ServiceError(404, f"unknown endpoint /{'/'.join(parts)}")
+
+    async def dispatch(self, method, target):
+
+        if method != 'GET':
+            raise ServiceError(405, "only GET is supported")
+
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        endpoint, handler, path_args = self.route(url.path)
+
+        start = time.perf_counter()
+        try:
+            if endpoint in ('stats', 'health'):
+                return handler(params, path_args)
+            # Searches are CPU bound; keep them off the event loop. They run in threads rather than
+            # processes because they share the in-memory frame and indexes (and the recipe store),
+            # which worker processes would each have to load. numpy and pandas release the GIL in
+            # their kernels and the interpreter switches threads every few milliseconds, so the loop
+            # keeps accepting connections and answering /health while a search runs; pure-Python
+            # parts of a search still slow other searches down, which more workers do not fix.
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self.run_handler, endpoint, handler, params, path_args)
+        finally:
+            self.latency.record(endpoint, time.perf_counter() - start)
+
+    def run_handler(self, endpoint, handler, params, path_args):
+
+        if self.store is not None:
+            self.store.refresh()
+        with profiler.query(endpoint):
+            return handler(params, path_args)
+
+    async def handle_connection(self, reader, writer):
+
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    await self.respond(writer, 400, {'error': 'malformed request line'}, keep_alive=False)
+                    break
+
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0) or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+                try:
+                    status, payload = 200, await self.dispatch(method, target)
+                except ServiceError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def respond(self, writer, status, payload, keep_alive):
+
+        body = json.dumps(payload, default=to_json_value).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_connection, unix_path, limit=MAX_HEADER_BYTES)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        self._servers.append(server)
+        return server
+
+    async def close(self):
+
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        self.executor.shutdown(wait=False)
+
+
+async def serve(df, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None, workers=DEFAULT_WORKERS, store=None):
+
+    service = RecipeService(df, workers, store=store)
+    await asyncio.get_running_loop().run_in_executor(service.executor, service.warm_up)
+    server = await service.start(host, port, unix_path)
+    where = unix_path or ':'.join(str(part) for part in server.sockets[0].getsockname()[:2])
+    print(f"Recipeasy service listening on {where} with {len(df)} recipes")
+    try:
+        await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Serve recipe search over local HTTP/JSON.")
+    parser.add_argument('--data', help="recipes CSV (defaults to the same locations as the interactive program)")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help="listen on a Unix socket instead of TCP")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--profile', action='store_true', help="collect per-stage timings and allocations, reported by /stats")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profiler.enable(trace_memory=True)
+
+    data_path = args.data or find_data_path()
+    if data_path is None:
+        print(DATASET_NOT_FOUND, file=sys.stderr)
+        return 1
+
+    # The store picks up recipes added or removed with `python src/recipe_store.py` while serving.
+    store = RecipeStore(data_path).start()
+    try:
+        asyncio.run(serve(store.base, args.host, args.port, args.unix, args.workers, store))
+    except KeyboardInterrupt:
+        print("\nService stopped.")
+    finally:
+        store.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
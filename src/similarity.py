@@ -0,0 +1,296 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import index_registry
+import recipe_cache
+from ingredient_index import get_ingredient_index
+from profiling import profiler
+
+SIMILARITY_DIR = 'similarity'
+META_FILE = 'meta.json'
+ARRAYS = ('weights', 'term_offsets', 'term_rows', 'inverted', 'row_offsets', 'row_terms', 'inverse_norms')
+DEFAULT_K = 10
+FEATURE_COLUMNS = ('ingredients', 'tags')
+# Tags like 'time-to-make' are on almost every recipe; they refine a match but should not decide it.
+COLUMN_WEIGHTS = {'ingredients': 1.0, 'tags': 0.5}
+# Terms on more than this share of recipes are scored through the rows that lack them.
+INVERT_FRACTION = 0.5
+EPSILON = 1e-9
+
+_worker_index = {}
+
+
+class SimilarityIndex:
+
+    def __init__(self, n_rows, weights, term_offsets, term_rows, inverted, row_offsets, row_terms, inverse_norms):
+
+        self.n_rows = n_rows
+        self.weights = weights
+        self.term_offsets = term_offsets
+        self.term_rows = term_rows
+        self.inverted = inverted
+        self.row_offsets = row_offsets
+        self.row_terms = row_terms
+        self.inverse_norms = inverse_norms
+        self.neighbours = None
+        self.neighbour_scores = None
+
+    @classmethod
+    def build(cls, df, columns=FEATURE_COLUMNS):
+
+        # Every recipe is a sparse TF-IDF vector over its ingredient and tag tokens. The
+        # ingredient indexes already hold those tokens term by term, so the term-major
+        # matrix is their postings and the row-major one is the same pairs re-sorted.
+        n_rows = len(df)
+        weights = []
+        offsets = [np.zeros(1, dtype=np.int64)]
+        postings = []
+        for column in columns:
+            if column not in df.columns:
+                continue
+            index = get_ingredient_index(df, column)
+            frequencies = np.diff(index.offsets)
+            weights.append(COLUMN_WEIGHTS.get(column, 1.0) * (np.log((1 + n_rows) / (1 + frequencies)) + 1))
+            offsets.append(index.offsets[1:] + offsets[-1][-1])
+            postings.append(index.postings)
+
+        weights = np.concatenate(weights) if weights else np.zeros(0)
+        term_offsets = np.concatenate(offsets)
+        postings = np.concatenate(postings).astype(np.int32) if postings else np.zeros(0, dtype=np.int32)
+        frequencies = np.diff(term_offsets)
+        terms = np.repeat(np.arange(len(weights), dtype=np.int32), frequencies)
+
+        order = np.argsort(postings, kind='stable')
+        row_terms = terms[order]
+        row_offsets = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(postings, minlength=n_rows), out=row_offsets[1:])
+
+        norms = np.sqrt(np.bincount(postings, weights=weights[terms] ** 2, minlength=n_rows))
+        inverse_norms = np.divide(1.0, norms, out=np.zeros(n_rows), where=norms > 0)
+
+        # A term on most recipes keeps the (shorter) list of recipes without it instead.
+        inverted = frequencies > n_rows * INVERT_FRACTION
+        kept = []
+        kept_offsets = np.zeros(len(weights) + 1, dtype=np.int64)
+        for term in range(len(weights)):
+            rows = postings[term_offsets[term]:term_offsets[term + 1]]
+            if inverted[term]:
+                rows = np.setdiff1d(np.arange(n_rows, dtype=np.int32), rows, assume_unique=True)
+            kept.append(rows)
+            kept_offsets[term + 1] = kept_offsets[term] + len(rows)
+        term_rows = np.concatenate(kept).astype(np.int32) if kept else np.zeros(0, dtype=np.int32)
+
+        return cls(n_rows, weights, kept_offsets, term_rows, inverted, row_offsets, row_terms, inverse_norms)
+
+    def terms(self, row):
+
+        return self.row_terms[self.row_offsets[row]:self.row_offsets[row + 1]]
+
+    def scores(self, row):
+
+        # Sparse dot product of one recipe against all others: only the postings of the
+        # recipe's own terms are touched, accumulated with a single bincount.
+        terms = self.terms(row)
+        contributions = self.weights[terms] ** 2
+        inverted = self.inverted[terms]
+        starts = self.term_offsets[terms]
+        lengths = self.term_offsets[terms + 1] - starts
+        rows = np.concatenate([self.term_rows[start:start + length] for start, length in zip(starts.tolist(), lengths.tolist())]) if len(terms) else np.zeros(0, dtype=np.int32)
+        values = np.repeat(np.where(inverted, -contributions, contributions), lengths)
+
+        dots = np.bincount(rows, weights=values, minlength=self.n_rows)
+        dots += contributions[inverted].sum()
+        scores = dots * self.inverse_norms * self.inverse_norms[row]
+        scores[row] = 0.0
+        return scores
+
+    def top_k(self, row, k=DEFAULT_K):
+
+        scores = self.scores(row)
+        k = min(k, self.n_rows - 1)
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        candidates = candidates[scores[candidates] > EPSILON]
+        order = np.lexsort((candidates, -scores[candidates]))
+        return candidates[order].astype(np.int64), scores[candidates[order]]
+
+    def similar(self, row, k=DEFAULT_K):
+
+        if self.neighbours is not None and k <= self.neighbours.shape[1]:
+            found = self.neighbours[row, :k]
+            keep = found >= 0
+            return found[keep].astype(np.int64), self.neighbour_scores[row, :k][keep].astype(np.float64)
+        with profiler.stage('similar') as stage:
+            rows, scores = self.top_k(row, k)
+            stage.add('terms', len(self.terms(row)))
+        return rows, scores
+
+    def top_k_block(self, start, stop, k=DEFAULT_K):
+
+        neighbours = np.full((stop - start, k), -1, dtype=np.int32)
+        scores = np.zeros((stop - start, k), dtype=np.float32)
+        for offset, row in enumerate(range(start, stop)):
+            rows, values = self.top_k(row, k)
+            neighbours[offset, :len(rows)] = rows
+            scores[offset, :len(rows)] = values
+        return neighbours, scores
+
+    def save(self, directory, meta=None):
+
+        tmp_directory = directory + '.tmp'
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        os.makedirs(tmp_directory)
+        try:
+            for name in ARRAYS:
+                np.save(os.path.join(tmp_directory, f'{name}.npy'), getattr(self, name))
+            if self.neighbours is not None:
+                np.save(os.path.join(tmp_directory, 'neighbours.npy'), self.neighbours)
+                np.save(os.path.join(tmp_directory, 'neighbour_scores.npy'), self.neighbour_scores)
+            with open(os.path.join(tmp_directory, META_FILE), 'w') as handle:
+                json.dump(dict(meta or {}, rows=self.n_rows), handle, indent=2)
+            shutil.rmtree(directory, ignore_errors=True)
+            os.replace(tmp_directory, directory)
+        finally:
+            shutil.rmtree(tmp_directory, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory, mmap_mode=None):
+
+        with open(os.path.join(directory, META_FILE)) as handle:
+            meta = json.load(handle)
+        arrays = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode) for name in ARRAYS]
+        index = cls(meta['rows'], *arrays)
+        if os.path.exists(os.path.join(directory, 'neighbours.npy')):
+            index.neighbours = np.load(os.path.join(directory, 'neighbours.npy'), mmap_mode=mmap_mode)
+            index.neighbour_scores = np.load(os.path.join(directory, 'neighbour_scores.npy'), mmap_mode=mmap_mode)
+        return index
+
+
+def read_meta(directory):
+
+    try:
+        with open(os.path.join(directory, META_FILE)) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def similarity_dir_for(path, cache_root=None):
+
+    return os.path.join(recipe_cache.cache_dir_for(path, cache_root), SIMILARITY_DIR)
+
+
+def source_digest(path, cache_root=None):
+
+    # The recipe cache already hashed the CSV; a missing or rebuilt cache means a rebuild here too.
+    meta = recipe_cache.read_meta(recipe_cache.cache_dir_for(path, cache_root))
+    return meta['source'].get('sha1') if meta else None
+
+
+def load_or_build(df, path, cache_root=None):
+
+    directory = similarity_dir_for(path, cache_root)
+    digest = source_digest(path, cache_root)
+    meta = read_meta(directory)
+    if digest is not None and meta is not None and meta.get('sha1') == digest and meta.get('rows') == len(df):
+        try:
+            with profiler.stage('similarity.load'):
+                return SimilarityIndex.load(directory)
+        except Exception as e:
+            print(f"Ignoring unreadable similarity index in {directory}: {e}")
+
+    with profiler.stage('similarity.build') as stage:
+        index = SimilarityIndex.build(df)
+        stage.add('rows', len(df))
+    if digest is not None:
+        try:
+            index.save(directory, {'sha1': digest})
+        except OSError as e:
+            print(f"Could not write similarity index to {directory}: {e}")
+    return index
+
+
+def get_similarity_index(df):
+
+    # Frames loaded from a CSV remember it, so the index can be persisted next to the recipe cache.
+    path = df.attrs.get('source_path')
+    if path is None:
+        return index_registry.get_or_build(df, 'similarity', SimilarityIndex.build)
+    return index_registry.get_or_build(df, 'similarity', lambda frame: load_or_build(frame, path))
+
+
+def similar_rows(df, row, k=DEFAULT_K):
+
+    return get_similarity_index(df).similar(row, k)
+
+
+def _init_worker(directory):
+
+    _worker_index['index'] = SimilarityIndex.load(directory, mmap_mode='r')
+
+
+def _run_block(task):
+
+    return _worker_index['index'].top_k_block(*task)
+
+
+def precompute_neighbours(index, directory, k=DEFAULT_K, workers=None, block_rows=2048):
+
+    # Workers memory-map the saved index, so nothing but row ranges and results crosses processes.
+    workers = workers or os.cpu_count() or 1
+    blocks = [(start, min(start + block_rows, index.n_rows), k) for start in range(0, index.n_rows, block_rows)]
+    if workers == 1 or len(blocks) == 1:
+        results = [index.top_k_block(*block) for block in blocks]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(directory,)) as pool:
+            results = list(pool.map(_run_block, blocks))
+
+    index.neighbours = np.concatenate([neighbours for neighbours, _ in results]) if results else np.zeros((0, k), dtype=np.int32)
+    index.neighbour_scores = np.concatenate([scores for _, scores in results]) if results else np.zeros((0, k), dtype=np.float32)
+    return index
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Build the similar-recipe index and precompute every recipe's nearest neighbours.")
+    parser.add_argument('--data', help="recipes CSV (defaults to the same locations as the interactive program)")
+    parser.add_argument('-k', type=int, default=DEFAULT_K, help="neighbours kept per recipe")
+    parser.add_argument('--workers', type=int, default=None, help="processes to use (default: all cores)")
+    args = parser.parse_args(argv)
+
+    # Imported here: Recipeasy imports this module for its "more like this" option.
+    from Recipeasy import DATASET_NOT_FOUND, find_data_path
+    data_path = args.data or find_data_path()
+    if data_path is None:
+        print(DATASET_NOT_FOUND, file=sys.stderr)
+        return 1
+
+    df = recipe_cache.load_with_cache(data_path)
+    index = load_or_build(df, data_path)
+    directory = similarity_dir_for(data_path)
+    digest = source_digest(data_path)
+    if digest is None:
+        directory = tempfile.mkdtemp(prefix='recipeasy-similarity-')
+        index.save(directory)
+
+    precompute_neighbours(index, directory, args.k, args.workers)
+    if digest is not None:
+        index.save(directory, {'sha1': digest})
+        print(f"Saved {args.k} neighbours for each of {index.n_rows} recipes to {directory}")
+    else:
+        shutil.rmtree(directory, ignore_errors=True)
+        print("Could not save neighbours: the recipe cache is not writable.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import argparse
+
+import pandas as pd
+
+from ingredient_index import parse_terms
+
+CHUNK_SIZE = 10000
+
+
+def iter_recipe_chunks(path, chunksize=CHUNK_SIZE, columns=None):
+
+    usecols = None if columns is None else (lambda column: column in columns)
+    with pd.read_csv(path, chunksize=chunksize, usecols=usecols) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def filter_by_name(chunk, query):
+
+    query = query.lower()
+    # A chunk whose names are all missing is read as float64, which has no .str accessor.
+    names = chunk['name'].astype(object)
+    return chunk[names.str.lower().str.contains(query, na=False, regex=False)]
+
+
+def filter_by_ingredients(chunk, terms):
+
+    if 'ingredients' not in chunk.columns:
+        return chunk.iloc[0:0]
+
+    matches = chunk
+    lowered = chunk['ingredients'].astype(str).str.lower()
+    for term in terms:
+        mask = lowered.str.contains(term, na=False, regex=False)
+        matches = matches[mask]
+        lowered = lowered[mask]
+    return matches
+
+
+def stream_search(path, name=None, ingredients=None, chunksize=CHUNK_SIZE, columns=None, limit=None):
+
+    terms = parse_terms(ingredients) if ingredients else []
+    if ingredients is not None and not terms:
+        return
+
+    found = 0
+    for chunk in iter_recipe_chunks(path, chunksize, columns):
+        matches = chunk
+        if name:
+            matches = filter_by_name(matches, name)
+        if terms and len(matches):
+            matches = filter_by_ingredients(matches, terms)
+
+        if len(matches) == 0:
+            continue
+
+        if limit is not None and found + len(matches) >= limit:
+            yield matches.iloc[:limit - found]
+            return
+
+        found += len(matches)
+        yield matches
+
+
+def stream_search_by_name(path, query, chunksize=CHUNK_SIZE, columns=None, limit=None):
+
+    return stream_search(path, name=query, chunksize=chunksize, columns=columns, limit=limit)
+
+
+def stream_search_by_ingredient(path, query, chunksize=CHUNK_SIZE, columns=None, limit=None):
+
+    return stream_search(path, ingredients=query, chunksize=chunksize, columns=columns, limit=limit)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search RAW_recipes.csv chunk by chunk without loading it into memory.")
+    parser.add_argument('path', nargs='?', default='./data/RAW_recipes.csv')
+    parser.add_argument('--name', help="recipe name substring")
+    parser.add_argument('--ingredients', help="comma separated ingredients that must all appear")
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--limit', type=int)
+    args = parser.parse_args()
+
+    if not args.name and not args.ingredients:
+        parser.error("give --name and/or --ingredients")
+
+    total = 0
+    for matches in stream_search(args.path, args.name, args.ingredients, args.chunksize, ('name', 'id', 'ingredients'), args.limit):
+        for recipe_id, recipe_name in zip(matches['id'], matches['name']):
+            print(f"{recipe_id}\t{recipe_name}")
+        total += len(matches)
+    print(f"\n{total} matching recipes")
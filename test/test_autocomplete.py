@@ -0,0 +1,72 @@
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from autocomplete import KEY_LENGTH, Completer, complete_ingredients, complete_name
+from Recipeasy import main
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Chocolate Chip Cookies', 'Chicken Soup', 'Cheesy Chicken Bake'],
+        'id': [101, 102, 103, 104],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'chocolate chips', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']",
+            "['chicken', 'cheddar cheese', 'garlic powder', 'onion']"
+        ]
+    })
+
+class TestCompleter:
+
+    def test_ranks_by_frequency_then_alphabet(self):
+        completer = Completer({'cheese': 5, 'chicken': 9, 'chili': 5, 'carrot': 20})
+
+        assert completer.complete('ch') == [('chicken', 9), ('cheese', 5), ('chili', 5)]
+        assert completer.complete('ch', limit=1) == [('chicken', 9)]
+        assert completer.complete('x') == []
+
+    def test_word_starts_match_inside_terms(self):
+        completer = Completer({'chocolate chips': 3, 'potato chips': 1, 'chives': 2}, word_starts=True)
+
+        assert completer.complete('chi') == [('chocolate chips', 3), ('chives', 2), ('potato chips', 1)]
+
+    def test_long_prefixes_are_checked_in_full(self):
+        long_term = 'a' * KEY_LENGTH + 'bc'
+        completer = Completer({long_term: 1, 'a' * KEY_LENGTH + 'xy': 2})
+
+        assert completer.complete('a' * KEY_LENGTH + 'b') == [(long_term, 1)]
+
+    def test_memory_report(self):
+        completer = Completer({'salt': 3, 'sugar': 2})
+
+        assert set(completer.memory_bytes()) == {'keys', 'targets', 'counts', 'terms'}
+        assert all(size > 0 for size in completer.memory_bytes().values())
+
+class TestCompleteQueries:
+
+    def test_complete_name_keeps_earlier_words(self, sample_dataframe):
+        assert complete_name(sample_dataframe, 'Cheesy Chi') == [('cheesy chicken', 2), ('cheesy chip', 1)]
+        assert complete_name(sample_dataframe, 'choc')[0] == ('chocolate', 2)
+
+    def test_complete_last_ingredient(self, sample_dataframe):
+        assert complete_ingredients(sample_dataframe, 'onion, ch') == [('onion, chicken', 2), ('onion, cheddar cheese', 1), ('onion, chocolate', 1), ('onion, chocolate chips', 1)]
+        assert complete_ingredients(sample_dataframe, 'pow') == [('garlic powder', 1)]
+
+    @patch('builtins.input')
+    @patch('Recipeasy.load_recipe_data')
+    def test_question_mark_lists_suggestions(self, mock_load, mock_input, sample_dataframe, capsys):
+        mock_load.return_value = sample_dataframe
+        mock_input.side_effect = ['2', '?chee', 'cheesy', '4']
+
+        main()
+
+        captured = capsys.readouterr()
+        assert "Suggestions for 'chee': cheesy (1)" in captured.out
+        assert "Found 1 recipes with name matching 'cheesy'!" in captured.out
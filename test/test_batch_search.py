@@ -0,0 +1,98 @@
+import json
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from batch_search import BatchSearcher, batch_search, format_result, main, read_queries
+from Recipeasy import search_recipes_by_ingredient, search_recipes_by_name
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup', 'Garlic Chicken'],
+        'id': [101, 102, 103, 104],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']",
+            "['chicken', 'garlic', 'butter']"
+        ]
+    })
+
+class TestReadQueries:
+    
+    def test_prefixes_and_json(self):
+        lines = ['name: cake', 'Ingredients: chicken, garlic', 'butter', '', '# comment', '{"type": "name", "query": "soup", "id": "q9"}']
+        queries = list(read_queries(lines))
+        
+        assert [query['type'] for query in queries] == ['name', 'ingredients', 'ingredients', 'name']
+        assert [query['query'] for query in queries] == ['cake', 'chicken, garlic', 'butter', 'soup']
+        assert [query['id'] for query in queries] == [1, 2, 3, 'q9']
+    
+    def test_unknown_type(self):
+        with pytest.raises(ValueError):
+            list(read_queries(['{"type": "tag", "query": "easy"}']))
+
+class TestBatchSearch:
+    
+    def test_results_match_single_queries(self, sample_dataframe):
+        queries = [('ingredients', 'flour, sugar'), ('name', 'CHICKEN'), ('ingredients', 'butter'), ('ingredients', 'bacon'), ('ingredients', ' , ')]
+        results = batch_search(sample_dataframe, queries)
+        
+        for (kind, text), rows in zip(queries, results):
+            if kind == 'name':
+                expected = search_recipes_by_name(sample_dataframe, text)
+            else:
+                expected = search_recipes_by_ingredient(sample_dataframe, text)
+            assert list(sample_dataframe.index[rows]) == list(expected.index)
+    
+    def test_results_ranked_like_single_queries(self, sample_dataframe):
+        sample_dataframe['rating_score'] = [3.0, 4.5, 2.0, 4.8]
+        queries = [('name', 'chicken'), ('ingredients', 'flour'), ('ingredients', 'butter')]
+        results = batch_search(sample_dataframe, queries)
+        
+        assert list(sample_dataframe['name'].iloc[results[0]]) == list(search_recipes_by_name(sample_dataframe, 'chicken')['name']) == ['Garlic Chicken', 'Chicken Soup']
+        assert list(results[1]) == list(search_recipes_by_ingredient(sample_dataframe, 'flour').index) == [1, 0]
+        assert list(results[2]) == [3, 1]
+    
+    def test_shared_terms_are_looked_up_once(self, sample_dataframe):
+        searcher = BatchSearcher(sample_dataframe)
+        queries = [{'type': 'ingredients', 'query': q} for q in ['butter, flour', 'flour', 'sugar, flour', 'Flour , butter']]
+        searcher.run(queries)
+        
+        assert searcher.term_cache.misses == 3
+    
+    def test_iter_results_batches(self, sample_dataframe):
+        searcher = BatchSearcher(sample_dataframe)
+        queries = [{'type': 'name', 'query': q} for q in ['cake', 'soup', 'chicken']]
+        
+        results = list(searcher.iter_results(queries, batch_size=2))
+        assert [len(rows) for _, rows in results] == [1, 1, 2]
+    
+    def test_format_result_uses_recipe_ids(self, sample_dataframe):
+        result = format_result(sample_dataframe, {'id': 1, 'type': 'name', 'query': 'c'}, [0, 2, 3], limit=2)
+        assert result == {'id': 1, 'type': 'name', 'query': 'c', 'count': 3, 'recipe_ids': [101, 103]}
+
+class TestBatchCli:
+    
+    def test_writes_json_lines(self, sample_dataframe, tmp_path):
+        data_path = tmp_path / 'RAW_recipes.csv'
+        sample_dataframe.to_csv(data_path, index=False)
+        queries_path = tmp_path / 'queries.txt'
+        queries_path.write_text('chicken\nname: cookies\n')
+        output_path = tmp_path / 'results.jsonl'
+        
+        assert main([str(queries_path), '--data', str(data_path), '--output', str(output_path)]) == 0
+        
+        lines = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert [line['recipe_ids'] for line in lines] == [[103, 104], [102]]
+    
+    @patch('batch_search.find_data_path', return_value=None)
+    def test_missing_dataset(self, mock_find, tmp_path, capsys):
+        assert main([str(tmp_path / 'queries.txt')]) == 1
+        assert 'Dataset not found' in capsys.readouterr().err
@@ -0,0 +1,132 @@
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from facets import FacetIndex, filter_rows, get_facet_index, parse_filters
+from query_cache import search_cache
+from Recipeasy import main
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup', 'Quick Salad', 'Slow Roast'],
+        'minutes': [45, 30, 60, 10, None],
+        'n_steps': [10, 8, 12, 3, 20],
+        'n_ingredients': [4, 4, 4, 6, 9],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']",
+            "['lettuce', 'tomato', 'cucumber', 'onion', 'olive oil', 'salt']",
+            "['beef', 'potatoes', 'carrots', 'onion', 'garlic', 'thyme', 'salt', 'pepper', 'stock']"
+        ],
+        'nutrition': [
+            '[450.0, 30.0, 80.0, 5.0, 10.0, 40.0, 20.0]',
+            '[300.0, 20.0, 60.0, 4.0, 6.0, 30.0, 15.0]',
+            '[150.0, 5.0, 2.0, 40.0, 30.0, 3.0, 4.0]',
+            '[90.0, 8.0, 4.0, 10.0, 4.0, 2.0, 3.0]',
+            None
+        ]
+    })
+
+@pytest.fixture(autouse=True)
+def fresh_search_cache():
+    search_cache.clear()
+    yield
+    search_cache.clear()
+
+class TestParseFilters:
+    
+    def test_operators_and_aliases(self):
+        filters = parse_filters('time<30, calories <= 500, steps>5, protein=20-50, n_ingredients=4')
+        assert filters['minutes'][1] < 30 and filters['minutes'][1] > 29.999
+        assert filters['calories'] == (None, 500.0)
+        assert filters['n_steps'][0] > 5 and filters['n_steps'][1] is None
+        assert filters['protein'] == (20.0, 50.0)
+        assert filters['n_ingredients'] == (4.0, 4.0)
+    
+    def test_combines_bounds_on_one_field(self):
+        assert parse_filters('minutes>=10, minutes<=45') == {'minutes': (10.0, 45.0)}
+    
+    def test_rejects_bad_input(self):
+        with pytest.raises(ValueError, match='Unknown filter'):
+            parse_filters('spiciness<3')
+        with pytest.raises(ValueError, match='Could not read'):
+            parse_filters('minutes around 30')
+
+class TestFacetIndex:
+    
+    def test_ranges_by_binary_search(self, sample_dataframe):
+        facets = FacetIndex(sample_dataframe)
+        assert list(facets.rows_in_range('minutes', high=45)) == [0, 1, 3]
+        assert list(facets.rows_in_range('minutes', low=45)) == [0, 2]
+        assert facets.count_in_range('minutes') == 4
+        assert list(facets.rows_in_range('calories', 100, 400)) == [1, 2]
+    
+    def test_missing_values_never_match(self, sample_dataframe):
+        facets = FacetIndex(sample_dataframe)
+        assert 4 not in facets.rows_in_range('minutes', low=0)
+        assert 4 not in facets.rows_in_range('sugar')
+    
+    def test_filter_matches_pandas(self, sample_dataframe):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'minutes': rng.integers(0, 300, size=2000).astype(float),
+            'n_steps': rng.integers(1, 30, size=2000),
+            'n_ingredients': rng.integers(1, 20, size=2000),
+        })
+        df.loc[rng.choice(2000, 100), 'minutes'] = np.nan
+        facets = FacetIndex(df)
+        for _ in range(30):
+            low, high = sorted(rng.integers(0, 300, size=2))
+            steps = int(rng.integers(1, 30))
+            expected = np.flatnonzero(((df['minutes'] >= low) & (df['minutes'] <= high) & (df['n_steps'] < steps)).to_numpy())
+            got = facets.filter({'minutes': (low, high), 'n_steps': (None, steps - 0.5)})
+            assert np.array_equal(got, expected)
+    
+    def test_filter_composes_with_search_rows(self, sample_dataframe):
+        onion_rows = np.array([2, 3, 4])
+        assert list(filter_rows(sample_dataframe, 'minutes<=60', onion_rows)) == [2, 3]
+        assert list(filter_rows(sample_dataframe, {}, onion_rows)) == [2, 3, 4]
+        assert len(filter_rows(sample_dataframe, {})) == 5
+    
+    def test_histogram_counts_current_rows(self, sample_dataframe):
+        facets = get_facet_index(sample_dataframe)
+        assert dict(facets.histogram('minutes'))['30-60'] == 2
+        assert dict(facets.histogram('minutes', np.array([1, 3]))) == {
+            '0-15': 1, '15-30': 0, '30-60': 1, '60-120': 0, '120-240': 0, '240+': 0
+        }
+        assert sum(count for _, count in facets.histogram('calories')) == 4
+        assert set(facets.facet_counts(fields=['n_steps'])) == {'n_steps'}
+
+class TestFilterMenu:
+    
+    @patch('Recipeasy.load_recipe_data')
+    @patch('builtins.input')
+    def test_filter_with_ingredients(self, mock_input, mock_load, sample_dataframe, capsys):
+        mock_load.return_value = sample_dataframe
+        mock_input.side_effect = ['6', 'minutes<=60, calories<200', 'onion', '4']
+        
+        main()
+        
+        captured = capsys.readouterr()
+        assert "Found 2 recipes matching your filters!" in captured.out
+        assert "Minutes: 0-15 (1) | 60-120 (1)" in captured.out
+    
+    @patch('Recipeasy.load_recipe_data')
+    @patch('builtins.input')
+    def test_filter_errors(self, mock_input, mock_load, sample_dataframe, capsys):
+        mock_load.return_value = sample_dataframe
+        mock_input.side_effect = ['6', 'spiciness<3', '6', 'minutes<1', '', '4']
+        
+        main()
+        
+        captured = capsys.readouterr()
+        assert "Unknown filter 'spiciness'" in captured.out
+        assert "No recipes match those filters" in captured.out
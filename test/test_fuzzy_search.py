@@ -0,0 +1,124 @@
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from collections import Counter
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from fuzzy_search import (
+    SpellIndex, deletes, edit_distance, suggest_ingredient_query, suggest_name_query, words_in
+)
+from query_cache import search_cache
+from Recipeasy import find_ingredient_rows, find_name_rows, main
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup', "Grandma's Lasagna", 'Chicken Pie'],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']",
+            "['lasagna noodles', 'mozzarella cheese', 'ground beef']",
+            "['chicken', 'pie crust', 'peas']"
+        ]
+    })
+
+@pytest.fixture(autouse=True)
+def fresh_search_cache():
+    search_cache.clear()
+    yield
+    search_cache.clear()
+
+class TestSpellIndex:
+    
+    def test_deletes(self):
+        assert deletes('abc', 1) == {'abc', 'bc', 'ac', 'ab'}
+        assert 'a' in deletes('abc', 2)
+    
+    def test_edit_distance(self):
+        assert edit_distance('chiken', 'chicken', 2) == 1
+        assert edit_distance('lasagne', 'lasagna', 2) == 1
+        assert edit_distance('teh', 'the', 2) == 1
+        assert edit_distance('soup', 'chocolate', 2) == 3
+    
+    def test_words_keep_apostrophes(self):
+        assert words_in("Grandma's Best-Ever Pie") == ["grandma's", 'best', 'ever', 'pie']
+    
+    def test_lookup_ranks_by_distance_then_popularity(self):
+        speller = SpellIndex(Counter({'chicken': 10, 'chickpea': 50, 'thicken': 3, 'cheese': 7}))
+        found = speller.lookup('chicen')
+        assert found[0] == ('chicken', 1, 10)
+        assert [word for word, distance, count in found if distance == 2] == ['thicken']
+        assert SpellIndex(Counter({'pear': 1, 'peas': 9})).lookup('pea', max_distance=1)[0][0] == 'peas'
+    
+    def test_short_and_unknown_words(self):
+        speller = SpellIndex(Counter({'pie': 1, 'chicken': 1}))
+        assert speller.correct('pi') == 'pi'
+        assert speller.correct('pie') == 'pie'
+        assert speller.correct('zzzzzz') is None
+
+class TestSuggestions:
+    
+    def test_name_suggestion(self, sample_dataframe):
+        assert suggest_name_query(sample_dataframe, 'chiken') == 'chicken'
+        assert suggest_name_query(sample_dataframe, 'grandmas lasagne') == "grandma's lasagna"
+        assert suggest_name_query(sample_dataframe, 'chicken') is None
+        assert suggest_name_query(sample_dataframe, 'pizza') is None
+    
+    def test_ingredient_suggestion(self, sample_dataframe):
+        assert suggest_ingredient_query(sample_dataframe, 'chiken, mozarella') == 'chicken, mozzarella'
+        assert suggest_ingredient_query(sample_dataframe, 'flour') is None
+        assert suggest_ingredient_query(pd.DataFrame({'name': ['x']}), 'flour') is None
+
+    def test_separators_are_kept(self):
+        df = pd.DataFrame({
+            'name': ['Mac & Cheese', 'Pancakes'],
+            'ingredients': ["['all-purpose flour', 'half-and-half', 'cheddar']", "['all-purpose flour', 'milk']"]
+        })
+        
+        assert suggest_name_query(df, 'mac & chese') == 'mac & cheese'
+        assert list(find_name_rows(df, suggest_name_query(df, 'mac & chese'))) == [0]
+        assert suggest_ingredient_query(df, 'all-purpse flour, half-and-haf') == 'all-purpose flour, half-and-half'
+        assert list(find_ingredient_rows(df, suggest_ingredient_query(df, 'all-purpse flour, half-and-haf'))) == [0]
+
+class TestDidYouMean:
+    
+    @patch('Recipeasy.load_recipe_data')
+    @patch('builtins.input')
+    def test_name_typo(self, mock_input, mock_load, sample_dataframe, capsys):
+        mock_load.return_value = sample_dataframe
+        mock_input.side_effect = ['2', 'chiken', '4']
+        
+        main()
+        
+        captured = capsys.readouterr()
+        assert "Did you mean 'chicken'?" in captured.out
+        assert "Found 2 recipes with name matching 'chicken'!" in captured.out
+    
+    @patch('Recipeasy.load_recipe_data')
+    @patch('builtins.input')
+    def test_ingredient_typo(self, mock_input, mock_load, sample_dataframe, capsys):
+        mock_load.return_value = sample_dataframe
+        mock_input.side_effect = ['3', 'chocolote', '4']
+        
+        main()
+        
+        captured = capsys.readouterr()
+        assert "Did you mean 'chocolate'?" in captured.out
+        assert "Chocolate Cake" in captured.out
+    
+    @patch('Recipeasy.load_recipe_data')
+    @patch('builtins.input')
+    def test_no_suggestion(self, mock_input, mock_load, sample_dataframe, capsys):
+        mock_load.return_value = sample_dataframe
+        mock_input.side_effect = ['2', 'pizza', '4']
+        
+        main()
+        
+        captured = capsys.readouterr()
+        assert "Did you mean" not in captured.out
+        assert "No recipes found with name matching 'pizza'" in captured.out
@@ -0,0 +1,87 @@
+import sys
+import pytest
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from ingredient_index import IngredientIndex, get_ingredient_index, parse_terms
+from Recipeasy import search_recipes_by_ingredient
+
+def legacy_search(df, query):
+    ingredients = [ing.strip().lower() for ing in query.split(',') if ing.strip()]
+    matches = df
+    for ingredient in ingredients:
+        matches = matches[matches['ingredients'].astype(str).str.lower().str.contains(ingredient, na=False, regex=False)]
+    return matches
+
+@pytest.fixture
+def tricky_dataframe():
+    return pd.DataFrame({
+        'name': ['Cake', 'Cookies', 'Soup', 'Mystery', 'Fudge', 'Plain', 'Weird'],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['Flour', 'brown sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']",
+            None,
+            "[\"hershey's chocolate\", 'evaporated milk', 'sugar']",
+            'flour and water',
+            "['salt, kosher', 'pepper\\\\n']"
+        ]
+    }, index=[10, 11, 12, 13, 14, 15, 16])
+
+QUERIES = [
+    'flour', 'sugar', 'SUGAR', 'flour, sugar', 'sugar, flour', 'choc', "hershey's",
+    "', '", 'r and w', 'nan', 'an', 'salt, kosher', 'kosher', 'pepper', '\\\\n', '[',
+    'milk, sugar, chocolate', 'bacon', 'o', 'brown sugar', 'sugar, bacon'
+]
+
+class TestParseTerms:
+    
+    def test_parse_terms_strips_and_lowercases(self):
+        assert parse_terms(' Chicken , GARLIC,, ') == ['chicken', 'garlic']
+
+class TestIngredientIndex:
+    
+    def test_vocabulary_tokens(self, tricky_dataframe):
+        index = IngredientIndex(tricky_dataframe['ingredients'])
+        assert 'brown sugar' in index.token_ids
+        assert "hershey" in index.token_ids
+        assert ', ' not in index.token_ids
+    
+    def test_exact_match(self, tricky_dataframe):
+        index = IngredientIndex(tricky_dataframe['ingredients'])
+        assert list(index.search(['sugar'], match='exact')) == [0, 4]
+        assert list(index.search(['sug'], match='exact')) == []
+    
+    def test_substring_match(self, tricky_dataframe):
+        index = IngredientIndex(tricky_dataframe['ingredients'])
+        assert list(index.search(['sug'])) == [0, 1, 4]
+    
+    def test_document_frequency(self, tricky_dataframe):
+        index = IngredientIndex(tricky_dataframe['ingredients'])
+        assert index.document_frequency(index.token_ids['sugar']) == 2
+    
+    @pytest.mark.parametrize('query', QUERIES)
+    def test_matches_legacy_scan(self, tricky_dataframe, query):
+        expected = legacy_search(tricky_dataframe, query)
+        result = search_recipes_by_ingredient(tricky_dataframe, query)
+        pd.testing.assert_frame_equal(result, expected)
+    
+    def test_matches_legacy_scan_on_random_queries(self):
+        rng = np.random.default_rng(7)
+        vocabulary = ['salt', 'sea salt', 'butter', 'unsalted butter', 'eggs', 'egg whites', 'milk', 'garlic', 'garlic powder']
+        df = pd.DataFrame({
+            'name': [f'recipe {i}' for i in range(300)],
+            'ingredients': [repr(list(rng.choice(vocabulary, size=rng.integers(1, 5), replace=False))) for _ in range(300)]
+        })
+        words = ['salt', 'butter', 'egg', 'garlic', 'milk', 'unsalted', 'powder', 'lt', 'sea s']
+        for _ in range(50):
+            query = ', '.join(rng.choice(words, size=rng.integers(1, 4)))
+            pd.testing.assert_frame_equal(search_recipes_by_ingredient(df, query), legacy_search(df, query))
+    
+    def test_index_is_built_once_per_dataframe(self, tricky_dataframe):
+        assert get_ingredient_index(tricky_dataframe) is get_ingredient_index(tricky_dataframe)
+        assert get_ingredient_index(tricky_dataframe) is not get_ingredient_index(tricky_dataframe.copy())
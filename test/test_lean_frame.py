@@ -0,0 +1,116 @@
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+import index_registry
+from lean_frame import (
+    InternedIngredients,
+    SEARCH_COLUMNS,
+    downcast_numeric,
+    get_interned_ingredients,
+    memory_report,
+    optimize_frame,
+)
+from Recipeasy import load_recipe_data, search_recipes_by_ingredient, search_recipes_by_name
+
+@pytest.fixture
+def raw_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup', 'Chocolate Cake'],
+        'id': [137739, 31490, 112140, 59389],
+        'minutes': [45, 30, 60, 2147483647],
+        'contributor_id': [47892, 26278, 196586, 68585],
+        'n_steps': [10, 8, 12, 3],
+        'submitted': ['2005-09-16', '2005-09-16', '2005-09-16', '2002-06-17'],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate']",
+            "['flour', 'sugar', 'vanilla']",
+            "['chicken', 'carrots']",
+            "['cocoa', 'sugar']"
+        ],
+        'description': ['a', 'b', 'c', None],
+    })
+
+class TestOptimizeFrame:
+    
+    def test_downcast_numeric(self):
+        assert downcast_numeric(pd.Series([1, 200])).dtype == np.uint8
+        assert downcast_numeric(pd.Series([-1, 200])).dtype == np.int16
+        assert downcast_numeric(pd.Series([1.5, 2.5])).dtype == np.float32
+    
+    def test_numeric_columns_downcast(self, raw_dataframe):
+        lean = optimize_frame(raw_dataframe)
+        
+        assert lean['n_steps'].dtype == np.uint8
+        assert lean['minutes'].dtype == np.uint32
+        assert lean['minutes'].iloc[3] == 2147483647
+    
+    def test_repeated_text_becomes_categorical(self, raw_dataframe):
+        lean = optimize_frame(raw_dataframe)
+        assert isinstance(lean['submitted'].dtype, pd.CategoricalDtype)
+    
+    def test_drop_and_select_columns(self, raw_dataframe):
+        lean = optimize_frame(raw_dataframe, columns=SEARCH_COLUMNS, drop=('n_steps',))
+        assert list(lean.columns) == ['name', 'id', 'minutes', 'ingredients']
+    
+    def test_uses_less_memory(self, raw_dataframe):
+        before = sum(memory_report(raw_dataframe).values())
+        after = sum(memory_report(optimize_frame(raw_dataframe)).values())
+        assert after < before
+    
+    def test_searches_work_on_lean_frame(self, raw_dataframe):
+        lean = optimize_frame(raw_dataframe)
+        
+        assert list(search_recipes_by_name(lean, 'chocolate')['id']) == [137739, 59389]
+        assert list(search_recipes_by_ingredient(lean, 'sugar, flour')['id']) == [137739, 31490]
+
+class TestInternedIngredients:
+    
+    def test_round_trip(self, raw_dataframe):
+        interned = InternedIngredients.from_series(raw_dataframe['ingredients'])
+        
+        assert len(interned) == 4
+        assert interned.row(0) == ['flour', 'sugar', 'chocolate']
+        assert len(interned.vocabulary) == 7
+        assert interned.row_codes(1)[0] == interned.code_of['flour']
+    
+    def test_rows_with(self, raw_dataframe):
+        interned = get_interned_ingredients(raw_dataframe)
+        assert list(interned.rows_with('sugar')) == [0, 1, 3]
+        assert list(interned.rows_with('bacon')) == []
+    
+    def test_unparseable_rows(self):
+        interned = InternedIngredients.from_series(pd.Series(['flour and water', None]))
+        assert interned.row(0) == ['flour and water']
+        assert interned.row(1) == []
+
+class TestLeanLoad:
+    
+    @patch('os.path.exists')
+    @patch('pandas.read_csv')
+    def test_load_recipe_data_lean(self, mock_read_csv, mock_exists, raw_dataframe):
+        mock_exists.return_value = True
+        mock_read_csv.return_value = raw_dataframe
+        
+        df = load_recipe_data(lean=True, columns=SEARCH_COLUMNS)
+        
+        assert 'description' not in df.columns
+        assert df['n_steps'].dtype == np.uint8
+    
+    @patch('os.path.exists')
+    @patch('pandas.read_csv')
+    def test_lean_load_interns_ingredients(self, mock_read_csv, mock_exists, raw_dataframe):
+        mock_exists.return_value = True
+        mock_read_csv.return_value = raw_dataframe
+        
+        df = load_recipe_data(use_cache=False, lean=True, drop=('description', 'submitted'))
+        
+        assert 'description' not in df.columns and 'submitted' not in df.columns
+        assert index_registry.is_built(df, ('interned', 'ingredients'))
+        assert list(get_interned_ingredients(df).rows_with('sugar')) == [0, 1, 3]
@@ -0,0 +1,61 @@
+import sys
+import pytest
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from name_index import NameIndex, get_name_index
+from Recipeasy import search_recipes_by_name
+
+def legacy_search(df, query):
+    query = query.lower()
+    return df[df['name'].str.lower().str.contains(query, na=False)]
+
+@pytest.fixture
+def names_dataframe():
+    return pd.DataFrame({
+        'name': [
+            'Chocolate Cake', 'chocolate chip cookies', None, 'Crème Brûlée', 'Mac and Cheese',
+            'Cheesecake (No Bake)', 'C++ Cookies', 'ab', 'Cake', 'cocoa cake cake'
+        ],
+        'minutes': range(10)
+    }, index=range(100, 110))
+
+LITERAL_QUERIES = ['chocolate', 'CAKE', 'cake', 'ca', 'c', 'crème', 'brûlée', 'and cheese', 'ab', 'cheese', 'ke ca', 'pizza', ' ']
+
+class TestNameIndex:
+    
+    @pytest.mark.parametrize('query', LITERAL_QUERIES)
+    def test_matches_legacy_search(self, names_dataframe, query):
+        pd.testing.assert_frame_equal(search_recipes_by_name(names_dataframe, query), legacy_search(names_dataframe, query))
+    
+    def test_regex_characters_are_literal(self, names_dataframe):
+        assert list(search_recipes_by_name(names_dataframe, '(no bake)')['name']) == ['Cheesecake (No Bake)']
+        assert list(search_recipes_by_name(names_dataframe, 'c++')['name']) == ['C++ Cookies']
+        assert len(search_recipes_by_name(names_dataframe, '(')) == 1
+    
+    def test_trigram_candidates_narrow_search(self, names_dataframe):
+        index = NameIndex(names_dataframe['name'])
+        candidates = index.candidates('cheese')
+        assert set(candidates) == {4, 5}
+    
+    def test_trigrams_do_not_span_names(self):
+        index = NameIndex(pd.Series(['abc', 'def']))
+        assert len(index.search('cde')) == 0
+        assert len(index.candidates('cde')) == 0
+    
+    def test_matches_legacy_search_on_random_queries(self):
+        rng = np.random.default_rng(3)
+        words = np.array(['easy', 'chicken', 'soup', 'spicy', 'beef', 'stew', 'best', 'cake'])
+        df = pd.DataFrame({'name': [' '.join(rng.choice(words, size=3)) for _ in range(400)]})
+        for _ in range(60):
+            name = df['name'].iloc[rng.integers(len(df))]
+            start = rng.integers(len(name))
+            query = name[start:start + rng.integers(1, 9)]
+            pd.testing.assert_frame_equal(search_recipes_by_name(df, query), legacy_search(df, query))
+    
+    def test_index_is_built_once_per_dataframe(self, names_dataframe):
+        assert get_name_index(names_dataframe) is get_name_index(names_dataframe)
@@ -0,0 +1,93 @@
+import sys
+import pytest
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from pantry import get_pantry_index, matching_item_ids, rank_by_pantry, score_pantry, top_k_rows
+
+@pytest.fixture
+def pantry_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup', 'Garlic Chicken', 'Plain Rice'],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'salt']",
+            "['chicken breasts', 'garlic', 'butter']",
+            "['rice', 'water']"
+        ]
+    })
+
+def brute_force(df, pantry):
+    scores = []
+    for row, value in enumerate(df['ingredients']):
+        items = set(eval(value))
+        have = sum(1 for item in items if any(term in item for term in pantry) or item in ('salt', 'water'))
+        matched = sum(1 for item in items if any(term in item for term in pantry))
+        if matched:
+            scores.append((-have / len(items), len(items) - have, row))
+    return [row for _, _, row in sorted(scores)]
+
+class TestPantryScoring:
+    
+    def test_scores(self, pantry_dataframe):
+        index = get_pantry_index(pantry_dataframe)
+        pantry_ids = matching_item_ids(index, ['chicken', 'butter'])
+        matched, have, total, coverage = score_pantry(index, pantry_ids)
+        
+        assert list(matched) == [0, 1, 1, 2, 0]
+        assert list(total) == [4, 4, 4, 3, 2]
+        assert coverage[3] == pytest.approx(2 / 3)
+    
+    def test_top_k_partial_sort(self):
+        matched = np.array([1, 1, 1, 0, 1])
+        have = np.array([1, 2, 1, 0, 3])
+        total = np.array([2, 2, 4, 1, 3])
+        coverage = have / total
+        
+        assert list(top_k_rows(matched, have, total, coverage, 2)) == [4, 1]
+        assert list(top_k_rows(matched, have, total, coverage, 10)) == [4, 1, 0, 2]
+
+class TestRankByPantry:
+    
+    def test_ranking(self, pantry_dataframe):
+        ranked = rank_by_pantry(pantry_dataframe, 'chicken, garlic, butter')
+        
+        assert list(ranked['name']) == ['Garlic Chicken', 'Chicken Soup', 'Vanilla Cookies']
+        assert list(ranked['pantry_missing']) == [0, 2, 3]
+        assert ranked['missing_ingredients'].iloc[1] == ['carrots', 'celery']
+    
+    def test_staples_count_as_available(self, pantry_dataframe):
+        ranked = rank_by_pantry(pantry_dataframe, ['rice'])
+        assert ranked['pantry_coverage'].iloc[0] == 1.0
+    
+    def test_staples_alone_do_not_match(self, pantry_dataframe):
+        assert len(rank_by_pantry(pantry_dataframe, 'pizza dough')) == 0
+    
+    def test_matches_brute_force(self, pantry_dataframe):
+        pantry = ['flour', 'sugar', 'chicken', 'rice']
+        ranked = rank_by_pantry(pantry_dataframe, pantry, top_k=10, staples=('salt', 'water'))
+        assert list(ranked.index) == brute_force(pantry_dataframe, pantry)
+    
+    def test_exact_matching(self, pantry_dataframe):
+        ranked = rank_by_pantry(pantry_dataframe, 'chicken', match='exact')
+        assert list(ranked['name']) == ['Chicken Soup']
+    
+    def test_empty_pantry(self, pantry_dataframe):
+        assert len(rank_by_pantry(pantry_dataframe, ' , ')) == 0
+    
+    def test_coverage_counts_list_items(self):
+        df = pd.DataFrame({
+            'name': ['Sandwich', 'Toast'],
+            'ingredients': ['["hellmann\'s mayonnaise", \'bread\']', "['bread', 'butter']"]
+        })
+        ranked = rank_by_pantry(df, "hellmann's mayonnaise, bread")
+        
+        assert list(ranked['name']) == ['Sandwich', 'Toast']
+        assert ranked['pantry_coverage'].iloc[0] == 1.0
+        assert list(ranked['pantry_missing']) == [0, 1]
+        assert ranked['missing_ingredients'].iloc[0] == []
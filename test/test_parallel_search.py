@@ -0,0 +1,70 @@
+import sys
+import pytest
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from parallel_search import ParallelSearcher, export_search_columns, find_rows, open_search_columns, shard_bounds
+from Recipeasy import search_recipes_by_ingredient, search_recipes_by_name
+
+@pytest.fixture
+def recipes_dataframe():
+    rng = np.random.default_rng(11)
+    words = np.array(['Chicken', 'soup', 'Crème', 'brûlée', 'cake', 'garlic', 'bread', '(easy)'])
+    vocabulary = ['chicken', 'garlic', 'flour', 'sugar', 'butter', 'crème fraîche', 'salt']
+    df = pd.DataFrame({
+        'name': [' '.join(rng.choice(words, size=3)) for _ in range(120)],
+        'ingredients': [repr(list(rng.choice(vocabulary, size=rng.integers(1, 5), replace=False))) for _ in range(120)]
+    })
+    df.loc[5, 'name'] = None
+    df.loc[7, 'ingredients'] = None
+    return df
+
+NAME_QUERIES = ['chicken', 'CRÈME', 'soup cake', '(easy)', 'nothing here', 'e']
+INGREDIENT_QUERIES = ['chicken', 'garlic, salt', 'fraîche', "', '", 'flour, sugar, butter', 'bacon']
+
+class TestFindRows:
+    
+    def test_matches_do_not_span_rows(self, tmp_path):
+        export_search_columns(pd.DataFrame({'name': ['abc', 'def', 'cde']}), tmp_path)
+        rows, columns = open_search_columns(tmp_path)
+        offsets, data = columns['name']
+        
+        assert list(find_rows(offsets, data, b'cd', 0, rows)) == [2]
+        assert list(find_rows(offsets, data, b'c', 1, rows)) == [2]
+    
+    def test_shard_bounds(self):
+        assert list(shard_bounds(10, 3)) == [0, 3, 6, 10]
+
+class TestParallelSearcher:
+    
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_name_results_match_serial_search(self, recipes_dataframe, workers):
+        with ParallelSearcher(recipes_dataframe, workers=workers) as searcher:
+            results = searcher.search_names(NAME_QUERIES)
+        
+        for query, rows in zip(NAME_QUERIES, results):
+            expected = search_recipes_by_name(recipes_dataframe, query)
+            assert list(recipes_dataframe.index[rows]) == list(expected.index)
+    
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_ingredient_results_match_serial_search(self, recipes_dataframe, workers):
+        with ParallelSearcher(recipes_dataframe, workers=workers) as searcher:
+            results = searcher.search_ingredients(INGREDIENT_QUERIES)
+        
+        for query, rows in zip(INGREDIENT_QUERIES, results):
+            expected = search_recipes_by_ingredient(recipes_dataframe, query)
+            assert list(recipes_dataframe.index[rows]) == list(expected.index)
+    
+    def test_empty_queries(self, recipes_dataframe):
+        with ParallelSearcher(recipes_dataframe, workers=1) as searcher:
+            assert [len(rows) for rows in searcher.search_ingredients([' , ', ''])] == [0, 0]
+    
+    def test_close_removes_temporary_buffers(self, recipes_dataframe):
+        searcher = ParallelSearcher(recipes_dataframe, workers=1)
+        directory = Path(searcher.directory)
+        searcher.close()
+        assert not directory.exists()
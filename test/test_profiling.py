@@ -0,0 +1,105 @@
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from profiling import NULL_STAGE, Profiler, profiler
+from query_cache import search_cache
+from Recipeasy import find_ingredient_rows, main
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup'],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']"
+        ]
+    })
+
+@pytest.fixture(autouse=True)
+def fresh_profiler():
+    search_cache.clear()
+    profiler.reset()
+    yield
+    profiler.disable()
+    profiler.reset()
+
+class TestProfiler:
+    
+    def test_disabled_is_a_no_op(self):
+        local = Profiler()
+        assert local.stage('search') is NULL_STAGE
+        with local.stage('search') as stage:
+            stage.add('rows', 3)
+        local.count('hits')
+        assert local.snapshot() == {'stages': {}, 'counters': {}, 'recent_queries': []}
+    
+    def test_stages_and_counters(self):
+        local = Profiler()
+        local.enable()
+        for _ in range(2):
+            with local.stage('search') as stage:
+                stage.add('rows_matched', 5)
+        local.count('hits', 3)
+        snapshot = local.snapshot()
+        assert snapshot['stages']['search']['calls'] == 2
+        assert snapshot['stages']['search']['rows_matched'] == 10
+        assert snapshot['counters'] == {'hits': 3}
+        assert 'search' in local.report()
+    
+    def test_query_collects_its_own_stages_and_memory(self):
+        local = Profiler()
+        local.enable(trace_memory=True)
+        with local.stage('load'):
+            pass
+        with local.query('lookup'):
+            with local.stage('search'):
+                data = [0] * 10000
+        local.disable()
+        query = local.queries[-1].as_dict()
+        assert query['label'] == 'lookup'
+        assert list(query['stages']) == ['search']
+        assert query['memory']['peak_kb'] > 0
+        del data
+    
+    def test_search_reports_rows(self, sample_dataframe):
+        profiler.enable()
+        find_ingredient_rows(sample_dataframe, 'flour')
+        find_ingredient_rows(sample_dataframe, 'flour')
+        stats = profiler.snapshot()['stages']['search.ingredients']
+        assert stats['calls'] == 2
+        assert stats['rows_scanned'] == 3
+        assert stats['rows_matched'] == 4
+        assert profiler.snapshot()['counters']['query_cache.ingredients.hit'] == 1
+
+class TestProfileMode:
+    
+    @patch('Recipeasy.load_recipe_data')
+    @patch('builtins.input')
+    def test_main_profile_prints_stage_reports(self, mock_input, mock_load, sample_dataframe, capsys):
+        mock_load.return_value = sample_dataframe
+        mock_input.side_effect = ['3', 'flour', '4']
+        
+        main(profile=True)
+        
+        captured = capsys.readouterr()
+        assert "[profile] ingredient search:" in captured.out
+        assert "search.ingredients" in captured.out
+        assert "Session profile:" in captured.out
+        assert not profiler.enabled
+    
+    @patch('Recipeasy.load_recipe_data')
+    @patch('builtins.input')
+    def test_main_without_profile_prints_nothing_extra(self, mock_input, mock_load, sample_dataframe, capsys):
+        mock_load.return_value = sample_dataframe
+        mock_input.side_effect = ['3', 'flour', '4']
+        
+        main()
+        
+        assert "[profile]" not in capsys.readouterr().out
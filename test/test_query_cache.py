@@ -0,0 +1,106 @@
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+import index_registry
+from query_cache import QueryCache, normalize_ingredient_query, normalize_name_query, search_cache
+from Recipeasy import search_recipes_by_ingredient, search_recipes_by_name
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup'],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']"
+        ]
+    })
+
+@pytest.fixture(autouse=True)
+def fresh_search_cache():
+    search_cache.clear()
+    search_cache.reset_stats()
+    yield
+    search_cache.clear()
+
+class TestQueryCache:
+    
+    def test_normalize_ingredient_query(self):
+        assert normalize_ingredient_query(' Sugar,flour , sugar') == ('flour', 'sugar')
+        assert normalize_ingredient_query(' , ') == ()
+    
+    def test_name_query_keeps_surrounding_spaces(self, sample_dataframe):
+        # Surrounding spaces are part of the substring, so they change the results.
+        assert normalize_name_query(' Cake ') == ' cake '
+        assert len(search_recipes_by_name(sample_dataframe, 'co')) == 2
+        assert len(search_recipes_by_name(sample_dataframe, ' co')) == 1
+    
+    def test_hits_and_misses(self):
+        cache = QueryCache()
+        assert cache.get('a') is None
+        cache.put('a', [1, 2])
+        assert list(cache.get('a')) == [1, 2]
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+        assert cache.stats()['hit_rate'] == 0.5
+    
+    def test_lru_eviction(self):
+        cache = QueryCache(max_entries=2)
+        cache.put('a', [1])
+        cache.put('b', [2])
+        cache.get('a')
+        cache.put('c', [3])
+        
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.evictions == 1
+    
+    def test_cached_rows_are_read_only(self):
+        rows = QueryCache().put('a', np.array([1, 2]))
+        with pytest.raises(ValueError):
+            rows[0] = 5
+    
+    def test_disabled_cache(self):
+        cache = QueryCache(max_entries=0)
+        cache.put('a', [1])
+        assert len(cache) == 0
+
+class TestSearchCaching:
+    
+    def test_repeated_ingredient_query_hits_cache(self, sample_dataframe):
+        first = search_recipes_by_ingredient(sample_dataframe, 'flour, sugar')
+        
+        with patch('ingredient_index.IngredientIndex.search') as mock_search:
+            second = search_recipes_by_ingredient(sample_dataframe, 'SUGAR ,flour')
+            mock_search.assert_not_called()
+        
+        pd.testing.assert_frame_equal(first, second)
+        assert search_cache.hits == 1
+    
+    def test_repeated_name_query_hits_cache(self, sample_dataframe):
+        search_recipes_by_name(sample_dataframe, 'Chocolate')
+        search_recipes_by_name(sample_dataframe, 'chocolate')
+        
+        assert search_cache.hits == 1
+        assert search_cache.misses == 1
+    
+    def test_new_dataset_does_not_reuse_results(self, sample_dataframe):
+        search_recipes_by_ingredient(sample_dataframe, 'flour')
+        other = sample_dataframe.iloc[[2, 1, 0]].reset_index(drop=True)
+        
+        assert list(search_recipes_by_ingredient(other, 'flour')['name']) == ['Vanilla Cookies', 'Chocolate Cake']
+        assert search_cache.hits == 0
+    
+    def test_invalidate_drops_cached_results(self, sample_dataframe):
+        search_recipes_by_name(sample_dataframe, 'cake')
+        sample_dataframe.loc[1, 'name'] = 'Carrot Cake'
+        index_registry.invalidate(sample_dataframe)
+        
+        assert len(search_recipes_by_name(sample_dataframe, 'cake')) == 2
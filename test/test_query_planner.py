@@ -0,0 +1,140 @@
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from query_cache import search_cache
+from query_planner import And, Not, Or, Parser, Term, get_query_planner, is_structured_query, run_query, tokenize
+from Recipeasy import find_ingredient_rows, main
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Walnut Cookies', 'Chicken Soup', 'Turkey Chili', 'Slow Cooker Chicken'],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'walnuts', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']",
+            "['ground turkey', 'beans', 'onion', 'chili powder']",
+            "['chicken', 'olive oil', 'pecans', 'onion']"
+        ],
+        'tags': [
+            "['dessert', 'easy']",
+            "['dessert']",
+            "['soup', 'easy']",
+            "['main-dish']",
+            "['main-dish', 'easy']"
+        ]
+    })
+
+@pytest.fixture(autouse=True)
+def fresh_search_cache():
+    search_cache.clear()
+    yield
+    search_cache.clear()
+
+class TestParser:
+    
+    def test_tokenize(self):
+        assert tokenize('name:"slow cooker" AND (a OR b), NOT c') == [
+            ('word', 'name:'), ('quoted', 'slow cooker'), ('op', 'AND'), ('op', '('), ('word', 'a'),
+            ('op', 'OR'), ('word', 'b'), ('op', ')'), ('op', ','), ('op', 'NOT'), ('word', 'c')
+        ]
+    
+    def test_structure(self):
+        node = Parser('olive oil, chicken OR tag:easy NOT nuts').parse()
+        assert isinstance(node, Or)
+        first, second = node.children
+        assert isinstance(first, And) and [child.text for child in first.children] == ['olive oil', 'chicken']
+        assert isinstance(second, And) and second.children[0].field == 'tags'
+        assert isinstance(second.children[1], Not)
+    
+    def test_lowercase_keywords_are_words(self):
+        node = Parser('salt and pepper').parse()
+        assert isinstance(node, Term) and node.text == 'salt and pepper'
+    
+    def test_errors(self):
+        for query, message in [('(chicken', "Missing"), ('chicken OR', 'ends too early'),
+                               ('colour:red', 'Unknown field'), ('"open', 'Unbalanced'), ('', 'Empty')]:
+            with pytest.raises(ValueError, match=message):
+                Parser(query).parse()
+    
+    def test_is_structured_query(self):
+        assert not is_structured_query('chicken, garlic, salt and pepper')
+        assert is_structured_query('chicken OR turkey')
+        assert is_structured_query('name:soup')
+        assert is_structured_query('"olive oil" OR butter')
+        assert not is_structured_query('"olive oil"')
+        assert not is_structured_query('cheese (grated)')
+        assert not is_structured_query('salt, time:5 minutes')
+    
+    def test_bracketed_comma_query_stays_literal(self):
+        df = pd.DataFrame({
+            'name': ['Cheese Toast', 'Carrot Salad'],
+            'ingredients': ["['bread', 'cheese (grated)']", "['grated carrot', 'cheese', 'bread']"]
+        })
+        
+        assert not is_structured_query('bread, cheese (grated)')
+        assert list(find_ingredient_rows(df, 'bread, cheese (grated)')) == [0]
+        assert list(run_query(df, 'bread, cheese (grated)')) == [0, 1]
+
+class TestPlanner:
+    
+    def test_boolean_queries(self, sample_dataframe):
+        assert list(run_query(sample_dataframe, 'chicken OR turkey')) == [2, 3, 4]
+        assert list(run_query(sample_dataframe, 'onion, NOT (walnuts OR pecans)')) == [2, 3]
+        assert list(run_query(sample_dataframe, 'NOT onion')) == [0, 1]
+        assert list(run_query(sample_dataframe, 'name:chicken tag:easy NOT pecans')) == [2]
+        assert list(run_query(sample_dataframe, 'tag:dessert AND NOT name:cake')) == [1]
+        assert list(run_query(sample_dataframe, 'saffron AND chicken')) == []
+    
+    def test_most_selective_first(self, sample_dataframe):
+        node = get_query_planner(sample_dataframe).compile('onion AND NOT celery AND turkey')
+        assert [child.describe() for child in node.children] == [
+            "ingredients:'turkey'", "ingredients:'onion'", "NOT ingredients:'celery'"
+        ]
+    
+    def test_short_circuits_on_empty(self, sample_dataframe):
+        planner = get_query_planner(sample_dataframe)
+        node = planner.compile('saffron, onion, chicken')
+        assert len(node.evaluate(planner)) == 0
+        assert node.children[0].matched == 0
+        assert all(child.matched is None for child in node.children[1:])
+    
+    def test_explain(self, sample_dataframe):
+        plan = get_query_planner(sample_dataframe).explain('chicken OR turkey')
+        assert plan.splitlines()[0] == 'OR  estimate=3 rows=3'
+        assert "ingredients:'chicken'  estimate=2 rows=2" in plan
+    
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(3)
+        vocabulary = ['salt', 'garlic', 'onion', 'chicken', 'beef', 'rice', 'walnuts', 'basil', 'olive oil']
+        df = pd.DataFrame({
+            'name': ['recipe'] * 300,
+            'ingredients': [repr(list(rng.choice(vocabulary, size=rng.integers(1, 5), replace=False))) for _ in range(300)]
+        })
+        has = {word: df['ingredients'].str.contains(word, regex=False).to_numpy() for word in vocabulary}
+        for _ in range(40):
+            a, b, c = rng.choice(vocabulary, size=3, replace=False)
+            expected = np.flatnonzero((has[a] | has[b]) & ~has[c])
+            assert np.array_equal(run_query(df, f'({a} OR {b}) AND NOT {c}'), expected)
+
+class TestStructuredMenu:
+    
+    @patch('Recipeasy.load_recipe_data')
+    @patch('builtins.input')
+    def test_boolean_ingredient_search(self, mock_input, mock_load, sample_dataframe, capsys):
+        mock_load.return_value = sample_dataframe
+        mock_input.side_effect = ['3', '(chicken OR turkey), NOT celery', '3', 'chicken OR', '4']
+        
+        main()
+        
+        captured = capsys.readouterr()
+        assert "Found 2 recipes matching: (chicken OR turkey), NOT celery" in captured.out
+        assert "Turkey Chili" in captured.out
+        assert "Could not understand that query" in captured.out
@@ -0,0 +1,106 @@
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+import index_registry
+from quickstart import BackgroundLoader, main
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    df = pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup'],
+        'minutes': [45, 30, 60],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']"
+        ]
+    })
+    (tmp_path / 'data').mkdir()
+    df.to_csv(tmp_path / 'data' / 'RAW_recipes.csv', index=False)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+class TestBackgroundLoader:
+    
+    def test_loads_and_warms_indexes(self, data_dir):
+        loader = BackgroundLoader().start()
+        Recipeasy, df = loader.wait(show_progress=False)
+        loader.ready.wait(10)
+        
+        assert len(df) == 3
+        assert loader.error is None and not loader.missing
+        assert loader.progress == 1.0 or 'indexing ingredients' in loader.timings
+        assert loader.describe() is None
+    
+    def test_warm_up_failure_keeps_data(self, data_dir):
+        with patch('ingredient_index.get_ingredient_index', side_effect=MemoryError('out of memory')):
+            loader = BackgroundLoader().start()
+            loader.ready.wait(10)
+        
+        assert loader.error is None and len(loader.df) == 3
+        assert loader.warnings == ["Could not prepare search indexes in advance: out of memory"]
+    
+    def test_reports_missing_data(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        loader = BackgroundLoader().start()
+        loader.wait(show_progress=False)
+        
+        assert loader.missing
+        assert loader.df is None
+    
+    def test_concurrent_builds_run_once(self):
+        df = pd.DataFrame({'a': range(10)})
+        calls = []
+        
+        def slow_builder(frame):
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+        
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(index_registry.get_or_build(df, 'slow', slow_builder))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+class TestQuickstartMain:
+    
+    @patch('builtins.input')
+    def test_menu_before_data(self, mock_input, data_dir, capsys):
+        mock_input.side_effect = ['9', '1', '4']
+        
+        main([])
+        
+        captured = capsys.readouterr()
+        assert captured.out.index("What would you like to do?") < captured.out.index("Loaded 3 recipes")
+        assert "Invalid choice" in captured.out
+        assert "RECIPE RECOMMENDATION" in captured.out
+        assert "Thank you for using Recipeasy!" in captured.out
+    
+    @patch('builtins.input')
+    def test_missing_data_offers_download(self, mock_input, tmp_path, monkeypatch, capsys):
+        monkeypatch.chdir(tmp_path)
+        mock_input.side_effect = ['2', 'no']
+        
+        main([])
+        
+        captured = capsys.readouterr()
+        assert "Dataset not found locally." in captured.out
+    
+    def test_menu_does_not_import_pandas(self):
+        code = f"import sys; sys.path.insert(0, {str(path)!r}); import quickstart; print('pandas' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == 'False'
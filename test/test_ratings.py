@@ -0,0 +1,127 @@
+import os
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+import index_registry
+import ratings
+from ratings import RatingTable, aggregate_interactions, join_ratings, load_rating_table, rank_rows
+from sampling import RecipeSampler
+from Recipeasy import format_recipe, load_recipe_data
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup', 'Plain Toast'],
+        'id': [101, 102, 103, 104],
+        'minutes': [45, 30, 60, 5],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']",
+            "['bread', 'butter']"
+        ]
+    })
+
+@pytest.fixture
+def interactions_csv(tmp_path):
+    interactions = pd.DataFrame({
+        'user_id': range(12),
+        'recipe_id': [101, 101, 102, 102, 102, 102, 102, 102, 103, 103, 999, 101],
+        'date': ['2010-01-01'] * 12,
+        'rating': [5, 4, 5, 5, 5, 5, 4, 5, 1, 0, 3, 0],
+        'review': ['ok'] * 12
+    })
+    interactions_path = tmp_path / 'RAW_interactions.csv'
+    interactions.to_csv(interactions_path, index=False)
+    return interactions_path
+
+class TestAggregateInteractions:
+
+    def test_streamed_totals_match_groupby(self, interactions_csv):
+        table = aggregate_interactions(interactions_csv, chunksize=5)
+        expected = pd.read_csv(interactions_csv).query('rating > 0').groupby('recipe_id')['rating']
+
+        assert table.ids.tolist() == [101, 102, 103, 999]
+        assert table.reviews.tolist() == [3, 6, 2, 1]
+        assert table.rated.tolist() == expected.count().tolist()
+        np.testing.assert_allclose(table.means(), expected.mean().to_numpy())
+
+    def test_bayesian_score_shrinks_small_counts(self):
+        table = RatingTable([1, 2], [1, 20], [1, 20], [5.0, 80.0])
+        scores = table.scores(prior_weight=5)
+
+        assert table.global_mean == pytest.approx(85 / 21)
+        assert scores[0] < 5.0 and scores[0] > table.global_mean
+        assert scores[1] == pytest.approx((5 * table.global_mean + 80) / 25)
+
+    def test_table_is_cached_next_to_recipes(self, interactions_csv, tmp_path):
+        first = load_rating_table(str(interactions_csv))
+
+        with patch('ratings.aggregate_interactions') as mock_aggregate:
+            second = load_rating_table(str(interactions_csv))
+
+        mock_aggregate.assert_not_called()
+        assert second.ids.tolist() == first.ids.tolist()
+        assert os.path.exists(tmp_path / '.recipeasy_cache' / 'RAW_interactions' / 'ratings.npz')
+
+class TestRanking:
+
+    def test_join_adds_rating_columns(self, sample_dataframe, interactions_csv):
+        join_ratings(sample_dataframe, aggregate_interactions(interactions_csv))
+
+        assert sample_dataframe['n_reviews'].tolist() == [3, 6, 2, 0]
+        assert sample_dataframe['rating'].iloc[0] == pytest.approx(4.5)
+        assert np.isnan(sample_dataframe['rating'].iloc[3])
+        assert "Rating: 4.5 / 5 (3 reviews)" in format_recipe(sample_dataframe.iloc[0])
+
+    def test_rank_rows_orders_by_score(self, sample_dataframe, interactions_csv):
+        join_ratings(sample_dataframe, aggregate_interactions(interactions_csv))
+
+        assert rank_rows(sample_dataframe, [0, 1, 2]).tolist() == [1, 0, 2]
+        assert rank_rows(sample_dataframe, [2]).tolist() == [2]
+
+    def test_rank_rows_without_ratings_keeps_file_order(self, sample_dataframe):
+        assert rank_rows(sample_dataframe, [2, 0, 1]).tolist() == [2, 0, 1]
+
+    def test_surprise_prefers_well_rated(self, sample_dataframe, interactions_csv):
+        join_ratings(sample_dataframe, aggregate_interactions(interactions_csv))
+        sample_dataframe.loc[2, 'rating_score'] = 0.0
+        sampler = RecipeSampler(sample_dataframe, seed=0)
+
+        picks = [sampler.sample(1, weights=ratings.default_weights(sample_dataframe))[0] for _ in range(200)]
+
+        assert 2 not in picks
+
+class TestLoadRecipeData:
+
+    def test_loads_ratings_when_interactions_present(self, sample_dataframe, interactions_csv, tmp_path, monkeypatch, capsys):
+        data_dir = tmp_path / 'data'
+        data_dir.mkdir()
+        sample_dataframe.to_csv(data_dir / 'RAW_recipes.csv', index=False)
+        os.replace(interactions_csv, data_dir / 'RAW_interactions.csv')
+        monkeypatch.chdir(tmp_path)
+
+        df = load_recipe_data()
+
+        assert df['n_reviews'].tolist() == [3, 6, 2, 0]
+        assert "Ranking results by 12 reviews of 4 recipes." in capsys.readouterr().out
+
+    def test_lean_load_keeps_interned_ingredients(self, sample_dataframe, interactions_csv, tmp_path, monkeypatch):
+        data_dir = tmp_path / 'data'
+        data_dir.mkdir()
+        sample_dataframe.to_csv(data_dir / 'RAW_recipes.csv', index=False)
+        os.replace(interactions_csv, data_dir / 'RAW_interactions.csv')
+        monkeypatch.chdir(tmp_path)
+
+        df = load_recipe_data(lean=True)
+
+        assert index_registry.is_built(df, ('interned', 'ingredients'))
+        assert df['n_reviews'].tolist() == [3, 6, 2, 0]
+        assert df['n_reviews'].dtype == np.uint8
@@ -0,0 +1,135 @@
+import os
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+import recipe_cache
+
+from recipe_cache import (
+    cache_dir_for,
+    decode_strings,
+    encode_strings,
+    is_cache_valid,
+    load_with_cache,
+    read_meta,
+)
+
+@pytest.fixture
+def recipes_csv(tmp_path):
+    df = pd.DataFrame({
+        'name': ['Chocolate Cake', 'Crème Brûlée', None],
+        'id': [1, 2, 3],
+        'minutes': [45, 30, 60],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate']",
+            "['cream', 'sugar', 'eggs']",
+            "['chicken', 'carrots']"
+        ]
+    })
+    csv_path = tmp_path / 'RAW_recipes.csv'
+    df.to_csv(csv_path, index=False)
+    return csv_path
+
+class TestStringEncoding:
+    
+    def test_round_trip_with_unicode_and_missing(self):
+        values = np.array(['abc', 'Crème Brûlée', np.nan, '', '日本'], dtype=object)
+        decoded = decode_strings(*encode_strings(values))
+        
+        assert decoded[0] == 'abc'
+        assert decoded[1] == 'Crème Brûlée'
+        assert pd.isna(decoded[2])
+        assert decoded[3] == ''
+        assert decoded[4] == '日本'
+
+class TestLoadWithCache:
+    
+    def test_first_load_builds_cache(self, recipes_csv, tmp_path):
+        cache_root = tmp_path / 'cache'
+        df = load_with_cache(str(recipes_csv), str(cache_root))
+        
+        assert len(df) == 3
+        meta = read_meta(cache_dir_for(str(recipes_csv), str(cache_root)))
+        assert meta['rows'] == 3
+        assert meta['source']['size'] == os.path.getsize(recipes_csv)
+    
+    def test_warm_load_skips_csv_parse(self, recipes_csv, tmp_path):
+        cache_root = str(tmp_path / 'cache')
+        cold = load_with_cache(str(recipes_csv), cache_root)
+        
+        with patch('pandas.read_csv') as mock_read_csv:
+            warm = load_with_cache(str(recipes_csv), cache_root)
+            mock_read_csv.assert_not_called()
+        
+        pd.testing.assert_frame_equal(cold, warm)
+    
+    def test_npy_format_preserves_dtypes(self, recipes_csv, tmp_path):
+        directory = cache_dir_for(str(recipes_csv), str(tmp_path / 'cache'))
+        df = pd.read_csv(recipes_csv)
+        recipe_cache.write_cache(df, str(recipes_csv), directory, cache_format='npy')
+        
+        pd.testing.assert_frame_equal(df, recipe_cache.read_cache(directory))
+    
+    def test_read_cache_column_subset(self, recipes_csv, tmp_path):
+        cache_root = str(tmp_path / 'cache')
+        load_with_cache(str(recipes_csv), cache_root)
+        
+        df = recipe_cache.read_cache(cache_dir_for(str(recipes_csv), cache_root), columns=['name', 'minutes'])
+        assert list(df.columns) == ['name', 'minutes']
+    
+    def test_changed_source_rebuilds(self, recipes_csv, tmp_path):
+        cache_root = str(tmp_path / 'cache')
+        load_with_cache(str(recipes_csv), cache_root)
+        
+        with open(recipes_csv, 'a') as handle:
+            handle.write("Apple Pie,4,50,\"['apples', 'flour']\"\n")
+        
+        df = load_with_cache(str(recipes_csv), cache_root)
+        assert len(df) == 4
+        assert read_meta(cache_dir_for(str(recipes_csv), cache_root))['rows'] == 4
+    
+    def test_touched_source_with_same_bytes_stays_valid(self, recipes_csv, tmp_path):
+        cache_root = str(tmp_path / 'cache')
+        load_with_cache(str(recipes_csv), cache_root)
+        directory = cache_dir_for(str(recipes_csv), cache_root)
+        
+        stat = os.stat(recipes_csv)
+        os.utime(recipes_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        
+        assert is_cache_valid(str(recipes_csv), directory)
+        assert read_meta(directory)['source']['mtime_ns'] == stat.st_mtime_ns + 10**9
+    
+    def test_corrupt_cache_falls_back_to_csv(self, recipes_csv, tmp_path, capsys):
+        cache_root = str(tmp_path / 'cache')
+        load_with_cache(str(recipes_csv), cache_root)
+        directory = cache_dir_for(str(recipes_csv), cache_root)
+        for entry in os.listdir(directory):
+            if entry.endswith('.npy') or entry.endswith('.feather'):
+                os.remove(os.path.join(directory, entry))
+        
+        df = load_with_cache(str(recipes_csv), cache_root)
+        
+        assert len(df) == 3
+        assert 'Ignoring unreadable recipe cache' in capsys.readouterr().out
+    
+    def test_missing_source_reads_directly(self):
+        sample_path = 'missing.csv'
+        with patch('pandas.read_csv', return_value=pd.DataFrame({'name': ['x']})) as mock_read_csv:
+            df = load_with_cache(sample_path)
+        
+        assert len(df) == 1
+        mock_read_csv.assert_called_once_with(sample_path)
+    
+    def test_progress_reader_matches_read_csv(self, recipes_csv):
+        seen = []
+        df = recipe_cache.read_csv_with_progress(str(recipes_csv), seen.append, chunksize=2)
+        
+        pd.testing.assert_frame_equal(df, pd.read_csv(recipes_csv))
+        assert len(seen) == 2
+        assert seen[-1] == 1.0
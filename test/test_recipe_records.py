@@ -0,0 +1,109 @@
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+import recipe_records
+
+from recipe_records import (
+    ParsedColumn,
+    get_records,
+    is_present,
+    parse_list,
+    parse_nutrition,
+)
+
+@pytest.fixture
+def records_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Chicken Soup', 'Broken'],
+        'minutes': [45, 60, 5],
+        'ingredients': ["['flour', 'sugar']", "['chicken', 'carrots']", None],
+        'steps': ["['Mix', 'Bake']", "['Boil', 'Simmer']", 'not a list'],
+        'tags': ["['dessert']", "['soup', 'easy']", "[]"],
+        'nutrition': [
+            '[300.5, 10.0, 20.0, 1.0, 5.0, 8.0, 12.0]',
+            '[120.0, 2.0, 1.0, 30.0, 25.0, 1.0, 3.0]',
+            'garbage'
+        ]
+    })
+
+class TestParsers:
+    
+    def test_parse_list(self):
+        assert parse_list("['a', \"b's\"]") == ['a', "b's"]
+        assert parse_list('not a list') is None
+        assert parse_list("'just a string'") is None
+        assert parse_list(np.nan) is None
+        assert parse_list(['already', 'parsed']) == ['already', 'parsed']
+    
+    def test_parse_nutrition(self):
+        assert list(parse_nutrition('[1.0, 2.5, 3]')) == [1.0, 2.5, 3.0]
+        assert parse_nutrition('garbage') is None
+        assert parse_nutrition(None) is None
+    
+    def test_is_present(self):
+        assert is_present(['a'])
+        assert is_present('text')
+        assert not is_present(None)
+        assert not is_present(np.nan)
+
+class TestParsedColumn:
+    
+    def test_parses_lazily_and_caches(self, records_dataframe):
+        column = ParsedColumn(records_dataframe['ingredients'], parse_list)
+        assert column.parsed_count == 0
+        
+        with patch('recipe_records.ast.literal_eval', wraps=recipe_records.ast.literal_eval) as spy:
+            assert column[1] == ['chicken', 'carrots']
+            assert column[1] == ['chicken', 'carrots']
+            assert spy.call_count == 1
+        
+        assert column.parsed_count == 1
+    
+    def test_bulk(self, records_dataframe):
+        column = ParsedColumn(records_dataframe['ingredients'], parse_list)
+        assert column.bulk() == [['flour', 'sugar'], ['chicken', 'carrots'], None]
+
+class TestRecipeRecords:
+    
+    def test_record_access(self, records_dataframe):
+        record = get_records(records_dataframe).record(0)
+        
+        assert record.name == 'Chocolate Cake'
+        assert record['minutes'] == 45
+        assert record.ingredients == ['flour', 'sugar']
+        assert record.steps == ['Mix', 'Bake']
+        assert record.tags == ['dessert']
+        assert record.nutrition_facts()['calories'] == 300.5
+        assert 'minutes' in record
+        assert record.get('rating') is None
+    
+    def test_untouched_columns_stay_unparsed(self, records_dataframe):
+        records = get_records(records_dataframe)
+        records.record(1).ingredients
+        
+        assert records.column('ingredients').parsed_count == 1
+        assert records.column('steps').parsed_count == 0
+    
+    def test_unparseable_values(self, records_dataframe):
+        record = get_records(records_dataframe).record(2)
+        
+        assert record.ingredients is None
+        assert record.steps is None
+        assert record.nutrition_facts() == {}
+    
+    def test_nutrition_matrix(self, records_dataframe):
+        matrix = get_records(records_dataframe).nutrition_matrix()
+        
+        assert matrix.shape == (3, 7)
+        assert matrix[1, 4] == 25.0
+        assert np.isnan(matrix[2]).all()
+    
+    def test_records_cached_per_dataframe(self, records_dataframe):
+        assert get_records(records_dataframe) is get_records(records_dataframe)
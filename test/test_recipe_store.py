@@ -0,0 +1,174 @@
+import sys
+import pytest
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+import index_registry
+import recipe_cache
+from ingredient_index import IngredientIndex, get_ingredient_index, merge_indexes as merge_ingredient_indexes
+from name_index import NameIndex, get_name_index, merge_indexes as merge_name_indexes
+from query_cache import search_cache
+from recipe_store import RecipeStore, delta_dir_for, list_segments, main
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup'],
+        'id': [101, 102, 103],
+        'minutes': [45, 30, 60],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']"
+        ]
+    })
+
+@pytest.fixture
+def new_recipes():
+    return pd.DataFrame({
+        'name': ['Chocolate Mousse', 'Lemon Tart'],
+        'id': [201, 202],
+        'minutes': [20, 50],
+        'ingredients': ["['chocolate', 'cream', 'eggs']", "['flour', 'lemon', 'sugar', 'butter']"]
+    })
+
+@pytest.fixture
+def recipes_csv(sample_dataframe, tmp_path):
+    csv_path = tmp_path / 'RAW_recipes.csv'
+    sample_dataframe.to_csv(csv_path, index=False)
+    return str(csv_path)
+
+@pytest.fixture(autouse=True)
+def fresh_search_cache():
+    search_cache.clear()
+
+def names(store, rows):
+    return store.recipes(rows)['name'].tolist()
+
+class TestMergeIndexes:
+
+    def test_merged_indexes_match_rebuilt(self, sample_dataframe, new_recipes):
+        live = np.array([True, False, True, True, True])
+        merged = pd.concat([sample_dataframe, new_recipes], ignore_index=True)[live].reset_index(drop=True)
+
+        ingredients = merge_ingredient_indexes(IngredientIndex(sample_dataframe['ingredients']), IngredientIndex(new_recipes['ingredients']), live, merged['ingredients'])
+        rebuilt = IngredientIndex(merged['ingredients'])
+        assert ingredients.vocabulary.tolist() == rebuilt.vocabulary.tolist()
+        assert ingredients.postings.tolist() == rebuilt.postings.tolist()
+        assert ingredients.offsets.tolist() == rebuilt.offsets.tolist()
+
+        names = merge_name_indexes(NameIndex(sample_dataframe['name']), NameIndex(new_recipes['name']), live)
+        rebuilt = NameIndex(merged['name'])
+        assert names.keys.tolist() == rebuilt.keys.tolist()
+        assert names.postings.tolist() == rebuilt.postings.tolist()
+        assert names.search('choc').tolist() == rebuilt.search('choc').tolist() == [0, 2]
+
+class TestRecipeStore:
+
+    def test_appended_recipes_are_searchable(self, recipes_csv, new_recipes):
+        store = RecipeStore(recipes_csv)
+        store.append(new_recipes)
+
+        assert names(store, store.find_name_rows('chocolate')) == ['Chocolate Cake', 'Chocolate Mousse']
+        assert names(store, store.find_ingredient_rows('flour, sugar')) == ['Chocolate Cake', 'Vanilla Cookies', 'Lemon Tart']
+        assert len(store) == 5 and store.status()['delta_rows'] == 2
+
+    def test_deleted_recipes_disappear(self, recipes_csv, new_recipes):
+        store = RecipeStore(recipes_csv)
+        store.append(new_recipes)
+        store.delete([101, 202])
+
+        assert names(store, store.find_ingredient_rows('flour')) == ['Vanilla Cookies']
+        assert store.row_for_id(101) is None
+        assert store.recipes([store.row_for_id(201)])['name'].tolist() == ['Chocolate Mousse']
+
+    def test_other_writers_are_picked_up(self, recipes_csv, new_recipes):
+        reader = RecipeStore(recipes_csv)
+        RecipeStore(recipes_csv).append(new_recipes)
+
+        assert reader.refresh(force=True) == 1
+        assert 'Lemon Tart' in names(reader, reader.find_name_rows('tart'))
+
+    def test_merge_reuses_base_indexes(self, recipes_csv, new_recipes):
+        store = RecipeStore(recipes_csv)
+        get_name_index(store.base)
+        get_ingredient_index(store.base)
+        store.append(new_recipes)
+        store.delete([102])
+
+        merged = store.merge()
+
+        assert merged['name'].tolist() == ['Chocolate Cake', 'Chicken Soup', 'Chocolate Mousse', 'Lemon Tart']
+        assert index_registry.is_built(merged, ('list_index', 'ingredients'))
+        assert store.status()['delta_rows'] == 0 and len(store.live) == 4
+        assert names(store, store.find_ingredient_rows('eggs')) == ['Chocolate Cake', 'Chocolate Mousse']
+
+    def test_compact_rewrites_dataset(self, recipes_csv, new_recipes):
+        store = RecipeStore(recipes_csv)
+        store.append(new_recipes)
+        store.delete([103])
+
+        assert store.compact() == 2
+        assert list_segments(delta_dir_for(recipes_csv)) == []
+        reopened = RecipeStore(recipes_csv)
+        assert reopened.base['id'].tolist() == [101, 102, 201, 202]
+        assert recipe_cache.is_cache_valid(recipes_csv, recipe_cache.cache_dir_for(recipes_csv))
+
+    def test_append_only_compact_extends_csv(self, recipes_csv, new_recipes):
+        store = RecipeStore(recipes_csv)
+        store.append(new_recipes)
+        store.compact()
+
+        assert pd.read_csv(recipes_csv)['name'].tolist()[-2:] == ['Chocolate Mousse', 'Lemon Tart']
+
+    def test_sequence_continues_after_compact(self, recipes_csv, new_recipes):
+        store = RecipeStore(recipes_csv)
+        store.append(new_recipes.iloc[:1])
+        store.compact()
+        second = store.append(new_recipes.iloc[1:])
+
+        assert second == 2
+        assert store.row_for_id(202) is not None and len(store) == 5
+        assert store.compact() == 1
+        assert pd.read_csv(recipes_csv)['id'].tolist() == [101, 102, 103, 201, 202]
+        assert RecipeStore(recipes_csv).base['id'].tolist() == [101, 102, 103, 201, 202]
+
+    def test_compaction_by_another_process_is_picked_up(self, recipes_csv, new_recipes):
+        reader = RecipeStore(recipes_csv)
+        writer = RecipeStore(recipes_csv)
+        writer.append(new_recipes)
+        writer.delete([101])
+        writer.compact()
+
+        reader.refresh(force=True)
+
+        assert reader.row_for_id(202) is not None and reader.row_for_id(101) is None
+        assert len(reader) == 4
+
+    def test_background_merge(self, recipes_csv, new_recipes):
+        store = RecipeStore(recipes_csv, merge_rows=1).start(interval=0.01)
+        try:
+            store.append(new_recipes)
+            for _ in range(200):
+                if store.status()['delta_rows'] == 0:
+                    break
+                store._stop.wait(0.01)
+        finally:
+            store.stop()
+
+        assert store.status()['base_rows'] == 5
+
+    def test_cli_queues_segments(self, recipes_csv, new_recipes, tmp_path, capsys):
+        new_recipes.to_csv(tmp_path / 'new.csv', index=False)
+
+        main(['--data', recipes_csv, 'append', str(tmp_path / 'new.csv')])
+        main(['--data', recipes_csv, 'delete', '101'])
+        main(['--data', recipes_csv, 'status'])
+
+        captured = capsys.readouterr()
+        assert "Queued 2 new recipes as segment 1" in captured.out
+        assert "recipes: 4" in captured.out
@@ -16,6 +16,9 @@ from Recipeasy import (
     search_recipes_by_name,
     search_recipes_by_ingredient,
     display_recipe,
+    display_name_matches,
+    format_recipe_version,
+    group_by_name,
     main
 )
 
@@ -218,6 +221,92 @@ class TestDisplayRecipe:
         
         assert 'Test Recipe' in captured.out
 
+def legacy_name_output(matches):
+    for name in matches['name'].unique():
+        versions = matches[matches['name'] == name]
+        if len(versions) > 1:
+            print("\n" + "="*60)
+            print(f"{name} ({len(versions)} versions found):")
+            print("="*60)
+            for idx, (_, recipe) in enumerate(versions.iterrows(), 1):
+                print(format_recipe_version(recipe, idx))
+        else:
+            display_recipe(versions.iloc[0])
+
+@pytest.fixture
+def duplicate_names_dataframe(sample_dataframe):
+    df = pd.concat([sample_dataframe, sample_dataframe.iloc[[0, 2]], sample_dataframe.iloc[[0]]], ignore_index=True)
+    df['minutes'] = range(len(df))
+    return df
+
+class TestDisplayNameMatches:
+    
+    def test_group_by_name_keeps_first_appearance_order(self, duplicate_names_dataframe):
+        names, order, bounds = group_by_name(duplicate_names_dataframe)
+        
+        assert list(names) == ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup']
+        assert list(order) == [0, 3, 5, 1, 2, 4]
+        assert list(bounds) == [0, 3, 4, 6]
+    
+    def test_output_matches_per_name_rendering(self, duplicate_names_dataframe, capsys):
+        legacy_name_output(duplicate_names_dataframe)
+        expected = capsys.readouterr().out
+        
+        display_name_matches(duplicate_names_dataframe)
+        
+        assert capsys.readouterr().out == expected
+    
+    @patch('builtins.input')
+    def test_paging_prompts_between_pages(self, mock_input, duplicate_names_dataframe, capsys):
+        mock_input.return_value = ''
+        display_name_matches(duplicate_names_dataframe, page_size=2)
+        captured = capsys.readouterr()
+        
+        assert mock_input.call_count == 1
+        assert 'Showing recipe names 1-2 of 3' in captured.out
+        assert 'Chicken Soup (2 versions found)' in captured.out
+    
+    @patch('builtins.input')
+    def test_paging_stops_on_quit(self, mock_input, duplicate_names_dataframe, capsys):
+        mock_input.return_value = 'q'
+        display_name_matches(duplicate_names_dataframe, page_size=1)
+        captured = capsys.readouterr()
+        
+        assert mock_input.call_count == 1
+        assert 'Chocolate Cake (3 versions found)' in captured.out
+        assert 'Vanilla Cookies' not in captured.out
+
+class TestStructuredDisplay:
+    
+    def test_display_recipe_lists_parsed_items(self, sample_dataframe, capsys):
+        display_recipe(sample_dataframe.iloc[0])
+        captured = capsys.readouterr()
+        
+        assert '- flour' in captured.out
+        assert '2. Bake at 350F' in captured.out
+        assert "['flour'" not in captured.out
+    
+    def test_display_recipe_nutrition(self, capsys):
+        recipe = pd.Series({'name': 'Soup', 'nutrition': '[51.5, 0.0, 13.0, 0.0, 2.0, 0.0, 4.0]'})
+        display_recipe(recipe)
+        captured = capsys.readouterr()
+        
+        assert 'Calories: 51.5' in captured.out
+        assert 'Sugar: 13% DV' in captured.out
+    
+    def test_display_recipe_unparseable_list_shown_raw(self, capsys):
+        recipe = pd.Series({'name': 'Odd', 'ingredients': 'flour and water'})
+        display_recipe(recipe)
+        
+        assert 'flour and water' in capsys.readouterr().out
+    
+    def test_version_lists_inline(self, sample_dataframe):
+        text = format_recipe_version(sample_dataframe.iloc[1], 2)
+        
+        assert 'VERSION 2:' in text
+        assert 'Ingredients: flour, sugar, vanilla, butter' in text
+        assert 'Instructions: 1. Mix 2. Shape 3. Bake' in text
+
 class TestMain:
     
     @patch('Recipeasy.load_recipe_data')
@@ -337,6 +426,30 @@ class TestMain:
         
         assert 'Please enter a search term' in captured.out
     
+    @patch('Recipeasy.load_recipe_data')
+    @patch('builtins.input')
+    def test_main_pantry_match(self, mock_input, mock_load, sample_dataframe, capsys):
+        mock_load.return_value = sample_dataframe
+        mock_input.side_effect = ['5', 'flour, sugar, eggs', '4']
+        
+        main()
+        captured = capsys.readouterr()
+        
+        assert 'BEST MATCHES FOR YOUR PANTRY' in captured.out
+        assert '1. Chocolate Cake - you have 75% (1 missing)' in captured.out
+        assert 'Missing: chocolate' in captured.out
+    
+    @patch('Recipeasy.load_recipe_data')
+    @patch('builtins.input')
+    def test_main_pantry_no_match(self, mock_input, mock_load, sample_dataframe, capsys):
+        mock_load.return_value = sample_dataframe
+        mock_input.side_effect = ['5', 'bacon', '4']
+        
+        main()
+        captured = capsys.readouterr()
+        
+        assert 'No recipes use any of' in captured.out
+    
     @patch('Recipeasy.load_recipe_data')
     @patch('builtins.input')
     def test_main_quit(self, mock_input, mock_load, sample_dataframe, capsys):
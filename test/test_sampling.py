@@ -0,0 +1,98 @@
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from sampling import POOL_CACHE_ENTRIES, RecipeSampler, get_sampler
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup', 'Garlic Chicken', 'Toast', 'Stew'],
+        'minutes': [45, 30, 60, 25, 5, None],
+        'n_steps': [10, 8, 12, 6, 2, 9],
+        'n_ingredients': [4, 4, 4, 3, 2, 8],
+        'rating': [5.0, 0.0, 4.0, 1.0, 0.0, 2.0],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']",
+            "['chicken', 'garlic', 'butter']",
+            "['bread', 'butter']",
+            "['beef', 'carrots', 'potatoes', 'onion', 'celery', 'thyme', 'stock', 'salt']"
+        ]
+    })
+
+class TestRecipeSampler:
+    
+    def test_seeded_samples_are_reproducible(self, sample_dataframe):
+        first = RecipeSampler(sample_dataframe, seed=42).sample(3)
+        second = RecipeSampler(sample_dataframe, seed=42).sample(3)
+        assert list(first) == list(second)
+    
+    def test_batch_is_non_repeating(self, sample_dataframe):
+        rows = RecipeSampler(sample_dataframe, seed=1).sample(6)
+        assert sorted(rows) == [0, 1, 2, 3, 4, 5]
+    
+    def test_batch_larger_than_pool(self, sample_dataframe):
+        rows = RecipeSampler(sample_dataframe, seed=1).sample(10, max_minutes=30)
+        assert sorted(rows) == [1, 3, 4]
+    
+    def test_range_constraints(self, sample_dataframe):
+        sampler = RecipeSampler(sample_dataframe)
+        assert list(sampler.pool(max_minutes=30)) == [1, 3, 4]
+        assert list(sampler.pool(max_ingredients=3)) == [3, 4]
+        assert list(sampler.pool(max_minutes=50, max_steps=8)) == [1, 3, 4]
+    
+    def test_missing_values_never_satisfy_limits(self, sample_dataframe):
+        assert 5 not in RecipeSampler(sample_dataframe).pool(max_minutes=1000)
+    
+    def test_required_ingredient(self, sample_dataframe):
+        sampler = RecipeSampler(sample_dataframe)
+        assert list(sampler.pool(ingredients='butter')) == [1, 3, 4]
+        assert list(sampler.pool(ingredients=['butter'], max_minutes=10)) == [4]
+    
+    def test_pools_are_cached(self, sample_dataframe):
+        sampler = RecipeSampler(sample_dataframe)
+        assert sampler.pool(max_minutes=30) is sampler.pool(max_minutes=30)
+    
+    def test_pool_cache_is_bounded(self, sample_dataframe):
+        sampler = RecipeSampler(sample_dataframe, seed=1)
+        for minutes in range(POOL_CACHE_ENTRIES * 3):
+            sampler.sample(1, weights='rating', max_minutes=minutes)
+        
+        assert len(sampler._pools) == POOL_CACHE_ENTRIES
+        assert len(sampler._cumulative) <= POOL_CACHE_ENTRIES
+    
+    def test_empty_pool(self, sample_dataframe):
+        assert len(RecipeSampler(sample_dataframe).sample(1, ingredients='bacon')) == 0
+    
+    def test_weighted_single_draws_skip_zero_weights(self, sample_dataframe):
+        sampler = RecipeSampler(sample_dataframe, seed=3)
+        drawn = {int(sampler.sample(1, weights='rating')[0]) for _ in range(200)}
+        assert drawn <= {0, 2, 3, 5}
+        assert 0 in drawn
+    
+    def test_weighted_batch(self, sample_dataframe):
+        rows = RecipeSampler(sample_dataframe, seed=3).sample(10, weights='rating')
+        assert sorted(rows[:4]) == [0, 2, 3, 5]
+        assert sorted(rows[4:]) == [1, 4]
+    
+    def test_all_zero_weights_fall_back_to_uniform(self, sample_dataframe):
+        rows = RecipeSampler(sample_dataframe, seed=3).sample(2, weights=np.zeros(6))
+        assert len(rows) == 2
+    
+    def test_sample_from_given_rows(self, sample_dataframe):
+        sampler = RecipeSampler(sample_dataframe, seed=0)
+        assert sampler.sample(1, rows=np.array([4]))[0] == 4
+    
+    def test_sample_recipes_does_not_copy_frame(self, sample_dataframe):
+        with patch.object(pd.DataFrame, 'sample') as mock_sample:
+            recipes = get_sampler(sample_dataframe).sample_recipes(2)
+            mock_sample.assert_not_called()
+        assert len(recipes) == 2
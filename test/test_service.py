@@ -0,0 +1,261 @@
+import asyncio
+import json
+import sys
+import time
+import pytest
+from pathlib import Path
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from ratings import RatingTable, join_ratings
+from recipe_store import RecipeStore
+from service import LatencyTracker, RecipeService, ServiceError, to_json_value
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup'],
+        'id': [101, 102, 103],
+        'minutes': [45, 30, 60],
+        'n_steps': [10, 8, 12],
+        'n_ingredients': [4, 4, 4],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']"
+        ],
+        'nutrition': ['[300.0, 1, 2, 3, 4, 5, 6]', None, '[90.0, 1, 2, 3, 4, 5, 6]'],
+        'description': ['Delicious chocolate cake', None, 'Hearty chicken soup']
+    })
+
+async def http_get(port, target):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b'\r\n\r\n', 1)
+    return int(head.split()[1]), json.loads(body)
+
+def run_with_service(df, coroutine):
+    async def runner():
+        service = RecipeService(df, workers=2)
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await coroutine(service, port)
+        finally:
+            await service.close()
+    return asyncio.run(runner())
+
+class TestHelpers:
+    
+    def test_latency_percentiles(self):
+        tracker = LatencyTracker()
+        for ms in range(1, 101):
+            tracker.record('search/name', ms / 1000)
+        summary = tracker.summary()['search/name']
+        
+        assert summary['requests'] == 100
+        assert summary['p50_ms'] == pytest.approx(50.5)
+        assert summary['max_ms'] == pytest.approx(100)
+    
+    def test_to_json_value(self):
+        import numpy as np
+        assert to_json_value(np.int64(3)) == 3
+        assert to_json_value(float('nan')) is None
+        assert to_json_value(pd.NA) is None
+        assert to_json_value(np.array([1, 2])) == [1, 2]
+    
+    def test_route(self, sample_dataframe):
+        service = RecipeService(sample_dataframe, workers=1)
+        assert service.route('/recipes/101')[0] == 'recipes'
+        assert service.route('/search/name')[0] == 'search/name'
+        with pytest.raises(ServiceError):
+            service.route('/nope')
+
+class TestEndpoints:
+    
+    def test_name_search(self, sample_dataframe):
+        async def check(service, port):
+            return await http_get(port, '/search/name?q=choc')
+        status, body = run_with_service(sample_dataframe, check)
+        
+        assert status == 200
+        assert body['count'] == 1
+        assert body['results'][0] == {'id': 101, 'name': 'Chocolate Cake', 'minutes': 45, 'n_ingredients': 4}
+    
+    def test_search_suggests_corrections(self, sample_dataframe):
+        async def scenario(service, port):
+            return await http_get(port, '/search/name?q=chiken'), await http_get(port, '/search/name?q=chiken&fuzzy=0')
+        (status, body), (_, strict) = run_with_service(sample_dataframe, scenario)
+        
+        assert status == 200
+        assert body['did_you_mean'] == 'chicken'
+        assert body['results'][0]['name'] == 'Chicken Soup'
+        assert strict['count'] == 0 and 'did_you_mean' not in strict
+    
+    def test_ingredient_search_with_paging(self, sample_dataframe):
+        async def check(service, port):
+            return await http_get(port, '/search/ingredients?q=sugar,%20flour&limit=1&offset=1')
+        status, body = run_with_service(sample_dataframe, check)
+        
+        assert body['count'] == 2
+        assert [result['id'] for result in body['results']] == [102]
+    
+    def test_range_filters_and_facets(self, sample_dataframe):
+        async def scenario(service, port):
+            return (
+                await http_get(port, '/search/ingredients?q=flour&minutes_max=40&facets=minutes'),
+                await http_get(port, '/filter?calories_min=100'),
+            )
+        (status, body), (_, filtered) = run_with_service(sample_dataframe, scenario)
+        
+        assert status == 200
+        assert [recipe['name'] for recipe in body['results']] == ['Vanilla Cookies']
+        assert dict((label, count) for label, count in body['facets']['minutes'])['30-60'] == 1
+        assert [recipe['name'] for recipe in filtered['results']] == ['Chocolate Cake']
+    
+    def test_boolean_query(self, sample_dataframe):
+        async def scenario(service, port):
+            return (
+                await http_get(port, '/query?q=flour%20AND%20NOT%20chocolate'),
+                await http_get(port, '/query?q=flour%20OR&explain=1'),
+            )
+        (status, body), (bad_status, _) = run_with_service(sample_dataframe, scenario)
+        
+        assert status == 200
+        assert [recipe['name'] for recipe in body['results']] == ['Vanilla Cookies']
+        assert bad_status == 400
+    
+    def test_results_ranked_by_rating(self, sample_dataframe):
+        join_ratings(sample_dataframe, RatingTable([101, 102], [2, 9], [2, 9], [6.0, 45.0]))
+        async def scenario(service, port):
+            return await http_get(port, '/search/ingredients?q=flour'), await http_get(port, '/search/ingredients?q=flour&sort=file')
+        (status, body), (_, unranked) = run_with_service(sample_dataframe, scenario)
+        
+        assert status == 200
+        assert [result['id'] for result in body['results']] == [102, 101]
+        assert body['results'][0]['rating'] == 5.0
+        assert [result['id'] for result in unranked['results']] == [101, 102]
+    
+    def test_store_serves_new_recipes(self, sample_dataframe, tmp_path):
+        sample_dataframe.to_csv(tmp_path / 'RAW_recipes.csv', index=False)
+        store = RecipeStore(str(tmp_path / 'RAW_recipes.csv'))
+        store.append([{'id': 201, 'name': 'Chocolate Mousse', 'minutes': 20, 'n_ingredients': 3, 'ingredients': "['chocolate', 'cream', 'eggs']"}])
+        store.delete([101])
+        async def scenario(service, port):
+            return (
+                await http_get(port, '/search/ingredients?q=chocolate&facets=minutes'),
+                await http_get(port, '/recipes/201'),
+                await http_get(port, '/recipes/101'),
+                await http_get(port, '/filter?minutes_max=40'),
+            )
+        async def runner():
+            service = RecipeService(store.base, workers=2, store=store)
+            server = await service.start('127.0.0.1', 0)
+            try:
+                return await scenario(service, server.sockets[0].getsockname()[1])
+            finally:
+                await service.close()
+        (status, body), (_, added), (deleted_status, _), (_, filtered) = asyncio.run(runner())
+        
+        assert status == 200
+        assert [result['id'] for result in body['results']] == [201]
+        assert dict(body['facets']['minutes'])['15-30'] == 1
+        assert added['name'] == 'Chocolate Mousse'
+        assert deleted_status == 404
+        assert [result['id'] for result in filtered['results']] == [102, 201]
+    
+    def test_complete(self, sample_dataframe):
+        async def check(service, port):
+            return await http_get(port, '/complete?q=ch'), await http_get(port, '/complete?q=fl&field=ingredients'), await http_get(port, '/complete?q=ch&field=steps')
+        (status, names), (_, ingredients), (bad_status, _) = run_with_service(sample_dataframe, check)
+        
+        assert status == 200
+        assert [completion['text'] for completion in names['completions']] == ['chicken', 'chocolate']
+        assert ingredients['completions'] == [{'text': 'flour', 'count': 2}]
+        assert bad_status == 400
+    
+    def test_recipe_by_id(self, sample_dataframe):
+        async def check(service, port):
+            return await http_get(port, '/recipes/103'), await http_get(port, '/recipes/999')
+        (status, body), (missing_status, _) = run_with_service(sample_dataframe, check)
+        
+        assert status == 200
+        assert body['ingredients'] == ['chicken', 'carrots', 'celery', 'onion']
+        assert body['nutrition']['calories'] == 90.0
+        assert missing_status == 404
+    
+    def test_similar_recipes(self, sample_dataframe):
+        async def check(service, port):
+            return await http_get(port, '/recipes/101/similar?k=2'), await http_get(port, '/recipes/101/other')
+        (status, body), (bad_status, _) = run_with_service(sample_dataframe, check)
+        
+        assert status == 200
+        assert [result['id'] for result in body['results']] == [102]
+        assert 0 < body['results'][0]['similarity'] < 1
+        assert bad_status == 404
+    
+    def test_surprise_with_constraints(self, sample_dataframe):
+        async def check(service, port):
+            return await http_get(port, '/surprise?max_minutes=40&seed=1')
+        status, body = run_with_service(sample_dataframe, check)
+        
+        assert [result['id'] for result in body['results']] == [102]
+        assert body['results'][0]['description'] is None
+    
+    def test_bad_requests(self, sample_dataframe):
+        async def check(service, port):
+            return [
+                (await http_get(port, '/search/name'))[0],
+                (await http_get(port, '/surprise?n=abc'))[0],
+                (await http_get(port, '/unknown'))[0],
+                (await http_get(port, '/search/name?q=c&limit=-1'))[0],
+                (await http_get(port, '/search/name?q=c&offset=-1'))[0],
+                (await http_get(port, '/complete?q=ch&limit=-1'))[0],
+                (await http_get(port, '/surprise?n=-1'))[0],
+                (await http_get(port, '/surprise?weight=nope'))[0],
+                (await http_get(port, '/surprise?weight=name'))[0],
+            ]
+        assert run_with_service(sample_dataframe, check) == [400, 400, 404, 400, 400, 400, 400, 400, 400]
+    
+    def test_loop_answers_while_search_runs(self, sample_dataframe):
+        def slow_search(params, path_args):
+            end = time.perf_counter() + 0.6
+            while time.perf_counter() < end:
+                pass
+            return {}
+        
+        async def check(service, port):
+            service.routes['search/name'] = slow_search
+            search = asyncio.ensure_future(http_get(port, '/search/name?q=a'))
+            await asyncio.sleep(0.05)
+            start = time.perf_counter()
+            status, _ = await http_get(port, '/health')
+            elapsed = time.perf_counter() - start
+            running = not search.done()
+            await search
+            return status, elapsed, running
+        status, elapsed, running = run_with_service(sample_dataframe, check)
+        
+        assert status == 200 and running
+        assert elapsed < 0.3
+    
+    def test_keep_alive_and_stats(self, sample_dataframe):
+        async def check(service, port):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            for _ in range(3):
+                writer.write(b"GET /search/name?q=cake HTTP/1.1\r\nHost: localhost\r\n\r\n")
+                await writer.drain()
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = int([line for line in head.split(b'\r\n') if line.lower().startswith(b'content-length')][0].split(b':')[1])
+                await reader.readexactly(length)
+            writer.close()
+            return await http_get(port, '/stats')
+        status, body = run_with_service(sample_dataframe, check)
+        
+        assert body['latency']['search/name']['requests'] == 3
+        assert body['recipes'] == 3
@@ -0,0 +1,111 @@
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+import recipe_cache
+from similarity import SimilarityIndex, load_or_build, precompute_neighbours, similar_rows, similarity_dir_for
+from Recipeasy import main
+
+@pytest.fixture
+def sample_dataframe():
+    return pd.DataFrame({
+        'name': ['Chocolate Cake', 'Chocolate Brownies', 'Vanilla Cookies', 'Chicken Soup', 'Chicken Stew', 'Plain Water'],
+        'id': [101, 102, 103, 104, 105, 106],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate', 'eggs']",
+            "['flour', 'sugar', 'chocolate', 'butter']",
+            "['flour', 'sugar', 'vanilla', 'butter']",
+            "['chicken', 'carrots', 'celery', 'onion']",
+            "['chicken', 'carrots', 'potatoes', 'onion']",
+            "['water']"
+        ],
+        'tags': [
+            "['desserts', 'easy']",
+            "['desserts', 'easy']",
+            "['desserts', 'easy']",
+            "['main-dish', 'easy']",
+            "['main-dish', 'easy']",
+            "['easy']"
+        ]
+    })
+
+def dense_cosine(df):
+    # Reference implementation: dense TF-IDF vectors built the slow way.
+    index = SimilarityIndex.build(df)
+    matrix = np.zeros((index.n_rows, len(index.weights)))
+    for row in range(index.n_rows):
+        matrix[row, index.terms(row)] = index.weights[index.terms(row)]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+    return matrix @ matrix.T
+
+class TestSimilarityIndex:
+
+    def test_scores_match_dense_cosine(self, sample_dataframe):
+        index = SimilarityIndex.build(sample_dataframe)
+        expected = dense_cosine(sample_dataframe)
+
+        for row in range(len(sample_dataframe)):
+            scores = index.scores(row)
+            expected[row, row] = 0.0
+            np.testing.assert_allclose(scores, expected[row], atol=1e-9)
+
+    def test_common_terms_are_inverted(self, sample_dataframe):
+        index = SimilarityIndex.build(sample_dataframe)
+
+        # 'easy' is on every recipe, so it is stored as the empty list of recipes without it.
+        assert index.inverted.sum() >= 1
+        assert len(index.term_rows) < int(np.diff(index.row_offsets).sum())
+
+    def test_top_k_ranks_closest_first(self, sample_dataframe):
+        rows, scores = similar_rows(sample_dataframe, 0, k=3)
+
+        assert rows.tolist()[:2] == [1, 2]
+        assert np.all(np.diff(scores) <= 0)
+        assert 0 not in rows
+
+    def test_precomputed_neighbours_match_exact(self, sample_dataframe, tmp_path):
+        index = SimilarityIndex.build(sample_dataframe)
+        index.save(str(tmp_path / 'similarity'))
+        exact = [index.top_k(row, 3) for row in range(len(sample_dataframe))]
+
+        precompute_neighbours(index, str(tmp_path / 'similarity'), k=3, workers=2, block_rows=2)
+
+        for row, (rows, scores) in enumerate(exact):
+            found, found_scores = index.similar(row, 3)
+            assert found.tolist() == rows.tolist()
+            np.testing.assert_allclose(found_scores, scores, rtol=1e-5)
+
+    def test_persisted_next_to_recipe_cache(self, sample_dataframe, tmp_path):
+        csv_path = str(tmp_path / 'RAW_recipes.csv')
+        sample_dataframe.to_csv(csv_path, index=False)
+        df = recipe_cache.load_with_cache(csv_path)
+        load_or_build(df, csv_path)
+
+        with patch.object(SimilarityIndex, 'build') as mock_build:
+            loaded = load_or_build(df, csv_path)
+
+        mock_build.assert_not_called()
+        assert loaded.n_rows == len(df)
+        assert Path(similarity_dir_for(csv_path), 'meta.json').exists()
+
+class TestMoreLikeThis:
+
+    @patch('builtins.input')
+    @patch('Recipeasy.load_recipe_data')
+    def test_more_like_named_recipe(self, mock_load, mock_input, sample_dataframe, capsys):
+        mock_load.return_value = sample_dataframe
+        mock_input.side_effect = ['7', 'chicken soup', '7', '', '4']
+
+        main()
+
+        captured = capsys.readouterr()
+        assert "RECIPES LIKE: Chicken Soup" in captured.out
+        assert "1. Chicken Stew" in captured.out
+        assert "RECIPES LIKE: Chicken Stew" in captured.out
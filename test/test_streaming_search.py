@@ -0,0 +1,76 @@
+import sys
+import pytest
+from pathlib import Path
+import pandas as pd
+
+path = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(path))
+
+from streaming_search import (
+    iter_recipe_chunks,
+    stream_search,
+    stream_search_by_ingredient,
+    stream_search_by_name,
+)
+from Recipeasy import search_recipes_by_ingredient, search_recipes_by_name
+
+@pytest.fixture
+def recipes_csv(tmp_path):
+    df = pd.DataFrame({
+        'name': ['Chocolate Cake', 'Vanilla Cookies', 'Chicken Soup', 'Chicken Pie', None, 'Chocolate Chicken (Mole)'],
+        'id': [1, 2, 3, 4, 5, 6],
+        'ingredients': [
+            "['flour', 'sugar', 'chocolate']",
+            "['flour', 'sugar', 'vanilla']",
+            "['chicken', 'carrots']",
+            "['chicken', 'flour', 'butter']",
+            "['water']",
+            "['chicken', 'chocolate', 'chili']"
+        ],
+        'description': ['a', 'b', 'c', 'd', 'e', 'f']
+    })
+    csv_path = tmp_path / 'RAW_recipes.csv'
+    df.to_csv(csv_path, index=False)
+    return csv_path
+
+class TestStreamingSearch:
+    
+    def test_chunks_cover_file(self, recipes_csv):
+        chunks = list(iter_recipe_chunks(recipes_csv, chunksize=4))
+        assert [len(chunk) for chunk in chunks] == [4, 2]
+        assert list(chunks[1].index) == [4, 5]
+    
+    def test_chunks_select_columns(self, recipes_csv):
+        chunk = next(iter_recipe_chunks(recipes_csv, columns=('name', 'id')))
+        assert list(chunk.columns) == ['name', 'id']
+    
+    @pytest.mark.parametrize('chunksize', [1, 2])
+    @pytest.mark.parametrize('query', ['chicken', 'CHOC', '(mole)', 'pizza'])
+    def test_name_matches_in_memory_search(self, recipes_csv, query, chunksize):
+        df = pd.read_csv(recipes_csv)
+        streamed = list(stream_search_by_name(recipes_csv, query, chunksize=chunksize))
+        result = pd.concat(streamed) if streamed else df.iloc[0:0]
+        pd.testing.assert_frame_equal(result, search_recipes_by_name(df, query))
+    
+    @pytest.mark.parametrize('query', ['chicken', 'flour, sugar', 'chocolate, chicken', 'bacon'])
+    def test_ingredients_match_in_memory_search(self, recipes_csv, query):
+        df = pd.read_csv(recipes_csv)
+        streamed = list(stream_search_by_ingredient(recipes_csv, query, chunksize=2))
+        result = pd.concat(streamed) if streamed else df.iloc[0:0]
+        pd.testing.assert_frame_equal(result, search_recipes_by_ingredient(df, query))
+    
+    def test_yields_before_scanning_whole_file(self, recipes_csv):
+        results = stream_search_by_name(recipes_csv, 'chocolate', chunksize=1)
+        first = next(results)
+        assert list(first['id']) == [1]
+    
+    def test_combined_name_and_ingredients(self, recipes_csv):
+        matches = pd.concat(stream_search(recipes_csv, name='chicken', ingredients='flour', chunksize=2))
+        assert list(matches['id']) == [4]
+    
+    def test_limit(self, recipes_csv):
+        matches = pd.concat(stream_search_by_ingredient(recipes_csv, 'chicken', chunksize=2, limit=2))
+        assert list(matches['id']) == [3, 4]
+    
+    def test_empty_ingredient_query(self, recipes_csv):
+        assert list(stream_search_by_ingredient(recipes_csv, ' , ')) == []